@@ -1,9 +1,14 @@
 """NBA Team Builder Application - Entry Point."""
 
 from src.config import configure_page
+from src.telemetry.panel import finish_page
+from src.telemetry.timing import start_rerun
+from src.utils.hot_reload import start_hot_reload
 from src.utils.html import safe_heading, safe_paragraph
+from src.utils.preload import start_preload
 
 configure_page()
+start_rerun("app")
 
 safe_heading("NBA", level=1, color="steelblue")
 
@@ -12,3 +17,10 @@ safe_paragraph(
     "career stats to compete with a Computer",
     color="white",
 )
+
+finish_page()
+
+# Warm the store, reservoir and model for the other pages now that this one
+# has painted, then watch their files for updates
+start_preload()
+start_hot_reload()
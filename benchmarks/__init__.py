@@ -0,0 +1 @@
+"""Micro-benchmarks for the application's hot paths."""
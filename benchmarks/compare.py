@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Compare a benchmark run against the checked-in baseline.
+
+The baseline keeps one median per benchmark plus regression thresholds:
+a benchmark regresses when its median exceeds the baseline median times
+its threshold. Thresholds are ratios keyed by ``fnmatch`` patterns over the
+benchmark's full name; the first matching pattern wins, otherwise
+``default`` applies.
+
+Every median in the baseline comes from one full run: ``--update`` replaces
+all of them and records which run it was (time, commit, Python, CPU). It
+refuses a run that lacks benchmarks the baseline has, so a partial run
+cannot silently drop entries; pass ``--prune`` when a benchmark was removed.
+A commit that adds or changes a benchmark updates the baseline this way.
+
+Run from the project root:
+    pytest benchmarks --benchmark-json=bench.json
+    python -m benchmarks.compare bench.json             # exit 1 on regression
+    python -m benchmarks.compare bench.json --update    # accept as new baseline
+"""
+
+import argparse
+import json
+import logging
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLDS = {"default": 2.0}
+
+
+def read_results(path: Path) -> dict[str, float]:
+    """Median seconds per benchmark from a ``--benchmark-json`` file.
+
+    Args:
+        path: pytest-benchmark JSON output
+
+    Returns:
+        Mapping of benchmark full name to median seconds
+    """
+    data = json.loads(path.read_text())
+    return {b["fullname"]: float(b["stats"]["median"]) for b in data["benchmarks"]}
+
+
+def read_run(path: Path) -> dict[str, Any]:
+    """Describe the run behind a ``--benchmark-json`` file.
+
+    Args:
+        path: pytest-benchmark JSON output
+
+    Returns:
+        When and where the run happened: time, commit (and whether the tree
+        had uncommitted changes), Python version, CPU and core count
+    """
+    data = json.loads(path.read_text())
+    machine = data.get("machine_info", {})
+    cpu = machine.get("cpu", {})
+    commit = data.get("commit_info", {})
+    return {
+        "datetime": data.get("datetime"),
+        "commit": commit.get("id"),
+        "dirty": commit.get("dirty"),
+        "python": machine.get("python_version"),
+        "cpu": cpu.get("brand_raw"),
+        "cores": cpu.get("count"),
+    }
+
+
+def read_baseline(path: Path = BASELINE_FILE) -> dict[str, Any]:
+    """Load the baseline, or an empty one if it does not exist yet."""
+    if not path.exists():
+        return {"thresholds": dict(DEFAULT_THRESHOLDS), "benchmarks": {}}
+    return dict(json.loads(path.read_text()))
+
+
+def threshold_for(name: str, thresholds: dict[str, float]) -> float:
+    """Regression ratio allowed for a benchmark.
+
+    Args:
+        name: Benchmark full name
+        thresholds: Patterns to ratios, with a ``default`` entry
+
+    Returns:
+        Maximum allowed current/baseline median ratio
+    """
+    for pattern, ratio in thresholds.items():
+        if pattern != "default" and fnmatch(name, pattern):
+            return ratio
+    return thresholds.get("default", DEFAULT_THRESHOLDS["default"])
+
+
+def compare(
+    current: dict[str, float], baseline: dict[str, Any]
+) -> tuple[list[str], list[str]]:
+    """Compare medians and build a report.
+
+    Args:
+        current: Median seconds per benchmark for this run
+        baseline: Baseline document (``benchmarks`` and ``thresholds``)
+
+    Returns:
+        Tuple of (report lines, names of regressed benchmarks)
+    """
+    medians: dict[str, float] = baseline.get("benchmarks", {})
+    thresholds: dict[str, float] = baseline.get("thresholds", DEFAULT_THRESHOLDS)
+    lines: list[str] = []
+    regressions: list[str] = []
+
+    for name in sorted(current):
+        now = current[name]
+        before = medians.get(name)
+        if before is None:
+            lines.append(f"  new        {now * 1000:>12.3f} ms  {name}")
+            continue
+        ratio = now / before
+        limit = threshold_for(name, thresholds)
+        status = "REGRESSED" if ratio > limit else "ok"
+        if ratio > limit:
+            regressions.append(name)
+        lines.append(
+            f"  {status:<9}  {now * 1000:>12.3f} ms  x{ratio:5.2f} (limit x{limit:.2f})  {name}"
+        )
+
+    lines.extend(
+        f"  missing    {medians[name] * 1000:>12.3f} ms  {name}"
+        for name in sorted(medians.keys() - current.keys())
+    )
+    return lines, regressions
+
+
+def write_baseline(
+    current: dict[str, float],
+    baseline: dict[str, Any],
+    run: dict[str, Any],
+    path: Path = BASELINE_FILE,
+) -> None:
+    """Store this run's medians as the baseline, keeping the thresholds.
+
+    Args:
+        current: Median seconds per benchmark for the run
+        baseline: Current baseline document, for its thresholds
+        run: Description of the run, from read_run
+        path: Baseline file to write
+    """
+    document = {
+        "thresholds": baseline.get("thresholds", DEFAULT_THRESHOLDS),
+        "run": run,
+        "benchmarks": dict(sorted(current.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", type=Path, help="pytest-benchmark JSON output")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--update", action="store_true", help="Write the results as the new baseline"
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="With --update, drop baseline benchmarks missing from the run",
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Compare results with the baseline, or update it."""
+    args = parse_args()
+    current = read_results(args.results)
+    baseline = read_baseline(args.baseline)
+
+    if args.update:
+        missing = sorted(baseline.get("benchmarks", {}).keys() - current.keys())
+        if missing and not args.prune:
+            logger.error(
+                "The run lacks %d baseline benchmark(s), e.g. %s; run the full "
+                "suite, or pass --prune if they were removed",
+                len(missing),
+                missing[0],
+            )
+            sys.exit(1)
+        run = read_run(args.results)
+        write_baseline(current, baseline, run, args.baseline)
+        logger.info(
+            "Wrote %d benchmarks from the %s run to %s",
+            len(current),
+            run["datetime"],
+            args.baseline,
+        )
+        return
+
+    run = baseline.get("run", {})
+    logger.info(
+        "Baseline from %s at commit %s on %s",
+        run.get("datetime", "an unrecorded run"),
+        run.get("commit", "?"),
+        run.get("cpu", "?"),
+    )
+    lines, regressions = compare(current, baseline)
+    print("\n".join(lines))
+    if regressions:
+        logger.error("%d benchmark(s) regressed", len(regressions))
+        sys.exit(1)
+    logger.info("No regressions against %s", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Fixtures for the micro-benchmarks.
+
+Every dataset fixture is parametrized over ``SCALES``: the real data, and
+copies of it concatenated 10x and 100x, so each benchmark shows how its
+hot path grows with the size of the player table.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.database.backends import SQLiteBackend, build_player_database
+from src.database.connection import CSV_PATH
+
+SCALES = (1, 10, 100)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ROSTER_FILE = PROJECT_ROOT / "player_stats.txt"
+SCHEDULE_FILE = PROJECT_ROOT / "schedule.txt"
+
+
+def scale_frame(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """Concatenate ``scale`` copies of ``df`` with a fresh RangeIndex."""
+    if scale == 1:
+        return df
+    return pd.concat([df] * scale, ignore_index=True)
+
+
+@pytest.fixture(scope="session")
+def base_players() -> pd.DataFrame:
+    """The real player table, loaded once."""
+    df = pd.read_csv(CSV_PATH)
+    df.columns = [col.upper() for col in df.columns]
+    return df
+
+
+@pytest.fixture(scope="session", params=SCALES, ids=lambda s: f"{s}x")
+def scale(request: pytest.FixtureRequest) -> int:
+    """Dataset scale factor."""
+    return int(request.param)
+
+
+@pytest.fixture(scope="session")
+def players(base_players: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """The player table at the current scale."""
+    return scale_frame(base_players, scale)
+
+
+@pytest.fixture(scope="session")
+def players_csv(
+    tmp_path_factory: pytest.TempPathFactory, base_players: pd.DataFrame, scale: int
+) -> Path:
+    """The player table at the current scale, written as CSV."""
+    if scale == 1:
+        return CSV_PATH
+    path = tmp_path_factory.mktemp("data") / f"players_{scale}x.csv"
+    scale_frame(base_players, scale).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def player_db(
+    tmp_path_factory: pytest.TempPathFactory, players_csv: Path
+) -> SQLiteBackend:
+    """The player table at the current scale, as a SQLite backend."""
+    path = tmp_path_factory.mktemp("db") / f"{players_csv.stem}.sqlite"
+    return SQLiteBackend(build_player_database(players_csv, path))
+
+
+@pytest.fixture(scope="session")
+def team_stats(base_players: pd.DataFrame) -> tuple[list[list[float]], ...]:
+    """Stat rows for two real five-player teams."""
+    rows = base_players[STAT_COLUMNS].head(2 * TEAM_SIZE).values.tolist()
+    return rows[:TEAM_SIZE], rows[TEAM_SIZE:]
+
+
+@pytest.fixture(scope="session")
+def matchups() -> np.ndarray:
+    """A fixed batch of random matchup features, shape (1024, 100)."""
+    rng = np.random.default_rng(0)
+    return rng.random((1024, 2 * TEAM_SIZE * len(STAT_COLUMNS)), dtype=np.float32)
+
+
+@pytest.fixture(scope="session")
+def season() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """The training roster and schedule."""
+    return (
+        pd.read_csv(ROSTER_FILE, delimiter=","),
+        pd.read_csv(SCHEDULE_FILE, delimiter=","),
+    )
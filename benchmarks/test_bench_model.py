@@ -0,0 +1,53 @@
+"""Benchmarks for stat preparation and prediction."""
+
+import numpy as np
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ml.model import analyze_team_stats, predict_win_probabilities, predict_winner
+
+
+def test_analyze_team_stats(
+    benchmark: BenchmarkFixture, team_stats: tuple[list[list[float]], ...]
+) -> None:
+    """Flatten two rosters into model input."""
+    home, away = team_stats
+    _, _, combined = benchmark(analyze_team_stats, home, away)
+    assert combined.shape == (1, 100)
+
+
+def test_analyze_team_stats_arrays(
+    benchmark: BenchmarkFixture, team_stats: tuple[list[list[float]], ...]
+) -> None:
+    """Flatten two float32 stat matrices, as the play page passes them."""
+    home, away = (np.asarray(team, dtype=np.float32) for team in team_stats)
+    _, _, combined = benchmark(analyze_team_stats, home, away)
+    assert combined.shape == (1, 100)
+
+
+def test_analyze_team_stats_batched(
+    benchmark: BenchmarkFixture, matchups: np.ndarray
+) -> None:
+    """Flatten a (N, 2, 5, 10) game tensor."""
+    games = matchups.reshape(len(matchups), 2, 5, -1)
+    _, _, combined = benchmark(analyze_team_stats, games)
+    assert combined.shape == matchups.shape
+
+
+def test_predict_winner(
+    benchmark: BenchmarkFixture, team_stats: tuple[list[list[float]], ...]
+) -> None:
+    """Predict one game, including fetching the model bundle."""
+    home, away = team_stats
+    _, _, combined = analyze_team_stats(home, away)
+    probability, _ = benchmark(predict_winner, combined)
+    assert 0.0 <= probability <= 1.0
+
+
+@pytest.mark.parametrize("batch", [1, 64, 1024])
+def test_predict_win_probabilities(
+    benchmark: BenchmarkFixture, matchups: np.ndarray, batch: int
+) -> None:
+    """Score a batch of matchups in one call."""
+    probabilities = benchmark(predict_win_probabilities, matchups[:batch])
+    assert probabilities.shape == (batch,)
@@ -0,0 +1,176 @@
+"""Benchmarks for data loading and player queries."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.config import (
+    DIFFICULTY_COLUMNS,
+    DIFFICULTY_PERCENTILES,
+    DIFFICULTY_PRESETS,
+    SIMILAR_PLAYERS,
+)
+from src.database import connection
+from src.database.backends import SQLiteBackend
+from src.database.queries import (
+    get_away_team_by_stats,
+    get_players_by_full_names,
+    search_player_by_name,
+)
+from src.database.ranks import RankTable, difficulty_thresholds, infeasible_reason
+from src.database.reservoir import generate_away_team
+from src.database.similarity import find_similar_players, get_similarity_index
+from src.database.store import PlayerStore
+
+SEARCH_TERMS = {"short": "jo", "long": "giannis antetokounmpo"}
+ROSTER = [
+    "LeBron James",
+    "Michael Jordan",
+    "Stephen Curry",
+    "Kevin Durant",
+    "Tim Duncan",
+]
+
+
+def test_load_data(
+    benchmark: BenchmarkFixture, players_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Read and normalize the player CSV."""
+    monkeypatch.setattr(connection, "CSV_PATH", players_csv)
+    df = benchmark(connection.load_data)
+    assert not df.empty
+
+
+@pytest.mark.parametrize("term", SEARCH_TERMS.values(), ids=SEARCH_TERMS.keys())
+def test_search_player_by_name(
+    benchmark: BenchmarkFixture, players: pd.DataFrame, term: str
+) -> None:
+    """Substring search over first, last and full names."""
+    results = benchmark(search_player_by_name, players, term)
+    assert results
+
+
+def test_get_players_by_full_names(
+    benchmark: BenchmarkFixture, players: pd.DataFrame
+) -> None:
+    """Resolve a five-name roster."""
+    team = benchmark(get_players_by_full_names, players, ROSTER)
+    assert not team.empty
+
+
+@pytest.mark.parametrize("term", SEARCH_TERMS.values(), ids=SEARCH_TERMS.keys())
+def test_search_player_by_name_sqlite(
+    benchmark: BenchmarkFixture, player_db: SQLiteBackend, term: str
+) -> None:
+    """Name search through the SQLite backend's FTS5 index."""
+    results = benchmark(search_player_by_name, player_db, term)
+    assert results
+
+
+def test_get_players_by_full_names_sqlite(
+    benchmark: BenchmarkFixture, player_db: SQLiteBackend
+) -> None:
+    """Resolve a five-name roster through the SQLite FULL_NAME index."""
+    team = benchmark(get_players_by_full_names, player_db, ROSTER)
+    assert not team.empty
+
+
+@pytest.mark.parametrize(
+    "thresholds", DIFFICULTY_PRESETS.values(), ids=DIFFICULTY_PRESETS.keys()
+)
+def test_get_away_team_by_stats(
+    benchmark: BenchmarkFixture,
+    players: pd.DataFrame,
+    thresholds: tuple[int, int, int, int],
+) -> None:
+    """Sample one away team for a difficulty preset."""
+    pts, reb, ast, stl = thresholds
+    team = benchmark(
+        get_away_team_by_stats,
+        players,
+        pts_threshold=pts,
+        reb_threshold=reb,
+        ast_threshold=ast,
+        stl_threshold=stl,
+    )
+    assert len(team) == 5
+
+
+@pytest.mark.parametrize(
+    "thresholds", DIFFICULTY_PRESETS.values(), ids=DIFFICULTY_PRESETS.keys()
+)
+def test_get_away_team_by_stats_sqlite(
+    benchmark: BenchmarkFixture,
+    player_db: SQLiteBackend,
+    thresholds: tuple[int, int, int, int],
+) -> None:
+    """Sample one away team from the SQLite stat indexes."""
+    pts, reb, ast, stl = thresholds
+    team = benchmark(
+        get_away_team_by_stats,
+        player_db,
+        pts_threshold=pts,
+        reb_threshold=reb,
+        ast_threshold=ast,
+        stl_threshold=stl,
+    )
+    assert len(team) == 5
+
+
+def test_rank_table(benchmark: BenchmarkFixture, players: pd.DataFrame) -> None:
+    """Argsort the difficulty columns, as done once per store load."""
+    ranks = benchmark(RankTable, players)
+    assert ranks.size == len(players)
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTY_PERCENTILES.keys())
+def test_generate_away_team_percentile(
+    benchmark: BenchmarkFixture, players: pd.DataFrame, difficulty: str
+) -> None:
+    """Resolve a percentile difficulty and sample a team from rank pools."""
+    store = PlayerStore(players, "bench")
+
+    def generate() -> tuple[int, ...]:
+        thresholds = difficulty_thresholds(store.ranks)[difficulty]
+        return generate_away_team(store, thresholds)
+
+    team = benchmark(generate)
+    assert len(team) == 5
+
+
+@pytest.mark.parametrize(
+    "thresholds", DIFFICULTY_PRESETS.values(), ids=DIFFICULTY_PRESETS.keys()
+)
+def test_pool_sizes_and_feasibility(
+    benchmark: BenchmarkFixture,
+    players: pd.DataFrame,
+    thresholds: tuple[int, int, int, int],
+) -> None:
+    """Pool sizes and the feasibility check, as run on every slider move."""
+    ranks = RankTable(players)
+
+    def feedback() -> tuple[list[int], str | None]:
+        counts = [
+            ranks.count_above(column, threshold)
+            for column, threshold in zip(DIFFICULTY_COLUMNS, thresholds, strict=True)
+        ]
+        return counts, infeasible_reason(ranks, thresholds)
+
+    counts, reason = benchmark(feedback)
+    assert all(counts)
+    assert reason is None
+
+
+@pytest.mark.parametrize("per_game", [False, True], ids=["totals", "per_game"])
+def test_find_similar_players(
+    benchmark: BenchmarkFixture, players: pd.DataFrame, per_game: bool
+) -> None:
+    """Top-k similar players to one player, index already built."""
+    store = PlayerStore(players, "bench")
+    player_id = int(players.index[players["FULL_NAME"] == "Michael Jordan"][0])
+    get_similarity_index(store, per_game)
+
+    similar = benchmark(find_similar_players, store, player_id, per_game=per_game)
+    assert len(similar) == SIMILAR_PLAYERS
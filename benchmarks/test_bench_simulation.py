@@ -0,0 +1,23 @@
+"""Benchmarks for the possession-level game simulation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.config import TEAM_SIZE
+from src.simulation import player_rates, simulate_games
+
+
+@pytest.mark.parametrize("games", [1, 1000])
+def test_simulate_games(
+    benchmark: BenchmarkFixture, base_players: pd.DataFrame, games: int
+) -> None:
+    """Simulate full games between random rosters of real players."""
+    rates = player_rates(base_players)
+    rng = np.random.default_rng(0)
+    rosters = rng.integers(0, len(rates), size=(games, 2, TEAM_SIZE))
+    probabilities = rng.random(games)
+
+    result = benchmark(simulate_games, rates[rosters], probabilities, rng=rng)
+    assert len(result) == games
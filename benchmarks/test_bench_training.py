@@ -0,0 +1,26 @@
+"""Benchmarks for training feature construction (needs the train extra)."""
+
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.conftest import scale_frame
+
+pytest.importorskip("sklearn")
+pytest.importorskip("scikeras")
+
+from scripts.compile_model import create_stats
+
+
+# create_stats loops over games in Python; 100x (~130k games) takes minutes
+@pytest.mark.parametrize("games_scale", [1, 10], ids=lambda s: f"{s}x")
+def test_create_stats(
+    benchmark: BenchmarkFixture,
+    season: tuple[pd.DataFrame, pd.DataFrame],
+    games_scale: int,
+) -> None:
+    """Build per-game feature arrays for a season's schedule."""
+    roster, schedule = season
+    games = scale_frame(schedule, games_scale)
+    features = benchmark.pedantic(create_stats, args=(roster, games), rounds=3)
+    assert len(features) == len(games)
@@ -2,27 +2,42 @@
 
 import logging
 
-import pandas as pd
 import streamlit as st
 
-from src.config import DIFFICULTY_PRESETS, PLAYER_COLUMNS, configure_page
-from src.database.connection import (
-    DatabaseConnectionError,
-    load_data,
+from src.config import (
+    DIFFICULTY_COLUMNS,
+    DIFFICULTY_PERCENTILES,
+    DIFFICULTY_PRESETS,
+    TEAM_SIZE,
+    configure_page,
 )
-from src.database.queries import get_players_by_full_names, search_player_by_name
-from src.state.session import init_session_state
+from src.database.cache import cached_search_player_ids
+from src.database.connection import DatabaseConnectionError
+from src.database.ranks import difficulty_thresholds, infeasible_reason
+from src.database.reservoir import get_team_reservoir
+from src.database.similarity import find_similar_players
+from src.database.store import get_player_store
+from src.state.session import (
+    get_away_stats,
+    get_home_team_df,
+    get_home_team_ids,
+    init_session_state,
+    set_home_team_ids,
+    sync_player_selection,
+)
+from src.telemetry.panel import finish_page
+from src.telemetry.timing import start_rerun
+from src.utils.hot_reload import start_hot_reload
 from src.utils.html import safe_heading, safe_paragraph
+from src.utils.preload import start_preload
 from src.validation.inputs import validate_search_term
 
 logger = logging.getLogger("streamlit_nba")
 
-configure_page()
-
+CUSTOM_DIFFICULTY = "Custom"
 
-@st.cache_data
-def _load_nba_data() -> pd.DataFrame:
-    return load_data()
+configure_page()
+start_rerun("home_team")
 
 
 # Initialize session state before any access
@@ -41,14 +56,14 @@ safe_paragraph(
 )
 
 
-def find_player(search_term: str) -> list[str]:
+def find_player(search_term: str) -> list[int]:
     """Search for players by name with validation and error handling.
 
     Args:
         search_term: User-provided search term
 
     Returns:
-        List of matching player full names
+        List of matching player row ids
     """
     # Validate input
     validated_term = validate_search_term(search_term)
@@ -59,75 +74,63 @@ def find_player(search_term: str) -> list[str]:
         return []
 
     try:
-        data = _load_nba_data()
-        results = search_player_by_name(data, validated_term)
-        return [player[0] for player in results]
+        return list(cached_search_player_ids(get_player_store(), validated_term))
     except DatabaseConnectionError as e:
         st.error("Could not load player data. Please try again later.")
         logger.error("Data load error: %s", e)
         return []
 
 
-def find_home_team() -> pd.DataFrame:
-    """Load home team data from database using batch query.
-
-    Returns:
-        DataFrame with home team player data
-    """
-    team_names: list[str] = st.session_state.get("home_team", [])
-    if not team_names:
-        return pd.DataFrame(columns=PLAYER_COLUMNS)
-
+def player_label(player_id: int) -> str:
+    """Format a player row id as its full name for the dropdown."""
     try:
-        data = _load_nba_data()
-        # Single batch query instead of N+1 queries
-        logger.info("Loading data for team: %s", team_names)
-        df = get_players_by_full_names(data, team_names)
-        logger.info("Retrieved %d players", len(df))
-        st.session_state.home_team_df = df
-        return df
-    except DatabaseConnectionError as e:
-        st.error("Could not load player data. Please try again later.")
-        logger.error("Data load error: %s", e)
-        return pd.DataFrame(columns=PLAYER_COLUMNS)
+        return get_player_store().name_of(player_id)
+    except (DatabaseConnectionError, IndexError):
+        return str(player_id)
 
 
-# Load data
+# Load data; a selection made before a data reload is moved to the new ids
+sync_player_selection("player_selector")
 player_search = find_player(player_add)
-home_team_df = find_home_team()
+home_team_ids = get_home_team_ids()
+home_team_df = get_home_team_df()
+logger.info("Home team: %d players", len(home_team_df))
 
 # Combine search results with current team and current unsaved selections
 # This ensures that selections don't disappear when the search term changes
-current_team_names = (
-    home_team_df["FULL_NAME"].tolist() if not home_team_df.empty else []
-)
-current_selections = st.session_state.get("player_selector", [])
+current_selections: list[int] = st.session_state.get("player_selector", [])
 
 # Merge all into options list, maintaining uniqueness
 combined_options = list(player_search)
-for name in current_team_names + current_selections:
-    if name not in combined_options:
-        combined_options.append(name)
+for player_id in list(home_team_ids) + current_selections:
+    if player_id not in combined_options:
+        combined_options.append(player_id)
 
 player_search = combined_options
 
 
 def save_state() -> None:
-    """Save the selected players to session state."""
-    st.session_state.home_team = st.session_state.player_selector
+    """Save the selected players and start drawing their opponent."""
+    # The selection was made against the store of the previous rerun
+    set_home_team_ids(
+        st.session_state.player_selector,
+        version=st.session_state.get("player_selector_version"),
+    )
+    if len(st.session_state.player_selector) == TEAM_SIZE:
+        # The refill thread draws it while the user heads to the play page
+        pts, reb, ast, stl = get_away_stats()
+        get_team_reservoir().prime((pts, reb, ast, stl))
     # No need for st.rerun() inside a callback usually,
     # but it doesn't hurt. Streamlit reruns after callback.
 
 
 col1, col2 = st.columns([7, 1])
 with col1:
-    default_selection = (
-        home_team_df["FULL_NAME"].tolist() if not home_team_df.empty else []
-    )
     player_selected = st.multiselect(
         "Search Results:",
         player_search,
-        default_selection,
+        list(home_team_ids),
+        format_func=player_label,
         label_visibility="collapsed",
         key="player_selector",
     )
@@ -138,6 +141,94 @@ safe_heading("Preview", level=1, color="steelblue")
 
 st.dataframe(home_team_df)
 
+
+def show_similar_players(player_id: int, per_game: bool) -> None:
+    """Show the players whose stat lines are closest to one player's.
+
+    Args:
+        player_id: Row id of the player to match
+        per_game: Compare counting stats per game instead of as totals
+    """
+    try:
+        similar = find_similar_players(get_player_store(), player_id, per_game=per_game)
+    except DatabaseConnectionError as e:
+        st.error("Could not load player data. Please try again later.")
+        logger.error("Data load error: %s", e)
+        return
+    st.dataframe(similar)
+
+
+with st.expander("Players Like This One"):
+    similar_to = st.selectbox(
+        "Players like",
+        player_search,
+        format_func=player_label,
+        key="similar_to",
+    )
+    per_game = st.checkbox("Compare per game", key="similar_per_game")
+    if similar_to is not None:
+        show_similar_players(similar_to, per_game)
+
+
+def preset_thresholds(name: str) -> list[int]:
+    """Resolve a percentile difficulty to thresholds for the loaded players.
+
+    Args:
+        name: Difficulty preset name
+
+    Returns:
+        [pts, reb, ast, stl] thresholds, or the absolute preset on error
+    """
+    try:
+        return list(difficulty_thresholds(get_player_store().ranks)[name])
+    except DatabaseConnectionError as e:
+        logger.error("Data load error: %s", e)
+        return list(DIFFICULTY_PRESETS[name])
+
+
+def custom_thresholds() -> list[int] | None:
+    """Show threshold sliders with live pool sizes and a feasibility check.
+
+    Pool sizes and feasibility come from the store's sorted stat arrays, so
+    moving a slider costs a few binary searches.
+
+    Returns:
+        [pts, reb, ast, stl] thresholds, or None if no team can be drawn
+    """
+    try:
+        ranks = get_player_store().ranks
+    except DatabaseConnectionError as e:
+        st.error("Could not load player data. Please try again later.")
+        logger.error("Data load error: %s", e)
+        return None
+
+    thresholds = []
+    columns = st.columns(len(DIFFICULTY_COLUMNS))
+    for col, column, current in zip(
+        columns, DIFFICULTY_COLUMNS, get_away_stats(), strict=True
+    ):
+        highest = max(int(ranks.highest(column)), 1)
+        with col:
+            threshold = st.slider(
+                f"Minimum {column}",
+                min_value=0,
+                max_value=highest,
+                value=min(current, highest),
+                key=f"custom_{column.lower()}",
+            )
+            st.caption(f"Pool size: {ranks.count_above(column, threshold):,}")
+        thresholds.append(threshold)
+
+    pts, reb, ast, stl = thresholds
+    reason = infeasible_reason(ranks, (pts, reb, ast, stl))
+    if reason is not None:
+        st.error(f"No valid away team: {reason}.")
+        return None
+    st.success("A full away team can be drawn.")
+    return thresholds
+
+
+difficulty_options = [*DIFFICULTY_PERCENTILES, CUSTOM_DIFFICULTY]
 radio_index: int = st.session_state.get("radio_index", 0)
 col1, col2, col3, col4, col5 = st.columns(5)
 
@@ -146,12 +237,25 @@ with col3:
     difficulty = st.radio(
         label="Difficulty",
         index=radio_index,
-        options=list(DIFFICULTY_PRESETS.keys()),
+        options=difficulty_options,
         label_visibility="collapsed",
     )
 
-    if difficulty and difficulty in DIFFICULTY_PRESETS:
-        st.session_state.away_stats = list(DIFFICULTY_PRESETS[difficulty])
-        st.session_state.radio_index = list(DIFFICULTY_PRESETS.keys()).index(difficulty)
-    else:
+    if difficulty and difficulty in DIFFICULTY_PERCENTILES:
+        st.session_state.away_stats = preset_thresholds(difficulty)
+    elif difficulty != CUSTOM_DIFFICULTY:
         st.write("You didn't select a difficulty.")
+    if difficulty in difficulty_options:
+        st.session_state.radio_index = difficulty_options.index(difficulty)
+
+if difficulty == CUSTOM_DIFFICULTY:
+    custom = custom_thresholds()
+    if custom is not None:
+        st.session_state.away_stats = custom
+
+finish_page()
+
+# Pages can be opened directly, so each one makes sure the warm-up and the
+# watcher run
+start_preload()
+start_hot_reload()
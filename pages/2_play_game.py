@@ -1,43 +1,43 @@
 """Game play page with prediction and scoring."""
 
 import logging
-import random
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from src.config import (
-    DEFAULT_LOSER_SCORE,
-    DEFAULT_WINNER_SCORE,
-    LOSER_SCORE_RANGE,
-    MAX_QUERY_ATTEMPTS,
-    STAT_COLUMNS,
-    TEAM_SIZE,
-    WINNER_SCORE_RANGE,
-    configure_page,
-)
+from src.config import TEAM_SIZE, configure_page
 from src.database.connection import (
     DatabaseConnectionError,
     QueryExecutionError,
-    load_data,
 )
-from src.database.queries import get_away_team_by_stats
+from src.database.reservoir import get_team_reservoir
+from src.database.store import get_player_store
 from src.ml.model import (
     ModelLoadError,
     analyze_team_stats,
     predict_winner,
 )
-from src.state.session import get_away_stats, get_home_team_df, init_session_state
+from src.simulation import simulate_games, store_rates
+from src.state.session import (
+    get_away_stats,
+    get_away_team_df,
+    get_away_team_ids,
+    get_home_team_df,
+    get_home_team_ids,
+    init_session_state,
+    set_away_team_ids,
+)
+from src.telemetry.panel import finish_page
+from src.telemetry.timing import start_rerun
+from src.utils.hot_reload import start_hot_reload
 from src.utils.html import safe_heading
+from src.utils.preload import start_preload
 
 logger = logging.getLogger("streamlit_nba")
 
 configure_page()
-
-
-@st.cache_data
-def _load_nba_data() -> pd.DataFrame:
-    return load_data()
+start_rerun("play_game")
 
 
 # Initialize session state BEFORE any access
@@ -48,71 +48,26 @@ stats = get_away_stats()
 teams_good = True
 
 
-def find_away_team(stat_thresholds: list[int]) -> pd.DataFrame:
-    """Generate away team based on difficulty stats.
+def find_away_team(stat_thresholds: list[int]) -> tuple[int, ...]:
+    """Take an away team for the difficulty stats from the reservoir.
 
     Args:
         stat_thresholds: List of [pts, reb, ast, stl] thresholds
 
     Returns:
-        DataFrame with away team data, or empty DataFrame on error
+        Player row ids of the away team, or an empty tuple on error
     """
+    pts, reb, ast, stl = stat_thresholds
     try:
-        data = _load_nba_data()
-        return get_away_team_by_stats(
-            data,
-            pts_threshold=stat_thresholds[0],
-            reb_threshold=stat_thresholds[1],
-            ast_threshold=stat_thresholds[2],
-            stl_threshold=stat_thresholds[3],
-            max_attempts=MAX_QUERY_ATTEMPTS,
-        )
+        return get_team_reservoir().pop((pts, reb, ast, stl))
     except DatabaseConnectionError as e:
         st.error("Could not load player data. Please try again later.")
         logger.error("Data load error: %s", e)
-        return pd.DataFrame()
+        return ()
     except QueryExecutionError as e:
         st.error("Could not generate away team. Please try again.")
         logger.error("Query error: %s", e)
-        return pd.DataFrame()
-
-
-def get_score_board(final_score: int) -> list[int]:
-    """Generate quarter-by-quarter scores that sum to final score.
-
-    Args:
-        final_score: Total game score
-
-    Returns:
-        List of [Q1, Q2, Q3, Q4, Final] scores
-    """
-    quarter_score = final_score // 4
-    scores = [
-        quarter_score + random.randint(-7, 7),
-        quarter_score + random.randint(-3, 3),
-        quarter_score + random.randint(-8, 8),
-    ]
-    # Q4 makes up the difference to hit exact final
-    scores.append(final_score - sum(scores))
-    scores.append(final_score)
-    return scores
-
-
-def generate_game_scores() -> tuple[int, int]:
-    """Generate winner and loser scores with loop guard.
-
-    Returns:
-        Tuple of (winner_score, loser_score)
-    """
-    for _ in range(MAX_QUERY_ATTEMPTS):
-        winner_score = random.randint(*WINNER_SCORE_RANGE)
-        loser_score = random.randint(*LOSER_SCORE_RANGE)
-        if winner_score > loser_score:
-            return winner_score, loser_score
-
-    # Fallback to guaranteed valid scores
-    logger.warning("Score generation fell back to defaults")
-    return DEFAULT_WINNER_SCORE, DEFAULT_LOSER_SCORE
+        return ()
 
 
 # Check if home team is valid
@@ -124,57 +79,46 @@ if home_team_df.empty or home_team_df.shape[0] != TEAM_SIZE:
         level=3,
         color="red",
     )
-    st.session_state.away_team_df = pd.DataFrame()
+    set_away_team_ids(())
     teams_good = False
     winner_label = ""
     box_score = pd.DataFrame()
+    player_lines: list[pd.DataFrame] = []
 else:
-    # Only generate away team if we don't have one or it's empty
-    if (
-        st.session_state.get("away_team_df") is None
-        or st.session_state.away_team_df.empty
-    ):
-        st.session_state.away_team_df = find_away_team(stats)
-
-    away_data = st.session_state.away_team_df
-    if away_data.empty:
+    # Only generate away team if we don't have one
+    if not get_away_team_ids():
+        set_away_team_ids(find_away_team(stats))
+
+    if not get_away_team_ids():
         teams_good = False
         winner_label = ""
         box_score = pd.DataFrame()
+        player_lines = []
+
+away_team_df = get_away_team_df()
 
 # Run prediction if both teams are valid
-if teams_good and not st.session_state.away_team_df.empty:
+if teams_good and not away_team_df.empty:
     try:
-        # Extract stats for ML model
-        home_stats = home_team_df[STAT_COLUMNS].values.tolist()
-        away_stats_data = st.session_state.away_team_df[STAT_COLUMNS].values.tolist()
+        # Stat-matrix rows for both rosters, in roster order
+        store = get_player_store()
+        rosters = np.array([get_home_team_ids(), get_away_team_ids()])
+        home_stats, away_stats_data = store.stats[rosters]
 
         # Prepare data and predict
         _, _, combined = analyze_team_stats(home_stats, away_stats_data)
         probability, prediction = predict_winner(combined)
+        winner_label = "Winner" if prediction == 1 else "Loser"
 
-        # Generate scores
-        winner_score, loser_score = generate_game_scores()
-
-        # Build scoreboard based on prediction
-        if prediction == 1:
-            score_data = [
-                get_score_board(winner_score),
-                get_score_board(loser_score),
-            ]
-            winner_label = "Winner"
-        else:
-            score_data = [
-                get_score_board(loser_score),
-                get_score_board(winner_score),
-            ]
-            winner_label = "Loser"
-
-        box_score = pd.DataFrame(
-            score_data,
-            columns=["1", "2", "3", "4", "Final"],
-            index=["Home Team", "Away Team"],
+        # Play the game out, consistent with the predicted winner
+        game = simulate_games(
+            store_rates(store)[rosters], probability, home_wins=prediction == 1
         )
+        box_score = game.scoreboard()
+        player_lines = [
+            game.box_score(0, side, [store.name_of(i) for i in roster])
+            for side, roster in enumerate(rosters.tolist())
+        ]
 
         logger.info("Prediction: %.4f", probability)
 
@@ -184,12 +128,14 @@ if teams_good and not st.session_state.away_team_df.empty:
         teams_good = False
         winner_label = ""
         box_score = pd.DataFrame()
+        player_lines = []
     except ValueError as e:
         st.error("Error processing team stats. Please try again.")
         logger.error("Stats processing error: %s", e)
         teams_good = False
         winner_label = ""
         box_score = pd.DataFrame()
+        player_lines = []
 
 # Display results
 safe_heading("Home Team", level=1, color="steelblue")
@@ -201,15 +147,26 @@ if teams_good and winner_label:
     col1, col2, col3 = st.columns(3)
     with col2:
         st.dataframe(box_score)
+    with st.expander("Box Score"):
+        for label, lines in zip(["Home Team", "Away Team"], player_lines, strict=True):
+            st.caption(label)
+            st.dataframe(lines)
 
 safe_heading("Away Team", level=1, color="steelblue")
-st.dataframe(st.session_state.away_team_df)
+st.dataframe(away_team_df)
 
 
 def play_new_team() -> None:
     """Clear cached away team and rerun."""
     logger.info("New Team requested")
-    st.session_state.away_team_df = pd.DataFrame()
+    set_away_team_ids(())
 
 
 st.button("Play New Team", on_click=play_new_team)
+
+finish_page()
+
+# Pages can be opened directly, so each one makes sure the warm-up and the
+# watcher run
+start_preload()
+start_hot_reload()
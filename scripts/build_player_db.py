@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Build the SQLite player database from the player CSV.
+
+The database holds the same rows as the CSV, with row ids matching the
+CSV's row order. ``FULL_NAME`` and every stat column have a B-tree index,
+and the lowercased names have an FTS5 trigram index for substring search.
+Open it with ``src.database.backends.SQLiteBackend`` and pass the backend to
+any of the ``src.database.queries`` functions in place of a DataFrame.
+
+The CSV is streamed in batches, so it can be far larger than memory.
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.build_player_db
+    python -m scripts.build_player_db --csv big_players.csv --out players.sqlite
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from src.config import SQLITE_BUILD_BATCH_ROWS
+from src.database.backends import DEFAULT_DB_PATH, build_player_database
+from src.database.connection import CSV_PATH
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=CSV_PATH, help="Player CSV")
+    parser.add_argument(
+        "--out", type=Path, default=DEFAULT_DB_PATH, help="Database to write"
+    )
+    parser.add_argument("--batch-rows", type=int, default=SQLITE_BUILD_BATCH_ROWS)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Build the database and report its size."""
+    args = parse_args()
+    started = time.perf_counter()
+    path = build_player_database(args.csv, args.out, args.batch_rows)
+    logger.info(
+        "Wrote %s (%.1f MB) in %.1fs",
+        path,
+        path.stat().st_size / 1e6,
+        time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,45 @@
 This script trains a neural network to predict game winners based on
 team statistics. It uses RandomizedSearchCV to find optimal hyperparameters.
 
-Usage:
-    python scripts/compile_model.py
+With ``--seasons-dir`` it instead streams any number of seasons: features are
+built one season at a time, written to sharded float32 ``.npy`` files, and
+the model is trained from those shards through a ``tf.data`` pipeline that
+never holds more than one shard in memory.
+
+With ``--incremental`` it warm-starts from the current ``winner.keras``,
+fine-tunes only on games appended to the schedule since the last run, and
+promotes the result only if held-out accuracy does not regress.
+
+Every mode also writes the serving bundle (``winner_bundle/``): weights in
+``.npz`` form plus a manifest with the feature schema, metrics and checksum.
+``--export-bundle`` rebuilds the bundle from the existing ``winner.keras``.
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.compile_model
+    python -m scripts.compile_model --seasons-dir seasons/ --shards-dir shards/
+    python -m scripts.compile_model --incremental
+    python -m scripts.compile_model --export-bundle
 """
 
+import argparse
+import hashlib
+import json
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 from scikeras.wrappers import KerasClassifier
-from sklearn.model_selection import RandomizedSearchCV, train_test_split
+from sklearn.model_selection import RandomizedSearchCV
 from tensorflow import keras
 from tensorflow.keras import layers
 from tensorflow.keras.losses import BinaryCrossentropy
 
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.ml.bundle import DEFAULT_BUNDLE_PATH, save_bundle
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +54,23 @@ logger = logging.getLogger(__name__)
 ROSTER_FILE = Path("player_stats.txt")
 SCHEDULE_FILE = Path("schedule.txt")
 OUTPUT_MODEL = Path("winner.keras")
+OUTPUT_BUNDLE = DEFAULT_BUNDLE_PATH
+WATERMARK_FILE = Path("winner.watermark.json")
+
+# Multi-season layout: one sub-directory per season holding both files
+SEASON_ROSTER_NAME = ROSTER_FILE.name
+SEASON_SCHEDULE_NAME = SCHEDULE_FILE.name
+DEFAULT_SHARDS_DIR = Path("shards")
+SHARD_MANIFEST = "manifest.json"
+DEFAULT_SHARD_ROWS = 4096
+
+# Every Nth game is held out for validation; --incremental also sets aside
+# the games one row later for early stopping
+VALIDATION_EVERY = 5
+
+# Incremental fine-tuning bounds
+DEFAULT_FINE_TUNE_EPOCHS = 20
+FINE_TUNE_PATIENCE = 3
 
 # Feature columns from roster data
 FEATURE_COLS: list[str] = [
@@ -45,6 +86,8 @@ FEATURE_COLS: list[str] = [
     "FT%",
     "2P",
 ]
+# Roster columns map positionally onto the app's STAT_COLUMNS
+assert len(FEATURE_COLS) - 1 == len(STAT_COLUMNS)
 
 # Hyperparameter search space
 OPTIMIZERS: list[str] = [
@@ -109,6 +152,272 @@ def create_stats(roster: pd.DataFrame, schedule: pd.DataFrame) -> list[np.ndarra
     return features
 
 
+def build_season_features(
+    roster: pd.DataFrame, schedule: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build the feature matrix and labels for one season without Python loops.
+
+    Each team's roster rows are flattened once into a float32 vector, and the
+    per-game features are gathered by indexing those vectors, so the cost is
+    independent of how many games reference the same team. Games involving a
+    team without exactly ``TEAM_SIZE`` roster rows are dropped.
+
+    Args:
+        roster: DataFrame with player statistics
+        schedule: DataFrame with game schedule and scores
+
+    Returns:
+        Tuple of (features, labels) with shapes (games, 100) and (games,),
+        both float32. A label of 1 means the home team won.
+    """
+    stat_cols = FEATURE_COLS[1:]
+    grouped = roster[FEATURE_COLS].groupby("TEAM", sort=True)
+    sizes = grouped.size()
+    teams = sizes.index[sizes == TEAM_SIZE]
+    if len(teams) < len(sizes):
+        logger.warning(
+            "Skipping teams without %d players: %s",
+            TEAM_SIZE,
+            sorted(sizes.index[sizes != TEAM_SIZE]),
+        )
+
+    team_rows = roster[roster["TEAM"].isin(teams)].sort_values("TEAM", kind="stable")
+    team_vectors = np.nan_to_num(
+        team_rows[stat_cols].to_numpy(dtype=np.float32)
+    ).reshape(len(teams), -1)
+    team_index = pd.Index(teams)
+
+    home = team_index.get_indexer(schedule["Home/Neutral"])
+    away = team_index.get_indexer(schedule["Visitor/Neutral"])
+    valid = (home >= 0) & (away >= 0)
+    if not valid.all():
+        logger.warning("Skipping %d games with unknown teams", int((~valid).sum()))
+
+    features = np.concatenate(
+        [team_vectors[home[valid]], team_vectors[away[valid]]], axis=1
+    )
+    labels = (schedule["PTS"] <= schedule["PTS.1"]).to_numpy(dtype=np.float32)
+    return features, labels[valid]
+
+
+def discover_seasons(seasons_dir: Path) -> list[tuple[str, Path, Path]]:
+    """Find season sub-directories that contain a roster and a schedule.
+
+    Args:
+        seasons_dir: Directory with one sub-directory per season
+
+    Returns:
+        Sorted list of (season_name, roster_path, schedule_path)
+
+    Raises:
+        FileNotFoundError: If no complete season is found
+    """
+    seasons: list[tuple[str, Path, Path]] = []
+    for season_dir in sorted(p for p in seasons_dir.iterdir() if p.is_dir()):
+        roster_path = season_dir / SEASON_ROSTER_NAME
+        schedule_path = season_dir / SEASON_SCHEDULE_NAME
+        if roster_path.exists() and schedule_path.exists():
+            seasons.append((season_dir.name, roster_path, schedule_path))
+        else:
+            logger.warning("Skipping incomplete season directory: %s", season_dir)
+
+    if not seasons:
+        raise FileNotFoundError(f"No season directories found in {seasons_dir}")
+    return seasons
+
+
+def iter_season_features(
+    seasons: list[tuple[str, Path, Path]],
+) -> Iterator[tuple[str, np.ndarray, np.ndarray]]:
+    """Yield features one season at a time so only one season is in memory.
+
+    Args:
+        seasons: Output of discover_seasons
+
+    Yields:
+        Tuples of (season_name, features, labels)
+    """
+    for name, roster_path, schedule_path in seasons:
+        roster = pd.read_csv(roster_path, delimiter=",")
+        schedule = pd.read_csv(schedule_path, delimiter=",")
+        features, labels = build_season_features(roster, schedule)
+        logger.info("Season %s: %d games", name, len(labels))
+        yield name, features, labels
+
+
+def write_shards(
+    season_features: Iterator[tuple[str, np.ndarray, np.ndarray]],
+    shards_dir: Path,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+) -> list[dict[str, str | int]]:
+    """Stream season features into fixed-size float32 shards on disk.
+
+    At most one shard worth of rows is buffered at a time. A manifest listing
+    every shard and its row count is written next to the shards.
+
+    Args:
+        season_features: Iterator from iter_season_features
+        shards_dir: Output directory for shard files
+        shard_rows: Number of games per shard
+
+    Returns:
+        List of shard records with ``features``, ``labels`` and ``rows`` keys
+    """
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    shards: list[dict[str, str | int]] = []
+    buffer_x: list[np.ndarray] = []
+    buffer_y: list[np.ndarray] = []
+    buffered = 0
+
+    def flush() -> None:
+        nonlocal buffered
+        if not buffered:
+            return
+        index = len(shards)
+        x_name = f"features-{index:05d}.npy"
+        y_name = f"labels-{index:05d}.npy"
+        np.save(shards_dir / x_name, np.concatenate(buffer_x).astype(np.float32))
+        np.save(shards_dir / y_name, np.concatenate(buffer_y).astype(np.float32))
+        shards.append({"features": x_name, "labels": y_name, "rows": buffered})
+        buffer_x.clear()
+        buffer_y.clear()
+        buffered = 0
+
+    for _, features, labels in season_features:
+        start = 0
+        while start < len(labels):
+            take = min(shard_rows - buffered, len(labels) - start)
+            buffer_x.append(features[start : start + take])
+            buffer_y.append(labels[start : start + take])
+            buffered += take
+            start += take
+            if buffered == shard_rows:
+                flush()
+    flush()
+
+    manifest = {"shard_rows": shard_rows, "shards": shards}
+    (shards_dir / SHARD_MANIFEST).write_text(json.dumps(manifest, indent=2))
+    logger.info(
+        "Wrote %d shards (%d games) to %s",
+        len(shards),
+        sum(int(s["rows"]) for s in shards),
+        shards_dir,
+    )
+    return shards
+
+
+def make_shard_dataset(
+    shards_dir: Path,
+    batch_size: int,
+    validation: bool = False,
+    seed: int = 42,
+) -> tf.data.Dataset:
+    """Create a tf.data pipeline that reads batches from memory-mapped shards.
+
+    Shards are opened with ``mmap_mode="r"`` so only the rows of the current
+    batch are paged in. Every ``VALIDATION_EVERY``-th game is routed to the
+    validation split and the rest to training, which keeps the split stable
+    without materializing an index over all seasons.
+
+    Args:
+        shards_dir: Directory written by write_shards
+        batch_size: Games per batch
+        validation: Whether to yield the validation split instead of training
+        seed: Seed for shard and in-shard shuffling of the training split
+
+    Returns:
+        Dataset of (features, labels) batches
+    """
+    manifest = json.loads((shards_dir / SHARD_MANIFEST).read_text())
+    shards = manifest["shards"]
+    # Shared across calls so each epoch sees a different order
+    rng = np.random.default_rng(seed)
+
+    def generate() -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        order = np.arange(len(shards))
+        if not validation:
+            rng.shuffle(order)
+        for shard_index in order:
+            shard = shards[shard_index]
+            features = np.load(shards_dir / shard["features"], mmap_mode="r")
+            labels = np.load(shards_dir / shard["labels"], mmap_mode="r")
+            rows = np.arange(len(labels))
+            holdout = rows % VALIDATION_EVERY == 0
+            rows = rows[holdout] if validation else rows[~holdout]
+            if not validation:
+                rng.shuffle(rows)
+            for start in range(0, len(rows), batch_size):
+                batch = np.sort(rows[start : start + batch_size])
+                yield np.asarray(features[batch]), np.asarray(labels[batch])
+
+    n_features = 2 * TEAM_SIZE * (len(FEATURE_COLS) - 1)
+    return tf.data.Dataset.from_generator(
+        generate,
+        output_signature=(
+            tf.TensorSpec(shape=(None, n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    ).prefetch(tf.data.AUTOTUNE)
+
+
+def train_streaming(
+    shards_dir: Path,
+    optimizer: str,
+    init: str,
+    epochs: int,
+    batch_size: int,
+) -> tuple[keras.Model, float]:
+    """Train a single configuration from on-disk shards.
+
+    Args:
+        shards_dir: Directory written by write_shards
+        optimizer: Optimizer name
+        init: Weight initializer name
+        epochs: Number of passes over the training split
+        batch_size: Games per batch
+
+    Returns:
+        Tuple of (trained_model, validation_accuracy)
+    """
+    model = create_model(optimizer=optimizer, init=init)
+    train_ds = make_shard_dataset(shards_dir, batch_size)
+    val_ds = make_shard_dataset(shards_dir, batch_size, validation=True)
+
+    logger.info(
+        "Streaming training: optimizer=%s init=%s epochs=%d batch_size=%d",
+        optimizer,
+        init,
+        epochs,
+        batch_size,
+    )
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, shuffle=False, verbose=2)
+    _, val_accuracy = model.evaluate(val_ds, verbose=0)
+    return model, float(val_accuracy)
+
+
+def export_bundle(
+    model: keras.Model,
+    metrics: dict[str, float],
+    bundle_path: Path = OUTPUT_BUNDLE,
+) -> None:
+    """Write a trained Keras model as the versioned serving bundle.
+
+    Args:
+        model: Trained model made of Dense layers
+        metrics: Metrics to record in the manifest
+        bundle_path: Bundle output directory
+    """
+    dense_layers = [layer for layer in model.layers if layer.get_weights()]
+    layers = [
+        (
+            *layer.get_weights(),
+            keras.activations.serialize(layer.activation),
+        )
+        for layer in dense_layers
+    ]
+    save_bundle(bundle_path, layers, metrics)
+
+
 def create_model(
     optimizer: str = "rmsprop", init: str = "glorot_uniform"
 ) -> keras.Model:
@@ -186,8 +495,326 @@ def train_model(
     return best_model.model_, best_params, test_accuracy
 
 
+def schedule_fingerprint(schedule: pd.DataFrame) -> str:
+    """Hash the scored columns of a schedule so edits to past games are caught.
+
+    Args:
+        schedule: Schedule rows to fingerprint
+
+    Returns:
+        Hex digest over teams and scores of every row
+    """
+    cols = ["Visitor/Neutral", "PTS", "Home/Neutral", "PTS.1"]
+    row_hashes = pd.util.hash_pandas_object(schedule[cols], index=False)
+    return hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+
+
+def read_watermark(path: Path = WATERMARK_FILE) -> dict | None:
+    """Read the incremental-training watermark, if one has been written.
+
+    Args:
+        path: Watermark file location
+
+    Returns:
+        Dict with ``games_seen``, ``fingerprint`` and ``val_accuracy``, or None
+    """
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def write_watermark(
+    schedule: pd.DataFrame, val_accuracy: float | None, path: Path = WATERMARK_FILE
+) -> None:
+    """Record that every row of ``schedule`` has been trained on.
+
+    Args:
+        schedule: Schedule rows the current model has seen
+        val_accuracy: Held-out accuracy of the current model, if known
+        path: Watermark file location
+    """
+    watermark = {
+        "games_seen": len(schedule),
+        "fingerprint": schedule_fingerprint(schedule),
+        "val_accuracy": val_accuracy,
+    }
+    path.write_text(json.dumps(watermark, indent=2))
+    logger.info("Watermark advanced to %d games", len(schedule))
+
+
+def holdout_mask(n_rows: int) -> np.ndarray:
+    """Return the stable validation mask over schedule row positions.
+
+    The full retrain, ``--incremental`` and ``--export-bundle`` all hold out
+    these games, so a model is never scored on games it was trained on and
+    the promotion gate compares current and candidate fairly.
+
+    Args:
+        n_rows: Number of schedule rows
+
+    Returns:
+        Boolean array, True for every ``VALIDATION_EVERY``-th game
+    """
+    return np.arange(n_rows) % VALIDATION_EVERY == 0
+
+
+def holdout_split(
+    X: np.ndarray, y: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split the full retrain's rows on ``holdout_mask``.
+
+    Args:
+        X: Feature rows, one per schedule row
+        y: Labels, one per schedule row
+
+    Returns:
+        Tuple of (X_train, X_test, y_train, y_test)
+    """
+    holdout = holdout_mask(len(X))
+    return X[~holdout], X[holdout], y[~holdout], y[holdout]
+
+
+def early_stopping_mask(n_rows: int) -> np.ndarray:
+    """Return the mask of games ``--incremental`` picks its best epoch on.
+
+    These are the games one row after each held-out game, so they never
+    overlap ``holdout_mask``. Choosing the epoch on the promotion holdout
+    would bias the gate in the candidate's favour.
+
+    Args:
+        n_rows: Number of schedule rows
+
+    Returns:
+        Boolean array, True for every game at ``VALIDATION_EVERY * k + 1``
+    """
+    return np.arange(n_rows) % VALIDATION_EVERY == 1
+
+
+def fine_tune(
+    model: keras.Model,
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_stop: np.ndarray,
+    y_stop: np.ndarray,
+    max_epochs: int,
+    batch_size: int,
+) -> keras.Model:
+    """Continue training an already-fitted model for a bounded number of epochs.
+
+    Early stopping on the loss over ``x_stop`` restores the best weights
+    seen, so a bad epoch never ends up in the candidate.
+
+    Args:
+        model: Compiled model loaded from the current artifact
+        x_train: Features of new games outside both validation slices
+        y_train: Labels of new games outside both validation slices
+        x_stop: Early-stopping features, disjoint from the promotion holdout
+        y_stop: Early-stopping labels
+        max_epochs: Upper bound on fine-tuning epochs
+        batch_size: Games per batch
+
+    Returns:
+        The fine-tuned model
+    """
+    early_stop = keras.callbacks.EarlyStopping(
+        monitor="val_loss",
+        patience=FINE_TUNE_PATIENCE,
+        restore_best_weights=True,
+    )
+    model.fit(
+        x_train,
+        y_train,
+        validation_data=(x_stop, y_stop),
+        epochs=max_epochs,
+        batch_size=batch_size,
+        callbacks=[early_stop],
+        verbose=2,
+    )
+    return model
+
+
+def promote_model(model: keras.Model, path: Path = OUTPUT_MODEL) -> None:
+    """Save a model next to the live artifact and atomically swap it in.
+
+    Args:
+        model: Model to publish
+        path: Live artifact path
+    """
+    staging = path.with_name(f"{path.stem}.staging{path.suffix}")
+    model.save(staging)
+    staging.replace(path)
+    logger.info("Promoted new model to %s", path)
+
+
+def main_incremental(args: argparse.Namespace) -> None:
+    """Warm-start pipeline: fine-tune on games appended since the watermark."""
+    roster = pd.read_csv(ROSTER_FILE, delimiter=",")
+    schedule = pd.read_csv(SCHEDULE_FILE, delimiter=",")
+    watermark = read_watermark()
+
+    if watermark is None:
+        logger.info(
+            "No watermark found; assuming %s was trained on all %d games",
+            OUTPUT_MODEL,
+            len(schedule),
+        )
+        write_watermark(schedule, val_accuracy=None)
+        return
+
+    seen = int(watermark["games_seen"])
+    if seen > len(schedule) or (
+        schedule_fingerprint(schedule.iloc[:seen]) != watermark["fingerprint"]
+    ):
+        raise ValueError(
+            f"{SCHEDULE_FILE} no longer matches the watermark (past games were "
+            "edited or removed); run a full retrain instead of --incremental"
+        )
+
+    if seen == len(schedule):
+        logger.info("No new games since the last run (%d seen)", seen)
+        return
+
+    # The promotion gate scores on holdout; epochs are picked on stopping
+    holdout = holdout_mask(len(schedule))
+    stopping = early_stopping_mask(len(schedule))
+    new_rows = np.zeros(len(schedule), dtype=bool)
+    new_rows[seen:] = True
+    x_train, y_train = build_season_features(
+        roster, schedule[new_rows & ~holdout & ~stopping]
+    )
+    x_stop, y_stop = build_season_features(roster, schedule[stopping])
+    x_val, y_val = build_season_features(roster, schedule[holdout])
+    logger.info(
+        "Fine-tuning on %d new games, stopping on %d, gating on %d held-out games",
+        len(y_train),
+        len(y_stop),
+        len(y_val),
+    )
+
+    current = keras.models.load_model(OUTPUT_MODEL)
+    _, baseline_accuracy = current.evaluate(x_val, y_val, verbose=0)
+
+    if len(y_train):
+        candidate = keras.models.load_model(OUTPUT_MODEL)
+        fine_tune(
+            candidate,
+            x_train,
+            y_train,
+            x_stop,
+            y_stop,
+            max_epochs=args.max_epochs,
+            batch_size=args.batch_size,
+        )
+        _, candidate_accuracy = candidate.evaluate(x_val, y_val, verbose=0)
+    else:
+        # Only validation games arrived; nothing to fit, but still advance
+        candidate, candidate_accuracy = current, baseline_accuracy
+
+    logger.info(
+        "Held-out accuracy: current=%.4f candidate=%.4f",
+        baseline_accuracy,
+        candidate_accuracy,
+    )
+    if candidate_accuracy < baseline_accuracy:
+        logger.warning("Candidate regressed; keeping %s", OUTPUT_MODEL)
+        return
+
+    if candidate is not current:
+        promote_model(candidate)
+        export_bundle(
+            candidate,
+            {"val_accuracy": float(candidate_accuracy), "games": float(len(schedule))},
+        )
+    write_watermark(schedule, val_accuracy=float(candidate_accuracy))
+
+
+def main_export() -> None:
+    """Rebuild the serving bundle from the existing Keras checkpoint."""
+    roster = pd.read_csv(ROSTER_FILE, delimiter=",")
+    schedule = pd.read_csv(SCHEDULE_FILE, delimiter=",")
+    x_val, y_val = build_season_features(roster, schedule[holdout_mask(len(schedule))])
+
+    model = keras.models.load_model(OUTPUT_MODEL)
+    _, accuracy = model.evaluate(x_val, y_val, verbose=0)
+    logger.info("Held-out accuracy of %s: %.4f", OUTPUT_MODEL, accuracy)
+    export_bundle(
+        model, {"holdout_accuracy": float(accuracy), "games": float(len(schedule))}
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # --incremental and --export-bundle work on the single-season files, so
+    # they cannot be combined with a seasons directory or each other
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--seasons-dir",
+        type=Path,
+        help="Directory of season sub-directories, each with "
+        f"{SEASON_ROSTER_NAME} and {SEASON_SCHEDULE_NAME}",
+    )
+    modes.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Fine-tune {OUTPUT_MODEL} on games added since {WATERMARK_FILE}",
+    )
+    modes.add_argument(
+        "--export-bundle",
+        action="store_true",
+        help=f"Only convert {OUTPUT_MODEL} into the serving bundle",
+    )
+    parser.add_argument("--max-epochs", type=int, default=DEFAULT_FINE_TUNE_EPOCHS)
+    parser.add_argument("--shards-dir", type=Path, default=DEFAULT_SHARDS_DIR)
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument("--optimizer", default="RMSprop", choices=OPTIMIZERS)
+    parser.add_argument("--init", default="glorot_uniform", choices=INITIALIZERS)
+    parser.add_argument("--epochs", type=int, default=EPOCHS[0])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZES[1])
+    return parser.parse_args(argv)
+
+
+def main_streaming(args: argparse.Namespace) -> None:
+    """Multi-season pipeline: build shards season by season, then train."""
+    seasons = discover_seasons(args.seasons_dir)
+    logger.info("Found %d seasons in %s", len(seasons), args.seasons_dir)
+
+    write_shards(iter_season_features(seasons), args.shards_dir, args.shard_rows)
+
+    model, val_accuracy = train_streaming(
+        args.shards_dir,
+        optimizer=args.optimizer,
+        init=args.init,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+    )
+
+    logger.info("Saving model to %s", OUTPUT_MODEL)
+    model.save(OUTPUT_MODEL)
+    export_bundle(model, {"val_accuracy": val_accuracy, "seasons": float(len(seasons))})
+    logger.info("Validation accuracy: %.4f", val_accuracy)
+
+
 def main() -> None:
     """Main training pipeline."""
+    args = parse_args()
+    if args.export_bundle:
+        main_export()
+        return
+    if args.incremental:
+        main_incremental(args)
+        return
+    if args.seasons_dir is not None:
+        main_streaming(args)
+        return
+
     logger.info("Loading data files")
 
     if not ROSTER_FILE.exists():
@@ -215,10 +842,8 @@ def main() -> None:
 
     logger.info("Feature shape: %s, Target shape: %s", X.shape, y.shape)
 
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    # Hold out the same games --incremental validates on
+    X_train, X_test, y_train, y_test = holdout_split(X, y)
 
     logger.info("Train size: %d, Test size: %d", len(X_train), len(X_test))
 
@@ -230,6 +855,11 @@ def main() -> None:
     # Save model
     logger.info("Saving model to %s", OUTPUT_MODEL)
     best_model.save(OUTPUT_MODEL)
+    export_bundle(
+        best_model,
+        {"test_accuracy": float(test_accuracy), "games": float(len(schedule))},
+    )
+    write_watermark(schedule, val_accuracy=float(test_accuracy))
 
     logger.info("Best parameters: %s", best_params)
     logger.info("Test accuracy: %.4f", test_accuracy)
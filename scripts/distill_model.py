@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Distill the serving model into a much smaller student model.
+
+The teacher is the serving bundle (numerically identical to ``winner.keras``).
+A student -- logistic regression or a one-hidden-layer MLP over the same 100
+features -- is fitted to the teacher's probabilities on real games from the
+schedule plus synthetic matchups, then written as ``student_bundle/`` so
+``src.ml`` can serve it with ``variant="student"``.
+
+Inputs are standardized during training and the scaling is folded into the
+student's first layer on export, so the bundle still takes raw stats.
+
+Reported: label agreement with the teacher on held-out real and synthetic
+matchups, mean absolute probability gap, FLOPs, and single-row/batch latency
+of teacher and student. The bundle is only written if the student agrees
+with the teacher on at least ``--min-agreement`` of both the real and the
+synthetic matchups; otherwise the script exits with an error and leaves
+any existing student bundle alone.
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.distill_model
+    python -m scripts.distill_model --student logistic --synthetic synthetic/
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from scripts.compile_model import (
+    ROSTER_FILE,
+    SCHEDULE_FILE,
+    build_season_features,
+    holdout_mask,
+)
+from scripts.generate_matchups import (
+    SHARD_MANIFEST,
+    load_stat_matrix,
+    matchup_features,
+    sample_matchups,
+)
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.ml.bundle import (
+    DEFAULT_BUNDLE_PATH,
+    STUDENT_BUNDLE_PATH,
+    DenseLayer,
+    ModelBundle,
+    load_bundle,
+    save_bundle,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+STUDENTS = ("mlp", "logistic")
+DEFAULT_SYNTHETIC_GAMES = 500_000
+DEFAULT_EPOCHS = 20
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_HIDDEN = 32
+# Share of held-out matchups, real and synthetic alike, on which the student
+# must pick the teacher's winner before it is written
+DEFAULT_MIN_AGREEMENT = 0.99
+LATENCY_REPEATS = 2000
+LATENCY_BATCH = 10_000
+
+
+def load_synthetic(
+    teacher: ModelBundle,
+    synthetic_dir: Path | None,
+    n_games: int,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Load up to ``n_games`` synthetic matchups labelled by the teacher.
+
+    Reads from a generate_matchups output directory when given (re-labelling
+    with this teacher), otherwise samples fresh matchups in memory.
+
+    Args:
+        teacher: Teacher bundle used for labels
+        synthetic_dir: Optional directory written by generate_matchups
+        n_games: Maximum number of matchups
+        seed: Random seed for in-memory sampling
+
+    Returns:
+        Tuple of (features, teacher_probabilities)
+    """
+    if synthetic_dir is None:
+        stats = load_stat_matrix()
+        ids = sample_matchups(np.random.default_rng(seed), len(stats), n_games)
+        features = matchup_features(stats, ids)
+    else:
+        manifest = json.loads((synthetic_dir / SHARD_MANIFEST).read_text())
+        chunks: list[np.ndarray] = []
+        remaining = n_games
+        for shard in manifest["shards"]:
+            if remaining <= 0:
+                break
+            shard_x = np.load(synthetic_dir / shard["features"], mmap_mode="r")
+            chunks.append(np.asarray(shard_x[:remaining]))
+            remaining -= len(chunks[-1])
+        features = np.concatenate(chunks)
+    return features, teacher.predict_proba(features)
+
+
+def build_student(kind: str, hidden: int) -> keras.Model:
+    """Create the student network.
+
+    Args:
+        kind: "logistic" or "mlp"
+        hidden: Hidden units for the MLP student
+
+    Returns:
+        Compiled Keras model
+    """
+    inputs = keras.Input(shape=(100,))
+    x = inputs
+    if kind == "mlp":
+        x = layers.Dense(hidden, activation="relu")(x)
+    outputs = layers.Dense(1, activation="sigmoid")(x)
+
+    model = keras.Model(inputs=inputs, outputs=outputs, name=f"student_{kind}")
+    model.compile(
+        loss=keras.losses.BinaryCrossentropy(),
+        optimizer=keras.optimizers.Adam(learning_rate=3e-3),
+    )
+    return model
+
+
+def export_layers(
+    model: keras.Model, mean: np.ndarray, std: np.ndarray
+) -> list[tuple[np.ndarray, np.ndarray, str]]:
+    """Extract dense layers, folding input standardization into the first.
+
+    ``((x - mean) / std) @ W + b == x @ (W / std) + (b - (mean / std) @ W)``
+
+    Args:
+        model: Trained student
+        mean: Per-feature training mean
+        std: Per-feature training standard deviation
+
+    Returns:
+        Layers in the format expected by save_bundle
+    """
+    dense = [layer for layer in model.layers if layer.get_weights()]
+    exported: list[tuple[np.ndarray, np.ndarray, str]] = []
+    for i, layer in enumerate(dense):
+        kernel, bias = layer.get_weights()
+        if i == 0:
+            bias = bias - (mean / std) @ kernel
+            kernel = kernel / std[:, None]
+        exported.append((kernel, bias, keras.activations.serialize(layer.activation)))
+    return exported
+
+
+def agreement(teacher: np.ndarray, student: np.ndarray) -> tuple[float, float]:
+    """Return (label agreement rate, mean absolute probability gap)."""
+    labels_match = (teacher >= 0.5) == (student >= 0.5)
+    return float(labels_match.mean()), float(np.abs(teacher - student).mean())
+
+
+def measure_latency(bundle: ModelBundle, features: np.ndarray) -> tuple[float, float]:
+    """Measure single-row latency and batch throughput of a bundle.
+
+    Args:
+        bundle: Bundle to time
+        features: Sample features (at least one row)
+
+    Returns:
+        Tuple of (median single-row microseconds, batch rows per second)
+    """
+    row = features[:1]
+    timings = np.empty(LATENCY_REPEATS)
+    for i in range(LATENCY_REPEATS):
+        started = time.perf_counter()
+        bundle.predict_proba(row)
+        timings[i] = time.perf_counter() - started
+
+    batch = np.resize(features, (LATENCY_BATCH, features.shape[1]))
+    started = time.perf_counter()
+    bundle.predict_proba(batch)
+    batch_seconds = time.perf_counter() - started
+    return float(np.median(timings) * 1e6), LATENCY_BATCH / batch_seconds
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--student", choices=STUDENTS, default="mlp")
+    parser.add_argument("--hidden", type=int, default=DEFAULT_HIDDEN)
+    parser.add_argument("--teacher", type=Path, default=DEFAULT_BUNDLE_PATH)
+    parser.add_argument("--out", type=Path, default=STUDENT_BUNDLE_PATH)
+    parser.add_argument("--synthetic", type=Path, default=None)
+    parser.add_argument("--synthetic-games", type=int, default=DEFAULT_SYNTHETIC_GAMES)
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-agreement", type=float, default=DEFAULT_MIN_AGREEMENT)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Distill the teacher bundle into a student bundle."""
+    args = parse_args()
+    keras.utils.set_random_seed(args.seed)
+    teacher = load_bundle(args.teacher)
+
+    roster = pd.read_csv(ROSTER_FILE, delimiter=",")
+    schedule = pd.read_csv(SCHEDULE_FILE, delimiter=",")
+    holdout = holdout_mask(len(schedule))
+    real_train, _ = build_season_features(roster, schedule[~holdout])
+    real_val, _ = build_season_features(roster, schedule[holdout])
+
+    synth_x, synth_p = load_synthetic(
+        teacher, args.synthetic, args.synthetic_games, args.seed
+    )
+    synth_holdout = holdout_mask(len(synth_x))
+
+    x_train = np.concatenate([real_train, synth_x[~synth_holdout]])
+    p_train = np.concatenate(
+        [teacher.predict_proba(real_train), synth_p[~synth_holdout]]
+    )
+    logger.info(
+        "Distilling %s student on %d matchups (%d real)",
+        args.student,
+        len(x_train),
+        len(real_train),
+    )
+
+    mean = x_train.mean(axis=0)
+    std = x_train.std(axis=0)
+    std[std == 0] = 1.0
+    student_model = build_student(args.student, args.hidden)
+    student_model.fit(
+        (x_train - mean) / std,
+        p_train,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        verbose=2,
+    )
+
+    # Evaluate through the exported NumPy path, exactly as it will be served
+    exported = export_layers(student_model, mean, std)
+    staged = ModelBundle(
+        version="candidate",
+        content_hash="",
+        stat_columns=tuple(STAT_COLUMNS),
+        team_size=TEAM_SIZE,
+        layers=tuple(
+            DenseLayer(np.asarray(k, np.float32), np.asarray(b, np.float32), a)
+            for k, b, a in exported
+        ),
+    )
+
+    real_agree, real_gap = agreement(
+        teacher.predict_proba(real_val), staged.predict_proba(real_val)
+    )
+    synth_val = synth_x[synth_holdout]
+    synth_agree, synth_gap = agreement(
+        synth_p[synth_holdout], staged.predict_proba(synth_val)
+    )
+    teacher_us, teacher_rps = measure_latency(teacher, synth_val)
+    student_us, student_rps = measure_latency(staged, synth_val)
+
+    metrics = {
+        "agreement_real": real_agree,
+        "agreement_synthetic": synth_agree,
+        "prob_gap_real": real_gap,
+        "prob_gap_synthetic": synth_gap,
+        "flops": float(staged.flops),
+        "teacher_flops": float(teacher.flops),
+        "latency_us": student_us,
+        "teacher_latency_us": teacher_us,
+    }
+    logger.info("Agreement: real=%.4f synthetic=%.4f", real_agree, synth_agree)
+    logger.info(
+        "Mean |p_teacher - p_student|: real=%.4f synthetic=%.4f", real_gap, synth_gap
+    )
+    logger.info("FLOPs/prediction: teacher=%d student=%d", teacher.flops, staged.flops)
+    logger.info(
+        "Single-row latency: teacher=%.1fus student=%.1fus", teacher_us, student_us
+    )
+    logger.info(
+        "Batch throughput: teacher=%.0f rows/s student=%.0f rows/s",
+        teacher_rps,
+        student_rps,
+    )
+
+    if min(real_agree, synth_agree) < args.min_agreement:
+        raise SystemExit(
+            f"Student agrees with the teacher on {real_agree:.4f} of real and "
+            f"{synth_agree:.4f} of synthetic matchups, below the required "
+            f"{args.min_agreement:.4f}; not writing {args.out}"
+        )
+    save_bundle(args.out, exported, metrics, teacher=teacher.version)
+    logger.info("Wrote student bundle to %s", args.out)
+
+
+if __name__ == "__main__":
+    main()
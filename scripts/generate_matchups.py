@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Synthetic 5-vs-5 matchup generator for large-scale training data.
+
+Samples random matchups of ten distinct players from ``snowflake_nba.csv``,
+lays their stats out exactly like ``analyze_team_stats`` (five home players
+then five away players, ``STAT_COLUMNS`` order), labels them with a teacher,
+and writes the result as sharded, memory-mapped ``.npy`` arrays. Sampling,
+feature gathering and labelling are all whole-array NumPy operations.
+
+Teachers:
+    model      home-win probability from the serving bundle (soft labels)
+    heuristic  logistic of the difference in summed standardized stats
+
+The shard manifest uses the same layout as ``compile_model --seasons-dir``
+(``features-*.npy``/``labels-*.npy`` plus ``manifest.json``), with an extra
+``ids-*.npy`` holding the sampled player rows of each matchup.
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.generate_matchups --games 2000000 --out synthetic/
+    python -m scripts.generate_matchups --teacher heuristic --temperature 4
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.database.connection import load_data
+from src.ml.bundle import DEFAULT_BUNDLE_PATH, load_bundle
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path("synthetic")
+SHARD_MANIFEST = "manifest.json"
+DEFAULT_SHARD_ROWS = 262_144
+DEFAULT_GAMES = 1_000_000
+DEFAULT_TEMPERATURE = 4.0
+TEACHERS = ("model", "heuristic")
+
+# Heuristic teacher: turnovers count against a team, everything else for it
+HEURISTIC_WEIGHTS = np.array(
+    [-1.0 if col == "TOV" else 1.0 for col in STAT_COLUMNS], dtype=np.float32
+)
+
+Teacher = Callable[[np.ndarray], np.ndarray]
+
+
+def load_stat_matrix() -> np.ndarray:
+    """Load the player stat matrix in ``STAT_COLUMNS`` order.
+
+    Returns:
+        Float32 array of shape (players, len(STAT_COLUMNS)) with NaNs zeroed
+    """
+    df = load_data()
+    return np.nan_to_num(df[STAT_COLUMNS].to_numpy(dtype=np.float32))
+
+
+def sample_matchups(
+    rng: np.random.Generator, n_players: int, n_games: int
+) -> np.ndarray:
+    """Sample matchups of ``2 * TEAM_SIZE`` distinct player rows.
+
+    Rows are drawn with replacement and only rows containing a repeated
+    player are redrawn, which converges in a few rounds because collisions
+    are rare when the player pool is large.
+
+    Args:
+        rng: Random generator
+        n_players: Number of players to draw from
+        n_games: Number of matchups
+
+    Returns:
+        Int32 array of shape (n_games, 2 * TEAM_SIZE); the first TEAM_SIZE
+        columns are the home team
+
+    Raises:
+        ValueError: If there are not enough players for a matchup
+    """
+    slots = 2 * TEAM_SIZE
+    if n_players < slots:
+        raise ValueError(f"Need at least {slots} players, have {n_players}")
+
+    ids = rng.integers(0, n_players, size=(n_games, slots), dtype=np.int32)
+    pending = np.arange(n_games)
+    while pending.size:
+        ordered = np.sort(ids[pending], axis=1)
+        has_dup = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        pending = pending[has_dup]
+        ids[pending] = rng.integers(
+            0, n_players, size=(pending.size, slots), dtype=np.int32
+        )
+    return ids
+
+
+def matchup_features(stats: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Gather model features for matchups.
+
+    Args:
+        stats: Player stat matrix from load_stat_matrix
+        ids: Matchup player rows from sample_matchups
+
+    Returns:
+        Float32 array of shape (n_games, 2 * TEAM_SIZE * len(STAT_COLUMNS))
+    """
+    return stats[ids].reshape(len(ids), -1)
+
+
+def model_teacher(bundle_path: Path = DEFAULT_BUNDLE_PATH) -> Teacher:
+    """Build a teacher that labels matchups with the serving model.
+
+    Args:
+        bundle_path: Bundle directory
+
+    Returns:
+        Callable mapping features to home-win probabilities
+    """
+    bundle = load_bundle(bundle_path)
+    logger.info("Teacher: model bundle %s", bundle.version)
+    return bundle.predict_proba
+
+
+def heuristic_teacher(stats: np.ndarray, temperature: float) -> Teacher:
+    """Build a teacher from summed standardized player stats.
+
+    Args:
+        stats: Player stat matrix used to standardize features
+        temperature: Scale of the strength difference; higher is less certain
+
+    Returns:
+        Callable mapping features to home-win probabilities
+    """
+    std = stats.std(axis=0)
+    std[std == 0] = 1.0
+    # Means cancel in the home-minus-away difference, so only scale matters
+    per_player = HEURISTIC_WEIGHTS / std
+
+    def label(features: np.ndarray) -> np.ndarray:
+        teams = features.reshape(len(features), 2, TEAM_SIZE, len(STAT_COLUMNS))
+        strength = teams.sum(axis=2) @ per_player
+        margin = (strength[:, 0] - strength[:, 1]) / temperature
+        return (0.5 * (1.0 + np.tanh(0.5 * margin))).astype(np.float32)
+
+    logger.info("Teacher: stat heuristic (temperature=%.2f)", temperature)
+    return label
+
+
+def write_shards(
+    stats: np.ndarray,
+    teacher: Teacher,
+    out_dir: Path,
+    n_games: int,
+    shard_rows: int,
+    seed: int,
+) -> list[dict[str, str | int]]:
+    """Generate, label and write matchups shard by shard.
+
+    Each shard is written through ``open_memmap`` so the arrays go straight
+    to disk, and only one shard is ever held in memory.
+
+    Args:
+        stats: Player stat matrix
+        teacher: Labelling function
+        out_dir: Output directory
+        n_games: Total matchups to generate
+        shard_rows: Matchups per shard
+        seed: Random seed
+
+    Returns:
+        List of shard records as written to the manifest
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    width = 2 * TEAM_SIZE * len(STAT_COLUMNS)
+    shards: list[dict[str, str | int]] = []
+
+    for index, start in enumerate(range(0, n_games, shard_rows)):
+        rows = min(shard_rows, n_games - start)
+        names = {
+            "features": f"features-{index:05d}.npy",
+            "labels": f"labels-{index:05d}.npy",
+            "ids": f"ids-{index:05d}.npy",
+        }
+        ids = sample_matchups(rng, len(stats), rows)
+
+        features = np.lib.format.open_memmap(
+            out_dir / names["features"],
+            mode="w+",
+            dtype=np.float32,
+            shape=(rows, width),
+        )
+        features[:] = matchup_features(stats, ids)
+        labels = np.lib.format.open_memmap(
+            out_dir / names["labels"], mode="w+", dtype=np.float32, shape=(rows,)
+        )
+        labels[:] = teacher(features)
+        np.save(out_dir / names["ids"], ids)
+        features.flush()
+        labels.flush()
+        del features, labels
+
+        shards.append({**names, "rows": rows})
+
+    manifest = {
+        "shard_rows": shard_rows,
+        "seed": seed,
+        "stat_columns": list(STAT_COLUMNS),
+        "team_size": TEAM_SIZE,
+        "shards": shards,
+    }
+    (out_dir / SHARD_MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return shards
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument("--teacher", choices=TEACHERS, default="model")
+    parser.add_argument("--bundle", type=Path, default=DEFAULT_BUNDLE_PATH)
+    parser.add_argument("--temperature", type=float, default=DEFAULT_TEMPERATURE)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Generate a synthetic matchup dataset."""
+    args = parse_args()
+    stats = load_stat_matrix()
+    logger.info("Loaded %d players", len(stats))
+
+    teacher = (
+        model_teacher(args.bundle)
+        if args.teacher == "model"
+        else heuristic_teacher(stats, args.temperature)
+    )
+
+    started = time.perf_counter()
+    shards = write_shards(
+        stats, teacher, args.out, args.games, args.shard_rows, args.seed
+    )
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Wrote %d matchups in %d shards to %s in %.2fs (%.0f games/s)",
+        args.games,
+        len(shards),
+        args.out,
+        elapsed,
+        args.games / elapsed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Concurrent load test for the Streamlit app, run entirely in-process.
+
+Each simulated session drives the real page scripts with ``streamlit.testing``
+AppTest through a realistic flow:
+
+    landing page -> team builder -> search -> select five players ->
+    save team -> change difficulty -> play -> "Play New Team" (repeated)
+
+AppTest swaps process-global Streamlit state (the runtime, page manager and
+config) on every run, so concurrent sessions cannot share one process.
+Each session therefore runs in its own worker process, all started together
+so they compete for the node's CPU as real sessions would. Caches and the
+away-team reservoir are per worker, which makes the numbers conservative.
+Each page gets its own AppTest, and the session keys the play page needs
+are carried over from the team builder. Every script rerun is timed and
+attributed to its page.
+
+Reported: reruns per second, flows per second, p50/p95/p99 rerun latency
+per page, errors, and peak RSS (largest session process and the sum across
+all of them).
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.load_test --sessions 8 --flows 3
+    python -m scripts.load_test --sessions 32 --json load.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from src.config import DIFFICULTY_PRESETS, TEAM_SIZE
+from src.database.queries import search_player_ids_by_name
+from src.database.store import get_player_store
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+APP_FILE = PROJECT_ROOT / "app.py"
+HOME_PAGE = PROJECT_ROOT / "pages" / "1_home_team.py"
+PLAY_PAGE = PROJECT_ROOT / "pages" / "2_play_game.py"
+
+# Session keys the play page reads from what the team builder saved
+SHARED_STATE = ("home_team_ids", "away_stats", "radio_index")
+
+SEARCH_TERMS = ("James", "Jordan", "Smith", "Johnson", "Brown", "Williams", "Davis")
+DEFAULT_SESSIONS = 8
+DEFAULT_FLOWS = 3
+DEFAULT_NEW_TEAMS = 3
+RERUN_TIMEOUT = 120.0
+STARTUP_GRACE_SECONDS = 15.0
+
+
+@dataclass
+class SessionResult:
+    """Rerun latencies and errors from one simulated session."""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    flows: int = 0
+    peak_rss_mb: float = 0.0
+
+    def record(self, page: str, seconds: float, failed: bool) -> None:
+        """Record one rerun."""
+        self.latencies.setdefault(page, []).append(seconds)
+        if failed:
+            self.errors[page] = self.errors.get(page, 0) + 1
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def candidate_rosters() -> dict[str, list[int]]:
+    """Player ids each search term can offer, for picking rosters."""
+    df = get_player_store().df
+    rosters = {term: search_player_ids_by_name(df, term) for term in SEARCH_TERMS}
+    return {term: ids for term, ids in rosters.items() if len(ids) >= TEAM_SIZE}
+
+
+def timed_run(
+    result: SessionResult, page: str, action: Callable[[], AppTest]
+) -> AppTest:
+    """Run one rerun and record its latency against ``page``."""
+    started = time.perf_counter()
+    at = action()
+    result.record(page, time.perf_counter() - started, bool(at.exception))
+    return at
+
+
+def run_session(
+    session: int,
+    flows: int,
+    new_teams: int,
+    rosters: dict[str, list[int]],
+    start_at: float,
+) -> SessionResult:
+    """Drive one simulated user through ``flows`` complete flows.
+
+    Runs in a worker process; waits until ``start_at`` (wall clock) so all
+    sessions begin together after their imports have finished.
+    """
+    rng = random.Random(session)
+    result = SessionResult()
+    landing, home, play = (
+        AppTest.from_file(str(path), default_timeout=RERUN_TIMEOUT)
+        for path in (APP_FILE, HOME_PAGE, PLAY_PAGE)
+    )
+    time.sleep(max(0.0, start_at - time.time()))
+
+    page = "app"
+    try:
+        timed_run(result, page, landing.run)
+        for _ in range(flows):
+            term = rng.choice(list(rosters))
+            roster = rng.sample(rosters[term], TEAM_SIZE)
+            difficulty = rng.choice(list(DIFFICULTY_PRESETS))
+
+            page = "home_team"
+            timed_run(result, page, home.run)
+            home.text_input[0].set_value(term)
+            timed_run(result, page, home.run)
+            home.multiselect[0].set_value(roster)
+            timed_run(result, page, home.run)
+            home.button[0].click()
+            timed_run(result, page, home.run)
+            home.radio[0].set_value(difficulty)
+            timed_run(result, page, home.run)
+
+            # Carry the session across pages, as st.session_state would
+            for key in SHARED_STATE:
+                play.session_state[key] = home.session_state[key]
+            page = "play_game"
+            timed_run(result, page, play.run)
+            for _ in range(new_teams):
+                play.button[0].click()
+                timed_run(result, page, play.run)
+            result.flows += 1
+    except Exception:
+        # A page that rendered without its widgets ends this session's flows
+        logger.exception("Session %d failed on %s", session, page)
+        result.errors[page] = result.errors.get(page, 0) + 1
+
+    result.peak_rss_mb = peak_rss_mb()
+    return result
+
+
+def summarize(
+    results: list[SessionResult], elapsed: float, sessions: int
+) -> dict[str, object]:
+    """Build the report from every session's results."""
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    for result in results:
+        for page, samples in result.latencies.items():
+            latencies.setdefault(page, []).extend(samples)
+        for page, count in result.errors.items():
+            errors[page] = errors.get(page, 0) + count
+
+    pages: dict[str, dict[str, float]] = {}
+    total = 0
+    for page in sorted(latencies.keys() | errors.keys()):
+        ms = np.asarray(latencies.get(page, [np.nan])) * 1000
+        total += len(latencies.get(page, []))
+        pages[page] = {
+            "reruns": len(latencies.get(page, [])),
+            "errors": errors.get(page, 0),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "max_ms": float(ms.max()),
+        }
+    flows = sum(result.flows for result in results)
+    return {
+        "sessions": sessions,
+        "elapsed_s": elapsed,
+        "reruns": total,
+        "reruns_per_s": total / elapsed,
+        "flows": flows,
+        "flows_per_s": flows / elapsed,
+        "peak_rss_mb": max((r.peak_rss_mb for r in results), default=0.0),
+        "total_peak_rss_mb": sum(r.peak_rss_mb for r in results),
+        "pages": pages,
+    }
+
+
+def print_report(report: dict[str, object]) -> None:
+    """Print the report as a readable table."""
+    print(
+        f"\n{report['sessions']} sessions, {report['flows']} flows, "
+        f"{report['reruns']} reruns in {report['elapsed_s']:.1f}s"
+    )
+    print(
+        f"Throughput: {report['reruns_per_s']:.1f} reruns/s, "
+        f"{report['flows_per_s']:.2f} flows/s"
+    )
+    print(
+        f"Peak RSS: {report['peak_rss_mb']:.0f} MiB per session, "
+        f"{report['total_peak_rss_mb']:.0f} MiB across sessions\n"
+    )
+    print(
+        f"{'page':<12}{'reruns':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    pages = report["pages"]
+    assert isinstance(pages, dict)
+    for page, stats in pages.items():
+        print(
+            f"{page:<12}{stats['reruns']:>8}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--flows", type=int, default=DEFAULT_FLOWS)
+    parser.add_argument("--new-teams", type=int, default=DEFAULT_NEW_TEAMS)
+    parser.add_argument("--json", type=Path, default=None, help="Write report here")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Run the load test and print the report."""
+    args = parse_args()
+    rosters = candidate_rosters()
+    # Give every worker time to import Streamlit and load data before starting
+    start_at = time.time() + STARTUP_GRACE_SECONDS
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.sessions, mp_context=context) as pool:
+        futures = [
+            pool.submit(run_session, i, args.flows, args.new_teams, rosters, start_at)
+            for i in range(args.sessions)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.time() - start_at
+
+    report = summarize(results, elapsed, args.sessions)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        logger.info("Wrote report to %s", args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""Headless batch game runner: play many games without the Streamlit UI.
+
+Rosters are read lazily from either
+
+    a text file, one home roster per line as five comma-separated full
+    names (blank lines and ``#`` comments are skipped), or
+    a CSV of matchups with columns ``home_1`` .. ``home_5`` and, optionally,
+    ``away_1`` .. ``away_5`` (an explicit opponent) and ``difficulty``.
+
+Names are resolved through ``get_players_by_full_names``. Rosters without an
+explicit opponent play teams generated for their difficulty, exactly as the
+play page does. Games are scored in batches with ``predict_win_probabilities``
+and streamed to CSV or JSONL as each batch finishes, so memory stays bounded
+by the batch size however many games are played.
+
+Run from the project root so ``src`` is importable:
+    python -m scripts.play_games rosters.txt --difficulty "All-Stars" --games-per-roster 10
+    python -m scripts.play_games matchups.csv --output results.jsonl
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+
+from src.config import DIFFICULTY_PRESETS, STAT_COLUMNS, TEAM_SIZE
+from src.database.connection import QueryExecutionError
+from src.database.queries import resolve_player_ids
+from src.database.ranks import difficulty_thresholds
+from src.database.reservoir import TeamIds, generate_away_team
+from src.database.store import PlayerStore, get_player_store
+from src.ml.model import analyze_team_stats, predict_win_probabilities
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_DIFFICULTY = "Regular"
+FORMATS = ("csv", "jsonl")
+FIELDS = ("game", "home", "away", "difficulty", "home_win_probability", "winner")
+
+HOME_COLUMNS = [f"home_{i}" for i in range(1, TEAM_SIZE + 1)]
+AWAY_COLUMNS = [f"away_{i}" for i in range(1, TEAM_SIZE + 1)]
+
+
+@dataclass(frozen=True)
+class Matchup:
+    """One input row: a home roster and an optional explicit opponent."""
+
+    home: tuple[str, ...]
+    away: tuple[str, ...] | None
+    difficulty: str
+
+
+@dataclass(frozen=True)
+class Game:
+    """A resolved game waiting to be scored."""
+
+    number: int
+    home: TeamIds
+    away: TeamIds
+    difficulty: str
+
+
+def read_matchups(path: Path, difficulty: str) -> Iterator[Matchup]:
+    """Lazily read matchups from a roster text file or a matchup CSV.
+
+    Args:
+        path: Input file; ``.csv`` is read as matchups, anything else as rosters
+        difficulty: Difficulty for rows that do not name one
+
+    Yields:
+        One Matchup per input row. Missing or empty home cells (e.g. a short
+        CSV row) come through as empty names, which plan_games skips as an
+        unresolved roster.
+    """
+    with path.open(newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                # DictReader fills the cells of a short row with None
+                home = tuple((row.get(col) or "").strip() for col in HOME_COLUMNS)
+                away = None
+                if all(row.get(col) for col in AWAY_COLUMNS):
+                    away = tuple(row[col].strip() for col in AWAY_COLUMNS)
+                yield Matchup(home, away, row.get("difficulty") or difficulty)
+            return
+
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = tuple(name.strip() for name in line.split(","))
+            yield Matchup(names, None, difficulty)
+
+
+def missing_home_columns(path: Path) -> list[str]:
+    """List the ``home_*`` columns a matchup CSV's header lacks.
+
+    Args:
+        path: Matchup CSV
+
+    Returns:
+        Missing column names, in order; empty if the header is complete
+    """
+    with path.open(newline="") as f:
+        header = next(csv.reader(f), [])
+    present = {name.strip() for name in header}
+    return [col for col in HOME_COLUMNS if col not in present]
+
+
+def _team(names: tuple[str, ...], ids: dict[str, int]) -> TeamIds | None:
+    if len(set(names)) != TEAM_SIZE or not all(name in ids for name in names):
+        return None
+    return tuple(ids[name] for name in names)
+
+
+def plan_games(
+    matchups: Iterator[Matchup],
+    store: PlayerStore,
+    games_per_roster: int,
+    chunk_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Game | None]:
+    """Turn matchups into games, generating opponents where needed.
+
+    Matchups are read ``chunk_size`` at a time and all of a chunk's names are
+    resolved with a single batched lookup.
+
+    Args:
+        matchups: Input rows
+        store: Player store to resolve and generate from
+        games_per_roster: Games per roster against generated opponents
+        chunk_size: Matchups resolved per lookup
+
+    Yields:
+        A Game, or None for each game that had to be skipped
+    """
+    # Lookups only need names and row ids, not the stat columns
+    names_frame = store.df[["FULL_NAME"]]
+    presets = difficulty_thresholds(store.ranks)
+    number = 0
+    while chunk := list(islice(matchups, chunk_size)):
+        wanted = {name for m in chunk for name in m.home + (m.away or ())}
+        ids = resolve_player_ids(names_frame, wanted)
+
+        for matchup in chunk:
+            home = _team(matchup.home, ids)
+            if home is None:
+                logger.warning(
+                    "Skipping unresolved roster: %s", ", ".join(matchup.home)
+                )
+                yield None
+                continue
+
+            if matchup.away is not None:
+                away = _team(matchup.away, ids)
+                if away is None:
+                    logger.warning(
+                        "Skipping unresolved opponent: %s", ", ".join(matchup.away)
+                    )
+                    yield None
+                    continue
+                number += 1
+                yield Game(number, home, away, "explicit")
+                continue
+
+            thresholds = presets.get(matchup.difficulty)
+            if thresholds is None:
+                logger.warning("Skipping unknown difficulty: %s", matchup.difficulty)
+                yield None
+                continue
+            for _ in range(games_per_roster):
+                try:
+                    away = generate_away_team(store, thresholds)
+                except QueryExecutionError as e:
+                    logger.warning("Could not generate opponent: %s", e)
+                    yield None
+                    continue
+                number += 1
+                yield Game(number, home, away, matchup.difficulty)
+
+
+class ResultWriter:
+    """Streams scored games to CSV or JSONL."""
+
+    def __init__(self, out: TextIO, fmt: str, store: PlayerStore):
+        """Create a writer.
+
+        Args:
+            out: Open text stream
+            fmt: "csv" or "jsonl"
+            store: Player store used to name players
+        """
+        self._out = out
+        self._store = store
+        self._csv = csv.writer(out) if fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(FIELDS)
+
+    def write(self, games: list[Game], probabilities: np.ndarray) -> None:
+        """Write one scored batch and flush it."""
+        for game, probability in zip(games, probabilities, strict=True):
+            home = [self._store.name_of(i) for i in game.home]
+            away = [self._store.name_of(i) for i in game.away]
+            p = round(float(probability), 6)
+            winner = "home" if p >= 0.5 else "away"
+            if self._csv is not None:
+                self._csv.writerow(
+                    (
+                        game.number,
+                        "; ".join(home),
+                        "; ".join(away),
+                        game.difficulty,
+                        p,
+                        winner,
+                    )
+                )
+            else:
+                record = dict(
+                    zip(
+                        FIELDS,
+                        (game.number, home, away, game.difficulty, p, winner),
+                        strict=True,
+                    )
+                )
+                self._out.write(json.dumps(record) + "\n")
+        self._out.flush()
+
+
+def run(
+    games: Iterator[Game | None],
+    store: PlayerStore,
+    writer: ResultWriter,
+    batch_size: int,
+) -> tuple[int, int]:
+    """Score games in fixed-size batches and stream the results.
+
+    Args:
+        games: Planned games (None marks a skipped game)
+        store: Player store providing the stat matrix
+        writer: Output writer
+        batch_size: Games scored per model call
+
+    Returns:
+        Tuple of (games played, games skipped)
+    """
+    # One (home, away) x players x stats block per game; analyze_team_stats
+    # flattens a batch of them into model input without copying
+    games_tensor = np.empty(
+        (batch_size, 2, TEAM_SIZE, len(STAT_COLUMNS)), dtype=np.float32
+    )
+    pending: list[Game] = []
+    played = skipped = 0
+
+    def flush() -> None:
+        _, _, features = analyze_team_stats(games_tensor[: len(pending)])
+        probabilities = predict_win_probabilities(features)
+        writer.write(pending, probabilities)
+        pending.clear()
+
+    for game in games:
+        if game is None:
+            skipped += 1
+            continue
+        slot = games_tensor[len(pending)]
+        slot[0] = store.stats[list(game.home)]
+        slot[1] = store.stats[list(game.away)]
+        pending.append(game)
+        played += 1
+        if len(pending) == batch_size:
+            flush()
+    if pending:
+        flush()
+    return played, skipped
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="Roster .txt or matchup .csv")
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Results file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default=None, help="Defaults to output suffix"
+    )
+    parser.add_argument(
+        "--difficulty", choices=list(DIFFICULTY_PRESETS), default=DEFAULT_DIFFICULTY
+    )
+    parser.add_argument("--games-per-roster", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    # Check the input before the player data loads, not on its first row
+    if not args.input.is_file():
+        parser.error(f"input file not found: {args.input}")
+    if args.input.suffix.lower() == ".csv":
+        missing = missing_home_columns(args.input)
+        if missing:
+            parser.error(
+                f"{args.input} needs columns {', '.join(HOME_COLUMNS)}; "
+                f"missing {', '.join(missing)}"
+            )
+    return args
+
+
+def main() -> None:
+    """Play every game in the input and stream the results."""
+    args = parse_args()
+    fmt = args.format or (
+        "jsonl" if args.output and args.output.suffix == ".jsonl" else "csv"
+    )
+    if args.seed is not None:
+        # Opponent sampling draws from NumPy's global generator
+        np.random.seed(args.seed)
+
+    store = get_player_store()
+    matchups = read_matchups(args.input, args.difficulty)
+    games = plan_games(matchups, store, args.games_per_roster, args.batch_size)
+
+    started = time.perf_counter()
+    if args.output is None:
+        writer = ResultWriter(sys.stdout, fmt, store)
+        try:
+            played, skipped = run(games, store, writer, args.batch_size)
+        except BrokenPipeError:
+            # Output piped into e.g. ``head``; stop quietly
+            sys.stderr.close()
+            return
+    else:
+        with args.output.open("w", newline="") as out:
+            writer = ResultWriter(out, fmt, store)
+            played, skipped = run(games, store, writer, args.batch_size)
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        "Played %d games (%d skipped) in %.2fs, %.0f games/s",
+        played,
+        skipped,
+        elapsed,
+        played / elapsed if elapsed else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    main()
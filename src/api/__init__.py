@@ -0,0 +1,6 @@
+"""Optional async JSON API exposing search, roster lookup and prediction."""
+
+from src.api.app import ApiApp, ApiError, create_app
+from src.api.batcher import PredictionBatcher
+
+__all__ = ["ApiApp", "ApiError", "PredictionBatcher", "create_app"]
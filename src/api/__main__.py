@@ -0,0 +1,31 @@
+"""Serve the JSON API with uvicorn: ``python -m src.api --port 8000``."""
+
+import argparse
+import logging
+
+logger = logging.getLogger("streamlit_nba")
+
+
+def main() -> None:
+    """Parse arguments and run the server."""
+    parser = argparse.ArgumentParser(description="Serve the NBA JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise SystemExit(
+            "uvicorn is required to serve the API: pip install -e '.[api]'"
+        ) from e
+
+    from src.utils.hot_reload import start_hot_reload
+
+    # Swap in updated player data and model bundles without a restart
+    start_hot_reload()
+    uvicorn.run("src.api.app:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
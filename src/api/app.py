@@ -0,0 +1,351 @@
+"""Optional async JSON API over the shared player store and model.
+
+A dependency-free ASGI application, so any ASGI server can host it:
+
+    uvicorn src.api.app:app --port 8000
+    python -m src.api --port 8000
+
+Endpoints:
+    GET  /health                  store size and version
+    GET  /players/search?q=term   players whose name matches ``term``
+    POST /players/lookup          {"names": [...]} -> player records
+    POST /teams/away              {"difficulty": "..."} -> a generated team
+    POST /predict                 {"home": [5 names], "away": [5 names]?,
+                                   "difficulty": "..."}
+
+Lookups, team generation and model calls are CPU-bound, so they run on a
+thread pool; predictions from concurrent requests are batched into one
+model call. Each request resolves the player store once and hands it to
+every step, so a hot reload mid-request cannot mix ids from two stores.
+Stats that are missing or not finite are sent as ``null``. Only the full
+("teacher") model is served; no distilled student has met the agreement
+bar yet.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+from urllib.parse import parse_qs
+
+import numpy as np
+from pydantic import BaseModel, ValidationError
+
+from src.api.batcher import BatchPredictor, PredictionBatcher
+from src.api.schemas import AwayTeamRequest, PredictRequest, RosterLookupRequest
+from src.config import API_WORKERS, STAT_COLUMNS
+from src.database.cache import cached_search_player_ids
+from src.database.connection import DatabaseConnectionError, QueryExecutionError
+from src.database.queries import get_players_by_full_names, resolve_player_ids
+from src.database.ranks import difficulty_thresholds
+from src.database.reservoir import TeamIds, TeamReservoir, get_team_reservoir
+from src.database.store import PlayerStore, get_player_store
+from src.ml.bundle import ModelLoadError
+from src.ml.model import ModelVariant, analyze_team_stats, predict_win_probabilities
+from src.telemetry.metrics import REGISTRY
+from src.validation.inputs import validate_search_term
+
+logger = logging.getLogger("streamlit_nba")
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Query = dict[str, list[str]]
+Handler = Callable[["Request"], Awaitable[dict[str, Any]]]
+VariantPredictor = Callable[[np.ndarray, ModelVariant], np.ndarray]
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_SEARCH_RESULTS = 100
+
+API_REQUESTS = REGISTRY.counter("nba_api_requests_total", "JSON API requests.")
+API_ERRORS = REGISTRY.counter(
+    "nba_api_errors_total", "JSON API requests answered with an error status."
+)
+API_REQUEST_SECONDS = REGISTRY.histogram(
+    "nba_api_request_seconds", "JSON API request latency."
+)
+
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Create an error response.
+
+        Args:
+            status: HTTP status code
+            message: Human-readable explanation
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass(frozen=True)
+class Request:
+    """The parts of an HTTP request the handlers read."""
+
+    query: Query
+    body: bytes
+
+
+def _bind_variant(predict: VariantPredictor, variant: ModelVariant) -> BatchPredictor:
+    def run(rows: np.ndarray) -> np.ndarray:
+        return predict(rows, variant)
+
+    return run
+
+
+class ApiApp:
+    """ASGI application serving the JSON endpoints."""
+
+    def __init__(
+        self,
+        get_store: Callable[[], PlayerStore] = get_player_store,
+        get_reservoir: Callable[[], TeamReservoir] = get_team_reservoir,
+        predict: VariantPredictor = predict_win_probabilities,
+        executor: Executor | None = None,
+    ) -> None:
+        """Create the application.
+
+        Args:
+            get_store: Returns the shared player store
+            get_reservoir: Returns the away-team reservoir
+            predict: Scores a batch of matchups for a model variant
+            executor: Pool for CPU-bound work; one is created if omitted
+        """
+        self._get_store = get_store
+        self._get_reservoir = get_reservoir
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=API_WORKERS, thread_name_prefix="nba-api"
+        )
+        self._batcher = PredictionBatcher(
+            _bind_variant(predict, "teacher"), self._executor
+        )
+        self._routes: dict[tuple[str, str], Handler] = {
+            ("GET", "/health"): self._health,
+            ("GET", "/players/search"): self._search,
+            ("POST", "/players/lookup"): self._lookup,
+            ("POST", "/teams/away"): self._away_team,
+            ("POST", "/predict"): self._predict,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI entry point."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._owns_executor:
+                    self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        API_REQUESTS.inc()
+        started = time.perf_counter()
+        try:
+            handler = self._route(scope["method"], scope["path"])
+            body = await _read_body(receive)
+            query = parse_qs(scope.get("query_string", b"").decode())
+            status, payload = 200, await handler(Request(query, body))
+        except ApiError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception:
+            logger.exception("Unhandled API error on %s", scope["path"])
+            status, payload = 500, {"error": "Internal server error"}
+
+        if status >= 400:
+            API_ERRORS.inc()
+        await _send_json(send, status, payload)
+        API_REQUEST_SECONDS.observe(time.perf_counter() - started)
+
+    def _route(self, method: str, path: str) -> Handler:
+        handler = self._routes.get((method, path))
+        if handler is not None:
+            return handler
+        if any(route_path == path for _, route_path in self._routes):
+            raise ApiError(405, f"Method {method} not allowed on {path}")
+        raise ApiError(404, f"No endpoint at {path}")
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run CPU-bound work on the pool, mapping data errors to statuses."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except DatabaseConnectionError as e:
+            logger.error("Data load error: %s", e)
+            raise ApiError(503, "Player data is unavailable") from e
+        except QueryExecutionError as e:
+            logger.error("Query error: %s", e)
+            raise ApiError(503, "Could not generate an away team") from e
+
+    async def _store(self) -> PlayerStore:
+        return await self._run(self._get_store)
+
+    async def _health(self, _request: Request) -> dict[str, Any]:
+        store = await self._store()
+        return {"status": "ok", "players": len(store), "version": store.version}
+
+    async def _search(self, request: Request) -> dict[str, Any]:
+        term = validate_search_term(request.query.get("q", [""])[0])
+        if term is None:
+            raise ApiError(400, "Query parameter 'q' must be a valid search term")
+
+        store = await self._store()
+        ids = await self._run(cached_search_player_ids, store, term)
+        return {
+            "query": term,
+            "total": len(ids),
+            "players": _players(store, ids[:MAX_SEARCH_RESULTS]),
+        }
+
+    async def _lookup(self, request: Request) -> dict[str, Any]:
+        params = _parse(RosterLookupRequest, request.body)
+        store = await self._store()
+        team = await self._run(get_players_by_full_names, store.df, params.names)
+        records = team[["FULL_NAME", *STAT_COLUMNS]].astype(object).to_dict("records")
+        return {
+            "players": [
+                {"id": int(i), **{k: _json_value(v) for k, v in record.items()}}
+                for i, record in zip(team.index.tolist(), records, strict=True)
+            ]
+        }
+
+    async def _away_team(self, request: Request) -> dict[str, Any]:
+        params = _parse(AwayTeamRequest, request.body)
+        store = await self._store()
+        ids = await self._pop_team(store, params.difficulty)
+        return {"difficulty": params.difficulty, "players": _players(store, ids)}
+
+    async def _predict(self, request: Request) -> dict[str, Any]:
+        params = _parse(PredictRequest, request.body)
+        store = await self._store()
+        names = store.df[["FULL_NAME"]]
+        ids = await self._run(
+            resolve_player_ids, names, params.home + (params.away or [])
+        )
+        home = _team_ids(params.home, ids, "home")
+        if params.away is not None:
+            away = _team_ids(params.away, ids, "away")
+        else:
+            away = await self._pop_team(store, params.difficulty)
+
+        _, _, features = analyze_team_stats(
+            store.stats[list(home)], store.stats[list(away)]
+        )
+        try:
+            probability = await self._batcher.predict(features[0])
+        except ModelLoadError as e:
+            raise ApiError(503, "Prediction model is unavailable") from e
+
+        return {
+            "home": _players(store, home),
+            "away": _players(store, away),
+            "home_win_probability": round(probability, 6),
+            "winner": "home" if probability >= 0.5 else "away",
+        }
+
+    async def _pop_team(self, store: PlayerStore, difficulty: str) -> TeamIds:
+        # Executor threads do not see a pinned store, so pass the request's
+        reservoir = self._get_reservoir()
+        thresholds = difficulty_thresholds(store.ranks)[difficulty]
+        return await self._run(reservoir.pop, thresholds, store)
+
+
+def _players(store: PlayerStore, ids: TeamIds) -> list[dict[str, Any]]:
+    return [{"id": i, "name": store.name_of(i)} for i in ids]
+
+
+def _json_value(value: Any) -> Any:
+    # NaN and infinities have no JSON form
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _team_ids(names: list[str], ids: dict[str, int], side: str) -> TeamIds:
+    unknown = [name for name in names if name not in ids]
+    if unknown:
+        raise ApiError(
+            422, f"Unknown or ambiguous {side} players: {', '.join(unknown)}"
+        )
+    if len(set(names)) != len(names):
+        raise ApiError(422, f"The {side} team lists a player more than once")
+    return tuple(ids[name] for name in names)
+
+
+def _parse(model: type[M], body: bytes) -> M:
+    try:
+        return model.model_validate_json(body or b"{}")
+    except ValidationError as e:
+        details = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise ApiError(422, details) from e
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks: list[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise ApiError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_json(send: Send, status: int, payload: dict[str, Any]) -> None:
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(**kwargs: Any) -> ApiApp:
+    """Create the JSON API application.
+
+    Args:
+        **kwargs: Passed to ApiApp (for injecting the store, reservoir,
+            predictor or executor)
+
+    Returns:
+        ASGI application
+    """
+    return ApiApp(**kwargs)
+
+
+app = create_app()
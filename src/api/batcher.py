@@ -0,0 +1,110 @@
+"""Micro-batching of prediction requests on the event loop.
+
+Concurrent requests each queue one feature row and await a future. The
+queue is flushed as a single model call once it holds ``max_batch`` rows or
+``max_wait`` seconds after its first row arrived, whichever comes first.
+The model call itself runs on an executor so the event loop stays free to
+accept more requests while a batch is being scored.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+import numpy as np
+
+from src.config import API_BATCH_WAIT_SECONDS, API_MAX_BATCH
+
+logger = logging.getLogger("streamlit_nba")
+
+BatchPredictor = Callable[[np.ndarray], np.ndarray]
+
+
+class PredictionBatcher:
+    """Coalesces single-row predictions into batched model calls."""
+
+    def __init__(
+        self,
+        predict: BatchPredictor,
+        executor: Executor | None = None,
+        max_batch: int = API_MAX_BATCH,
+        max_wait: float = API_BATCH_WAIT_SECONDS,
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            predict: Scores an (N, features) array, returning N probabilities
+            executor: Where batches run; None uses the loop's default executor
+            max_batch: Rows that trigger an immediate flush
+            max_wait: Seconds a partial batch waits for more rows
+
+        Raises:
+            ValueError: If max_batch is not positive
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive, got {max_batch}")
+        self._predict = predict
+        self._executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._rows: list[np.ndarray] = []
+        self._waiters: list[asyncio.Future[float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def predict(self, features: np.ndarray) -> float:
+        """Queue one feature row and wait for its probability.
+
+        Args:
+            features: One matchup's features, shape (features,)
+
+        Returns:
+            Home-win probability
+
+        Raises:
+            Exception: Whatever the model call raised for this row's batch
+        """
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[float] = loop.create_future()
+        self._rows.append(features)
+        self._waiters.append(waiter)
+
+        if len(self._rows) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await waiter
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._rows:
+            return
+
+        rows, waiters = np.stack(self._rows), self._waiters
+        self._rows, self._waiters = [], []
+        task = asyncio.get_running_loop().create_task(self._score(rows, waiters))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(
+        self, rows: np.ndarray, waiters: list[asyncio.Future[float]]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            probabilities = await loop.run_in_executor(
+                self._executor, self._predict, rows
+            )
+        except Exception as e:
+            logger.error("Prediction batch of %d failed: %s", len(rows), e)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+
+        for waiter, probability in zip(waiters, probabilities, strict=True):
+            if not waiter.done():
+                waiter.set_result(float(probability))
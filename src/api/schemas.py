@@ -0,0 +1,53 @@
+"""Request bodies accepted by the JSON API."""
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.config import DIFFICULTY_PRESETS, TEAM_SIZE
+
+# Upper bound on names per roster lookup, to keep requests cheap
+MAX_LOOKUP_NAMES = 50
+
+
+def _check_difficulty(v: str) -> str:
+    if v not in DIFFICULTY_PRESETS:
+        raise ValueError(
+            f"Unknown difficulty preset: {v}. "
+            f"Valid options: {', '.join(sorted(DIFFICULTY_PRESETS))}"
+        )
+    return v
+
+
+class RosterLookupRequest(BaseModel):
+    """Body of ``POST /players/lookup``."""
+
+    names: list[str] = Field(..., min_length=1, max_length=MAX_LOOKUP_NAMES)
+
+
+class AwayTeamRequest(BaseModel):
+    """Body of ``POST /teams/away``."""
+
+    difficulty: str = "Regular"
+
+    @field_validator("difficulty")
+    @classmethod
+    def validate_difficulty(cls, v: str) -> str:
+        """Ensure the difficulty is a known preset."""
+        return _check_difficulty(v)
+
+
+class PredictRequest(BaseModel):
+    """Body of ``POST /predict``.
+
+    ``away`` may be omitted, in which case an opponent is generated for
+    ``difficulty`` just as the play page does.
+    """
+
+    home: list[str] = Field(..., min_length=TEAM_SIZE, max_length=TEAM_SIZE)
+    away: list[str] | None = Field(None, min_length=TEAM_SIZE, max_length=TEAM_SIZE)
+    difficulty: str = "Regular"
+
+    @field_validator("difficulty")
+    @classmethod
+    def validate_difficulty(cls, v: str) -> str:
+        """Ensure the difficulty is a known preset."""
+        return _check_difficulty(v)
@@ -49,9 +49,49 @@ STAT_COLUMNS: Final[list[str]] = [
     "FGM",
 ]
 
+# Set to 1/true to show per-rerun stage timings in the sidebar
+DEBUG_TIMINGS_ENV: Final[str] = "NBA_DEBUG_TIMINGS"
+
+# Metrics exporters: HTTP port/host for /metrics, or a file rewritten periodically
+METRICS_PORT_ENV: Final[str] = "NBA_METRICS_PORT"
+METRICS_HOST_ENV: Final[str] = "NBA_METRICS_HOST"
+METRICS_FILE_ENV: Final[str] = "NBA_METRICS_FILE"
+METRICS_INTERVAL_ENV: Final[str] = "NBA_METRICS_INTERVAL"
+
+# Set to 0/false to skip warming the player store, away-team reservoir and
+# model in the background after the first page renders
+PRELOAD_ENV: Final[str] = "NBA_PRELOAD"
+
+# Set to 0/false to stop watching the player data and model bundles; changed
+# files are rebuilt in the background and swapped in without a restart
+HOT_RELOAD_ENV: Final[str] = "NBA_HOT_RELOAD"
+HOT_RELOAD_INTERVAL_SECONDS: Final[float] = 2.0
+# Replaced player snapshots whose names are kept, so rosters saved against
+# them can be moved to the new row ids by player name
+RETIRED_SNAPSHOTS: Final[int] = 4
+
 # Game configuration
 TEAM_SIZE: Final[int] = 5
-MAX_QUERY_ATTEMPTS: Final[int] = 10
+
+# Ready-made away teams kept per difficulty, and how many distinct
+# threshold tuples (presets plus custom) the reservoir tracks
+RESERVOIR_DEPTH: Final[int] = 16
+MAX_RESERVOIR_KEYS: Final[int] = 32
+
+# Distinct normalized search terms kept in the shared search cache
+SEARCH_CACHE_SIZE: Final[int] = 512
+
+# Similar-player search: results shown per query, and table rows scored per
+# matrix-multiply block (bounds the temporary distance matrix)
+SIMILAR_PLAYERS: Final[int] = 5
+SIMILARITY_BLOCK_ROWS: Final[int] = 65536
+
+# JSON API: predictions are batched up to API_MAX_BATCH rows or until
+# API_BATCH_WAIT_SECONDS after the first queued row, and CPU-bound work runs
+# on a pool of API_WORKERS threads
+API_MAX_BATCH: Final[int] = 256
+API_BATCH_WAIT_SECONDS: Final[float] = 0.002
+API_WORKERS: Final[int] = 4
 
 # Difficulty presets: (PTS, REB, AST, STL)
 DIFFICULTY_PRESETS: Final[dict[str, tuple[int, int, int, int]]] = {
@@ -61,13 +101,33 @@ DIFFICULTY_PRESETS: Final[dict[str, tuple[int, int, int, int]]] = {
     "Dream Team": (1450, 700, 500, 120),
 }
 
-# Score ranges for game simulation
-WINNER_SCORE_RANGE: Final[tuple[int, int]] = (90, 130)
-LOSER_SCORE_RANGE: Final[tuple[int, int]] = (80, 120)
+# Columns the difficulty thresholds apply to, in preset order, and how many
+# away-team players are drawn from each column's pool
+DIFFICULTY_COLUMNS: Final[tuple[str, ...]] = ("PTS", "REB", "AST", "STL")
+DIFFICULTY_SLOTS: Final[tuple[int, ...]] = (2, 1, 1, 1)
+
+# Difficulty as stat percentiles: (PTS, REB, AST, STL) percentiles a player
+# must rank above. Resolved against the loaded player table, so pool sizes
+# scale with the data instead of exploding or vanishing. On the bundled
+# data they resolve to roughly the absolute presets above
+DIFFICULTY_PERCENTILES: Final[dict[str, tuple[float, float, float, float]]] = {
+    "Regular": (93.0, 95.0, 92.0, 91.0),
+    "93' Bulls": (97.0, 97.5, 97.0, 96.5),
+    "All-Stars": (98.5, 99.0, 99.0, 99.0),
+    "Dream Team": (99.5, 99.7, 99.6, 99.5),
+}
+
+# SQLite player backend: CSV rows inserted per batch when building the
+# database, and names bound per query when looking players up
+SQLITE_BUILD_BATCH_ROWS: Final[int] = 50_000
+SQLITE_MAX_PARAMS: Final[int] = 500
 
-# Default fallback scores when generation fails
-DEFAULT_WINNER_SCORE: Final[int] = 100
-DEFAULT_LOSER_SCORE: Final[int] = 90
+# Possession-level game simulation: possessions per team per quarter, games
+# played per requested game to find one matching the predicted winner, and
+# the largest shooting-percentage tilt the win probability gives a team
+SIM_POSSESSIONS_PER_QUARTER: Final[int] = 25
+SIM_CANDIDATES: Final[int] = 4
+SIM_MAX_EDGE: Final[float] = 0.12
 
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
@@ -93,5 +153,8 @@ def configure_page() -> None:
     """Configure Streamlit page settings and logging."""
     import streamlit as st
 
+    from src.telemetry.exporter import start_exporters_from_env
+
     setup_logging()
     st.set_page_config(layout="wide")
+    start_exporters_from_env()
@@ -1,23 +1,139 @@
-"""Database module for connection management and queries."""
-
-from src.database.connection import (
-    DatabaseConnectionError,
-    QueryExecutionError,
-    get_data,
-    load_data,
-)
-from src.database.queries import (
-    get_away_team_by_stats,
-    get_players_by_full_names,
-    search_player_by_name,
-)
+"""Database module for connection management and queries.
+
+Exports are imported from their submodules on first access, so importing
+the package alone does not load pandas.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.database.backends import (
+        FrameBackend,
+        PlayerBackend,
+        SQLiteBackend,
+        build_player_database,
+    )
+    from src.database.cache import (
+        CacheStats,
+        LRUCache,
+        cached_search_player_ids,
+        get_search_cache,
+    )
+    from src.database.connection import (
+        DatabaseConnectionError,
+        QueryExecutionError,
+        get_data,
+        load_data,
+    )
+    from src.database.queries import (
+        get_away_team_by_stats,
+        get_away_team_ids_by_stats,
+        get_players_by_full_names,
+        resolve_player_ids,
+        search_player_by_name,
+        search_player_ids_by_name,
+    )
+    from src.database.ranks import (
+        RankTable,
+        difficulty_thresholds,
+        infeasible_reason,
+    )
+    from src.database.reservoir import TeamReservoir, get_team_reservoir
+    from src.database.similarity import (
+        SimilarityIndex,
+        find_similar_players,
+        get_similarity_index,
+    )
+    from src.database.store import (
+        PlayerStore,
+        get_player_store,
+        load_player_store,
+        publish_player_store,
+        remap_player_ids,
+        reset_player_store,
+    )
+
+# Exported name -> defining submodule
+_EXPORTS: dict[str, str] = {
+    "CacheStats": "src.database.cache",
+    "DatabaseConnectionError": "src.database.connection",
+    "FrameBackend": "src.database.backends",
+    "LRUCache": "src.database.cache",
+    "PlayerBackend": "src.database.backends",
+    "PlayerStore": "src.database.store",
+    "QueryExecutionError": "src.database.connection",
+    "RankTable": "src.database.ranks",
+    "SQLiteBackend": "src.database.backends",
+    "SimilarityIndex": "src.database.similarity",
+    "TeamReservoir": "src.database.reservoir",
+    "build_player_database": "src.database.backends",
+    "cached_search_player_ids": "src.database.cache",
+    "difficulty_thresholds": "src.database.ranks",
+    "find_similar_players": "src.database.similarity",
+    "get_away_team_by_stats": "src.database.queries",
+    "get_away_team_ids_by_stats": "src.database.queries",
+    "get_data": "src.database.connection",
+    "get_player_store": "src.database.store",
+    "get_players_by_full_names": "src.database.queries",
+    "get_search_cache": "src.database.cache",
+    "get_similarity_index": "src.database.similarity",
+    "get_team_reservoir": "src.database.reservoir",
+    "infeasible_reason": "src.database.ranks",
+    "load_data": "src.database.connection",
+    "load_player_store": "src.database.store",
+    "publish_player_store": "src.database.store",
+    "remap_player_ids": "src.database.store",
+    "reset_player_store": "src.database.store",
+    "resolve_player_ids": "src.database.queries",
+    "search_player_by_name": "src.database.queries",
+    "search_player_ids_by_name": "src.database.queries",
+}
 
 __all__ = [
+    "CacheStats",
     "DatabaseConnectionError",
+    "FrameBackend",
+    "LRUCache",
+    "PlayerBackend",
+    "PlayerStore",
     "QueryExecutionError",
+    "RankTable",
+    "SQLiteBackend",
+    "SimilarityIndex",
+    "TeamReservoir",
+    "build_player_database",
+    "cached_search_player_ids",
+    "difficulty_thresholds",
+    "find_similar_players",
     "get_away_team_by_stats",
+    "get_away_team_ids_by_stats",
     "get_data",
+    "get_player_store",
     "get_players_by_full_names",
+    "get_search_cache",
+    "get_similarity_index",
+    "get_team_reservoir",
+    "infeasible_reason",
     "load_data",
+    "load_player_store",
+    "publish_player_store",
+    "remap_player_ids",
+    "reset_player_store",
+    "resolve_player_ids",
     "search_player_by_name",
+    "search_player_ids_by_name",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,538 @@
+"""Storage backends the player queries run against.
+
+``FrameBackend`` answers from a DataFrame held in memory, which is what the
+shared ``PlayerStore`` provides. ``SQLiteBackend`` answers from a local
+SQLite database built by ``build_player_database``: name search goes through
+an FTS5 trigram index and threshold pools through per-column indexes, so
+only the matching rows are ever read and the dataset can be far larger than
+RAM. Both return row ids that match the CSV's row order.
+
+The SQLite database also keeps a rank table for the difficulty columns:
+every player's position in ``(stat, id)`` order, indexed both ways. A
+threshold pool is then a range of ranks, so sizing it or picking players at
+given positions in it is a handful of index lookups, not a scan.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Protocol, cast, runtime_checkable
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    DIFFICULTY_COLUMNS,
+    PLAYER_COLUMNS,
+    SQLITE_BUILD_BATCH_ROWS,
+    SQLITE_MAX_PARAMS,
+    STAT_COLUMNS,
+)
+from src.database.connection import CSV_PATH, DatabaseConnectionError
+from src.database.ranks import RankTable
+
+logger = logging.getLogger("streamlit_nba")
+
+# Where scripts/build_player_db.py writes the database by default
+DEFAULT_DB_PATH = CSV_PATH.with_suffix(".sqlite")
+
+# Columns with a B-tree index in the SQLite backend
+INDEXED_STAT_COLUMNS: tuple[str, ...] = tuple(
+    sorted(set(STAT_COLUMNS) | set(DIFFICULTY_COLUMNS))
+)
+NAME_COLUMNS: tuple[str, ...] = (
+    "FULL_NAME_LOWER",
+    "FIRST_NAME_LOWER",
+    "LAST_NAME_LOWER",
+)
+
+# The trigram tokenizer only indexes substrings of three or more characters
+_MIN_FTS_TERM = 3
+_SQL_TYPES = {"b": "INTEGER", "i": "INTEGER", "u": "INTEGER", "f": "REAL"}
+_NUMPY_DTYPES = frozenset({"bool", "int64", "float64"})
+# Dtype kinds pandas reads as float64 when mixed; any other mix is object
+_NUMERIC_KINDS = frozenset({"i", "u", "f"})
+
+
+@runtime_checkable
+class PlayerBackend(Protocol):
+    """Read-only player storage the query functions can run against."""
+
+    def search_ids(self, name: str) -> list[int]:
+        """Row ids of players whose full, first or last name contains ``name``."""
+        ...
+
+    def players_by_full_names(self, names: Sequence[str]) -> pd.DataFrame:
+        """Records of the players with these exact full names, in row order."""
+        ...
+
+    def search_names(self, name: str) -> list[str]:
+        """Distinct full names of the matching players, in row order."""
+        ...
+
+    def count_above(self, column: str, threshold: float) -> int:
+        """Number of players whose ``column`` is strictly above ``threshold``."""
+        ...
+
+    def pool_above(self, column: str, threshold: float) -> np.ndarray:
+        """Row ids of the players whose ``column`` is strictly above ``threshold``.
+
+        The order is fixed per backend and is what ``pick_above`` indexes.
+        """
+        ...
+
+    def pick_above(
+        self, column: str, threshold: float, positions: np.ndarray
+    ) -> np.ndarray:
+        """Row ids at the given positions of ``pool_above``'s order.
+
+        Backends answer this without fetching the whole pool.
+        """
+        ...
+
+    def rows(self, ids: Sequence[int]) -> pd.DataFrame:
+        """Records for the given row ids, in the given order."""
+        ...
+
+
+class FrameBackend:
+    """Backend over an in-memory player DataFrame."""
+
+    __slots__ = ("_pools", "df", "ranks")
+
+    def __init__(self, df: pd.DataFrame, ranks: RankTable | None = None) -> None:
+        """Wrap a player DataFrame; its index labels are the row ids.
+
+        Args:
+            df: Player DataFrame
+            ranks: Rank table built from ``df``; threshold pools are then
+                sliced from it instead of filtering the frame
+        """
+        self.df = df
+        self.ranks = ranks
+        self._pools: dict[tuple[str, float], np.ndarray] = {}
+
+    def _name_mask(self, name: str) -> pd.Series:
+        name_lower = name.lower().strip()
+        df = self.df
+        return (
+            df["FULL_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
+            | df["FIRST_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
+            | df["LAST_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
+        )
+
+    def search_ids(self, name: str) -> list[int]:
+        """Row ids of players whose full, first or last name contains ``name``."""
+        return [int(i) for i in self.df.index[self._name_mask(name)]]
+
+    def players_by_full_names(self, names: Sequence[str]) -> pd.DataFrame:
+        """Records of the players with these exact full names, in row order."""
+        return self.df[self.df["FULL_NAME"].isin(names)]
+
+    def search_names(self, name: str) -> list[str]:
+        """Distinct full names of the matching players, in row order."""
+        return [str(n) for n in self.df[self._name_mask(name)]["FULL_NAME"].unique()]
+
+    def count_above(self, column: str, threshold: float) -> int:
+        """Number of players whose ``column`` is strictly above ``threshold``."""
+        if self.ranks is not None:
+            return self.ranks.count_above(column, threshold)
+        return len(self.pool_above(column, threshold))
+
+    def pool_above(self, column: str, threshold: float) -> np.ndarray:
+        """Row ids of the players whose ``column`` is strictly above ``threshold``."""
+        key = (column, threshold)
+        pool = self._pools.get(key)
+        if pool is None:
+            if self.ranks is not None:
+                pool = self.ranks.pool_above(column, threshold)
+            else:
+                values = self.df[column].to_numpy()
+                pool = self.df.index.to_numpy()[values > threshold]
+            self._pools[key] = pool
+        return pool
+
+    def pick_above(
+        self, column: str, threshold: float, positions: np.ndarray
+    ) -> np.ndarray:
+        """Row ids at the given positions of ``pool_above``'s order."""
+        picked: np.ndarray = self.pool_above(column, threshold)[positions]
+        return picked
+
+    def rows(self, ids: Sequence[int]) -> pd.DataFrame:
+        """Records for the given row ids, in the given order."""
+        return self.df.loc[list(ids)]
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class SQLiteBackend:
+    """Backend over a player database built by ``build_player_database``.
+
+    Each thread reuses its own read-only connection, opened on first use.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open a player database lazily.
+
+        Args:
+            path: Database file
+
+        Raises:
+            DatabaseConnectionError: If the file does not exist
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise DatabaseConnectionError(f"Player database not found: {self.path}")
+        self._local = threading.local()
+        self._dtypes: dict[str, str] | None = None
+        self._ranked: frozenset[str] | None = None
+        self._size: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro", uri=True
+                )
+            except sqlite3.Error as e:
+                raise DatabaseConnectionError(
+                    f"Could not open player database {self.path}: {e}"
+                ) from e
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the calling thread's connection, if it has one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @property
+    def columns(self) -> dict[str, str]:
+        """Player columns and the pandas dtypes they were built from."""
+        if self._dtypes is None:
+            rows = self._connection().execute(
+                "SELECT name, dtype FROM player_columns ORDER BY position"
+            )
+            self._dtypes = dict(rows.fetchall())
+        return self._dtypes
+
+    def _frame(self, where: str, params: Sequence[str | int]) -> pd.DataFrame:
+        dtypes = self.columns
+        columns = ", ".join(_quote(col) for col in dtypes)
+        query = f"SELECT id, {columns} FROM players WHERE {where}"  # noqa: S608
+        try:
+            rows = self._connection().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            raise DatabaseConnectionError(f"Player database query failed: {e}") from e
+
+        # Column-wise construction is several times faster than read_sql for
+        # the handful of rows a query returns
+        ids, *values = zip(*rows, strict=True) if rows else ((), *[()] * len(dtypes))
+        return pd.DataFrame(
+            {
+                col: np.asarray(vals, dtype=dtype)
+                if dtype in _NUMPY_DTYPES
+                else pd.array(list(vals), dtype=cast("Any", dtype))
+                for (col, dtype), vals in zip(dtypes.items(), values, strict=True)
+            },
+            index=pd.Index(ids, dtype=np.int64),
+            columns=list(dtypes),
+        )
+
+    @property
+    def ranked_columns(self) -> frozenset[str]:
+        """Columns with a rank table; empty for databases built without one."""
+        if self._ranked is None:
+            tables = self._column(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                ("player_ranks",),
+            )
+            self._ranked = frozenset(
+                col for col in DIFFICULTY_COLUMNS if tables and col in self.columns
+            )
+        return self._ranked
+
+    def __len__(self) -> int:
+        """Number of players in the database."""
+        if self._size is None:
+            self._size = int(self._column("SELECT COUNT(*) FROM players", ())[0])
+        return self._size
+
+    def _column(self, query: str, params: Sequence[object]) -> list[Any]:
+        try:
+            rows = self._connection().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            raise DatabaseConnectionError(f"Player database query failed: {e}") from e
+        return [row[0] for row in rows]
+
+    def _matching_ids(self, name: str) -> tuple[str, tuple[str, ...]]:
+        """SQL selecting the ids of players matching ``name``, and its params."""
+        term = name.lower().strip()
+        if len(term) >= _MIN_FTS_TERM:
+            phrase = '"' + term.replace('"', '""') + '"'
+            return "SELECT rowid FROM players_fts WHERE players_fts MATCH ?", (phrase,)
+        # Too short for the trigram index, so this scans; such short terms
+        # match a large share of players anyway
+        where = " OR ".join(f"{_quote(col)} LIKE ? ESCAPE '\\'" for col in NAME_COLUMNS)
+        pattern = _like_pattern(term)
+        query = f"SELECT id FROM players WHERE {where}"  # noqa: S608
+        return query, (pattern,) * len(NAME_COLUMNS)
+
+    def search_ids(self, name: str) -> list[int]:
+        """Row ids of players whose full, first or last name contains ``name``."""
+        matching, params = self._matching_ids(name)
+        return [int(i) for i in self._column(f"{matching} ORDER BY 1", params)]
+
+    def search_names(self, name: str) -> list[str]:
+        """Distinct full names of the matching players, in row order."""
+        matching, params = self._matching_ids(name)
+        query = (
+            f"SELECT FULL_NAME FROM players WHERE id IN ({matching}) "  # noqa: S608
+            "GROUP BY FULL_NAME ORDER BY MIN(id)"
+        )
+        return [str(n) for n in self._column(query, params)]
+
+    def players_by_full_names(self, names: Sequence[str]) -> pd.DataFrame:
+        """Records of the players with these exact full names, in row order."""
+        names = list(names)
+        frames = [
+            self._frame(f"FULL_NAME IN ({', '.join('?' * len(chunk))})", chunk)
+            for chunk in _chunks(names, SQLITE_MAX_PARAMS)
+        ]
+        if not frames:
+            return self._frame("0", ())
+        return pd.concat(frames).sort_index()
+
+    def _pool_query(self, column: str) -> tuple[str, str]:
+        """FROM/WHERE clause of a column's threshold pool, and its index order."""
+        if column not in self.columns:
+            raise ValueError(f"Unknown player column: {column}")
+        col = _quote(column)
+        return f"FROM players WHERE {col} > ?", f"ORDER BY {col}, id"
+
+    def _first_rank_above(self, column: str, threshold: float) -> int:
+        """Rank of the first player above ``threshold``, by one index probe."""
+        ranks = self._column(
+            "SELECT rank FROM player_ranks WHERE col = ? AND value > ? "
+            "ORDER BY value, rank LIMIT 1",
+            (column, threshold),
+        )
+        return int(ranks[0]) if ranks else len(self)
+
+    def count_above(self, column: str, threshold: float) -> int:
+        """Number of players whose ``column`` is strictly above ``threshold``.
+
+        Ranked columns answer from one rank-table probe; others are counted
+        on the column's index.
+        """
+        if column in self.ranked_columns:
+            return len(self) - self._first_rank_above(column, threshold)
+        pool, _ = self._pool_query(column)
+        return int(self._column(f"SELECT COUNT(*) {pool}", (threshold,))[0])
+
+    def pool_above(self, column: str, threshold: float) -> np.ndarray:
+        """Row ids of the players whose ``column`` is strictly above ``threshold``."""
+        pool, order = self._pool_query(column)
+        ids = self._column(f"SELECT id {pool} {order}", (threshold,))
+        return np.array(ids, dtype=np.int64)
+
+    def pick_above(
+        self, column: str, threshold: float, positions: np.ndarray
+    ) -> np.ndarray:
+        """Row ids at the given positions of ``pool_above``'s order.
+
+        For ranked columns the positions become ranks and are looked up in
+        batched ``IN`` queries on the rank table, so the pool itself is never
+        read. Other columns fetch the pool's ids once and index into them.
+        """
+        if column not in self.ranked_columns:
+            picked: np.ndarray = self.pool_above(column, threshold)[positions]
+            return picked
+
+        start = self._first_rank_above(column, threshold)
+        ranks, inverse = np.unique(positions + start, return_inverse=True)
+        found = np.empty(len(ranks), dtype=np.int64)
+        step = SQLITE_MAX_PARAMS - 1
+        for offset in range(0, len(ranks), step):
+            chunk = ranks[offset : offset + step].tolist()
+            found[offset : offset + len(chunk)] = self._column(
+                "SELECT id FROM player_ranks WHERE col = ? "  # noqa: S608
+                f"AND rank IN ({', '.join('?' * len(chunk))}) ORDER BY rank",
+                (column, *chunk),
+            )
+        picked = found[inverse.reshape(-1)]
+        return picked
+
+    def rows(self, ids: Sequence[int]) -> pd.DataFrame:
+        """Records for the given row ids, in the given order."""
+        ids = [int(i) for i in ids]
+        frame = self._frame(f"id IN ({', '.join('?' * len(ids))})", ids)
+        return frame.loc[ids]
+
+
+def _create_schema(conn: sqlite3.Connection, sample: pd.DataFrame) -> None:
+    columns = ", ".join(
+        f"{_quote(str(col))} {_SQL_TYPES.get(dtype.kind, 'TEXT')}"
+        for col, dtype in sample.dtypes.items()
+    )
+    conn.execute(f"CREATE TABLE players (id INTEGER PRIMARY KEY, {columns})")
+    conn.execute(
+        "CREATE TABLE player_columns (position INTEGER PRIMARY KEY, name TEXT, "
+        "dtype TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO player_columns VALUES (?, ?, ?)",
+        [
+            (i, str(col), str(dtype))
+            for i, (col, dtype) in enumerate(sample.dtypes.items())
+        ],
+    )
+
+
+def _widen(current: Any, column: pd.Series) -> Any:
+    """Dtype pandas would give a column read whole, given one more batch of it."""
+    incoming = column.dtype
+    if column.isna().all():
+        # An all-missing batch reads as float64 whatever the column holds
+        if current.kind == "b":
+            return np.dtype(object)
+        incoming = np.dtype(np.float64) if current.kind in _NUMERIC_KINDS else current
+    if incoming == current:
+        return current
+    if current.kind in _NUMERIC_KINDS and incoming.kind in _NUMERIC_KINDS:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _create_ranks(conn: sqlite3.Connection, columns: Sequence[str]) -> None:
+    # Ranks follow pool_above's (stat, id) order; missing stats rank first
+    conn.execute(
+        "CREATE TABLE player_ranks (col TEXT, rank INTEGER, value REAL, "
+        "id INTEGER, PRIMARY KEY (col, rank)) WITHOUT ROWID"
+    )
+    for col in DIFFICULTY_COLUMNS:
+        if col in columns:
+            quoted = _quote(col)
+            conn.execute(
+                "INSERT INTO player_ranks SELECT ?, "  # noqa: S608
+                f"ROW_NUMBER() OVER (ORDER BY {quoted}, id) - 1, {quoted}, id "
+                "FROM players",
+                (col,),
+            )
+    conn.execute(
+        "CREATE INDEX idx_player_ranks_value ON player_ranks(col, value, rank)"
+    )
+
+
+def _create_indexes(conn: sqlite3.Connection, columns: Sequence[str]) -> None:
+    conn.execute('CREATE INDEX idx_players_full_name ON players("FULL_NAME")')
+    for col in INDEXED_STAT_COLUMNS:
+        if col in columns:
+            conn.execute(
+                f"CREATE INDEX {_quote('idx_players_' + col.lower())} "
+                f"ON players({_quote(col)})"
+            )
+    names = ", ".join(_quote(col) for col in NAME_COLUMNS)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE players_fts USING fts5({names}, "
+        "content='players', content_rowid='id', tokenize='trigram')"
+    )
+    conn.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+
+
+def build_player_database(
+    csv_path: str | Path,
+    db_path: str | Path,
+    batch_rows: int = SQLITE_BUILD_BATCH_ROWS,
+) -> Path:
+    """Build a SQLite player database from a player CSV.
+
+    The CSV is streamed in batches, so it never has to fit in memory. Each
+    column's recorded dtype is widened as batches arrive, to what pandas
+    would infer from the whole file, so a missing value in a later batch
+    reads back as NaN instead of breaking an integer column. The database
+    is written next to ``db_path`` and renamed into place once it is
+    complete, so readers never open a half-built file.
+
+    Args:
+        csv_path: Player CSV with the ``snowflake_nba.csv`` columns
+        db_path: Database file to create or replace
+        batch_rows: CSV rows read and inserted per batch
+
+    Returns:
+        Path of the finished database
+
+    Raises:
+        DatabaseConnectionError: If the CSV cannot be read or lacks a column
+    """
+    db_path = Path(db_path)
+    partial = db_path.with_name(db_path.name + ".partial")
+    partial.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(partial)
+    try:
+        next_id = 0
+        columns: list[str] = []
+        dtypes: dict[str, Any] = {}
+        for batch in pd.read_csv(csv_path, chunksize=batch_rows):
+            batch.columns = [col.upper() for col in batch.columns]
+            if not columns:
+                columns = list(batch.columns)
+                missing = [col for col in PLAYER_COLUMNS if col not in batch.columns]
+                if missing:
+                    raise DatabaseConnectionError(f"CSV is missing columns: {missing}")
+                _create_schema(conn, batch)
+                dtypes = {col: batch[col].dtype for col in columns}
+            else:
+                dtypes = {col: _widen(dtypes[col], batch[col]) for col in columns}
+            placeholders = ", ".join("?" * (len(batch.columns) + 1))
+            records = batch.astype(object).where(batch.notna(), None)
+            conn.executemany(
+                f"INSERT INTO players VALUES ({placeholders})",  # noqa: S608
+                (
+                    (next_id + i, *row)
+                    for i, row in enumerate(records.itertuples(index=False))
+                ),
+            )
+            next_id += len(batch)
+        if not columns:
+            raise DatabaseConnectionError(f"No player rows in {csv_path}")
+        conn.executemany(
+            "UPDATE player_columns SET dtype = ? WHERE name = ?",
+            [(str(dtype), col) for col, dtype in dtypes.items()],
+        )
+        _create_indexes(conn, columns)
+        _create_ranks(conn, columns)
+        conn.execute("ANALYZE")
+        conn.commit()
+    except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        conn.close()
+        partial.unlink(missing_ok=True)
+        raise DatabaseConnectionError(f"Could not build player database: {e}") from e
+    except BaseException:
+        conn.close()
+        partial.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    partial.replace(db_path)
+    logger.info("Built player database %s: %d players", db_path, next_id)
+    return db_path
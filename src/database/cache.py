@@ -0,0 +1,216 @@
+"""Bounded LRU cache for player searches, shared by every session.
+
+Identical lookups that arrive while a result is being computed wait for
+that computation instead of starting their own (single-flight), so a
+popular term is searched once per process no matter how many sessions
+ask for it at the same moment.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from src.config import SEARCH_CACHE_SIZE
+from src.database.queries import search_player_ids_by_name
+from src.database.store import PlayerStore
+from src.telemetry.metrics import REGISTRY, SEARCH_SECONDS, SEARCHES
+
+logger = logging.getLogger("streamlit_nba")
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time cache counters."""
+
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups served."""
+        return self.hits + self.misses + self.coalesced
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that did not run the computation."""
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.coalesced) / self.lookups
+
+
+class _Flight(Generic[V]):
+    """A computation in progress that other threads can wait on."""
+
+    __slots__ = ("done", "error", "value")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: V | None = None
+        self.error: BaseException | None = None
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe, bounded LRU cache with single-flight misses."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+
+        Raises:
+            ValueError: If maxsize is not positive
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, V] = OrderedDict()
+        self._flights: dict[Hashable, _Flight[V]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        """Return the cached value for ``key``, computing it at most once.
+
+        If another thread is already computing ``key``, this call waits for
+        and shares its result. Failures are propagated to every waiter and
+        are not cached.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value  # type: ignore[return-value]
+
+        try:
+            value = compute()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+            raise
+
+        flight.value = value
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            del self._flights[key]
+        flight.done.set()
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._coalesced = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+
+_search_cache: LRUCache[tuple[int, ...]] = LRUCache(SEARCH_CACHE_SIZE)
+
+
+def normalize_search_term(term: str) -> str:
+    """Normalize a search term into its cache key form.
+
+    Search is case-insensitive and ignores surrounding and repeated
+    whitespace, so all spellings that match the same players share a key.
+    """
+    return " ".join(term.lower().split())
+
+
+def cached_search_player_ids(store: PlayerStore, term: str) -> tuple[int, ...]:
+    """Search players by name through the shared search cache.
+
+    Entries are keyed by store version as well as the term, so results
+    from a replaced store are never served.
+
+    Args:
+        store: Player store to search
+        term: Validated search term
+
+    Returns:
+        Tuple of matching player row ids
+    """
+    normalized = normalize_search_term(term)
+
+    def compute() -> tuple[int, ...]:
+        logger.debug("Search cache miss: %r", normalized)
+        return tuple(search_player_ids_by_name(store.df, normalized))
+
+    SEARCHES.inc()
+    with SEARCH_SECONDS.time():
+        return _search_cache.get_or_compute((store.version, normalized), compute)
+
+
+def get_search_cache() -> LRUCache[tuple[int, ...]]:
+    """Return the process-wide search cache (for metrics and tests)."""
+    return _search_cache
+
+
+REGISTRY.gauge(
+    "nba_search_cache_hit_ratio",
+    "Fraction of searches answered without computing (hits plus coalesced).",
+    lambda: _search_cache.stats().hit_rate,
+)
+REGISTRY.gauge(
+    "nba_search_cache_entries",
+    "Terms held in the search cache.",
+    lambda: float(len(_search_cache)),
+)
+REGISTRY.gauge(
+    "nba_search_cache_evictions",
+    "Terms evicted from the search cache since start.",
+    lambda: float(_search_cache.stats().evictions),
+)
@@ -5,6 +5,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from src.telemetry.timing import timed
+
 logger = logging.getLogger("streamlit_nba")
 
 # Resolve path relative to this module
@@ -23,6 +25,7 @@ class QueryExecutionError(Exception):
     pass
 
 
+@timed()
 def load_data() -> pd.DataFrame:
     """Load the local CSV data.
 
@@ -1,130 +1,254 @@
-"""Local data queries using pandas on loaded CSV data."""
+"""Player queries over a DataFrame or any ``PlayerBackend``.
+
+Every query takes either the player DataFrame, as handed out by the shared
+``PlayerStore``, or a backend such as ``SQLiteBackend``; DataFrames are
+wrapped in a ``FrameBackend``. Row ids mean the same thing on either side.
+"""
 
 import logging
+from collections.abc import Iterable
 
+import numpy as np
 import pandas as pd
 
-from src.config import MAX_QUERY_ATTEMPTS, PLAYER_COLUMNS
+from src.config import DIFFICULTY_COLUMNS, DIFFICULTY_SLOTS, PLAYER_COLUMNS
+from src.database.backends import FrameBackend, PlayerBackend
 from src.database.connection import QueryExecutionError
+from src.database.ranks import infeasible_reason, pool_counts
+from src.telemetry.metrics import (
+    AWAY_TEAM_ATTEMPTS,
+    AWAY_TEAM_FAILURES,
+    AWAY_TEAM_SECONDS,
+    ROSTER_LOOKUP_SECONDS,
+    ROSTER_LOOKUPS,
+)
+from src.telemetry.timing import timed
 
 logger = logging.getLogger("streamlit_nba")
 
 
-def search_player_by_name(df: pd.DataFrame, name: str) -> list[tuple[str]]:
+# Where player queries can read from
+PlayerSource = pd.DataFrame | PlayerBackend
+
+# Most candidate away teams drawn in one vectorized batch
+_MAX_DRAWS = 1024
+
+# Batches drawn before giving up on a feasible but near-impossible team
+_MAX_BATCHES = 32
+
+
+def as_backend(source: PlayerSource) -> PlayerBackend:
+    """Return ``source`` as a backend, wrapping a DataFrame if needed."""
+    if isinstance(source, pd.DataFrame):
+        return FrameBackend(source)
+    return source
+
+
+@timed()
+def search_player_by_name(source: PlayerSource, name: str) -> list[tuple[str]]:
     """Search for players by name (first, last, or full name).
 
     Args:
-        df: Player DataFrame
+        source: Player DataFrame or backend
         name: Search term (case-insensitive)
 
     Returns:
         List of tuples containing matching full names
     """
-    name_lower = name.lower().strip()
-    mask = (
-        df["FULL_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
-        | df["FIRST_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
-        | df["LAST_NAME_LOWER"].str.contains(name_lower, case=False, na=False)
-    )
-    results = df[mask]["FULL_NAME"].unique().tolist()
-    return [(player_name,) for player_name in results]
+    return [(player_name,) for player_name in as_backend(source).search_names(name)]
+
 
+@timed()
+def search_player_ids_by_name(source: PlayerSource, name: str) -> list[int]:
+    """Search for players by name, returning row ids instead of names.
 
-def get_players_by_full_names(df: pd.DataFrame, names: list[str]) -> pd.DataFrame:
+    Unlike search_player_by_name, players who share a full name each get
+    their own result, so a pick identifies exactly one player.
+
+    Args:
+        source: Player DataFrame indexed by store row id, or a backend
+        name: Search term (case-insensitive)
+
+    Returns:
+        List of matching row ids
+    """
+    return as_backend(source).search_ids(name)
+
+
+@timed()
+@ROSTER_LOOKUP_SECONDS.time()
+def get_players_by_full_names(source: PlayerSource, names: list[str]) -> pd.DataFrame:
     """Get multiple players' records in a single batch query.
 
     Args:
-        df: Player DataFrame
+        source: Player DataFrame or backend
         names: List of exact full names
 
     Returns:
         DataFrame with player data
     """
+    ROSTER_LOOKUPS.inc()
     if not names:
         return pd.DataFrame(columns=PLAYER_COLUMNS)
 
-    return df[df["FULL_NAME"].isin(names)]
+    return as_backend(source).players_by_full_names(names)
+
 
+def resolve_player_ids(source: PlayerSource, names: Iterable[str]) -> dict[str, int]:
+    """Map exact full names to player row ids in one batched lookup.
 
+    Args:
+        source: Player DataFrame indexed by store row id, or a backend; only
+            ``FULL_NAME`` is read, so passing just that column keeps a
+            DataFrame lookup cheap
+        names: Full names to resolve
+
+    Returns:
+        Row id per name. Unknown names, and names shared by several
+        players, are left out.
+    """
+    found = get_players_by_full_names(source, sorted(set(names)))["FULL_NAME"]
+    counts = found.value_counts()
+    return {
+        str(name): int(i)
+        for i, name in zip(found.index.tolist(), found.tolist(), strict=True)
+        if counts[name] == 1
+    }
+
+
+def _distinct_positions(count: int, size: int, draws: int) -> np.ndarray:
+    """Draw ``size`` distinct positions below ``count``, ``draws`` times over.
+
+    Returns:
+        (draws, size) array; each row is uniform over ordered distinct picks
+    """
+    picks = np.empty((draws, size), dtype=np.int64)
+    for j in range(size):
+        position = np.random.randint(count - j, size=draws)
+        # Step over the positions already picked, smallest first
+        for taken in np.sort(picks[:, :j], axis=1).T:
+            position += position >= taken
+        picks[:, j] = position
+    return picks
+
+
+def _candidate_teams(
+    backend: PlayerBackend,
+    thresholds: tuple[int, int, int, int],
+    counts: list[int],
+    draws: int,
+) -> np.ndarray:
+    """Draw every slot of ``draws`` candidate teams independently.
+
+    Returns:
+        (draws, team size) array of row ids, which may repeat within a row
+    """
+    slots = []
+    for column, threshold, count, size in zip(
+        DIFFICULTY_COLUMNS, thresholds, counts, DIFFICULTY_SLOTS, strict=True
+    ):
+        positions = _distinct_positions(count, size, draws)
+        ids = backend.pick_above(column, threshold, positions.ravel())
+        slots.append(ids.reshape(draws, size))
+    return np.hstack(slots)
+
+
+@timed()
+@AWAY_TEAM_SECONDS.time()
+def get_away_team_ids_by_stats(
+    source: PlayerSource,
+    pts_threshold: int,
+    reb_threshold: int,
+    ast_threshold: int,
+    stl_threshold: int,
+) -> list[int]:
+    """Draw a random away team based on stat thresholds, as row ids.
+
+    The team fills two PTS slots and one slot each for REB, AST and STL
+    (``DIFFICULTY_SLOTS``) with five distinct players, each from the pool
+    of players above that column's threshold. Feasibility is settled up
+    front from the pool sizes and overlaps, so impossible thresholds fail
+    at once. Candidate teams then draw every slot independently and
+    uniformly from its pool, and the first one without a repeated player
+    is returned, which makes every valid team equally likely. Candidates
+    are drawn in growing vectorized batches, so even heavily overlapping
+    pools finish in a handful of passes. Thresholds that are feasible but
+    almost never produce a valid team give up after ``_MAX_BATCHES``.
+
+    Unlike get_away_team_by_stats, no records are fetched, so callers that
+    only keep the ids skip the row lookup.
+
+    Args:
+        source: Player DataFrame or backend
+        pts_threshold: Minimum career points
+        reb_threshold: Minimum career rebounds
+        ast_threshold: Minimum career assists
+        stl_threshold: Minimum career steals
+
+    Returns:
+        Row ids of 5 distinct players: the PTS picks, then REB, AST and STL
+
+    Raises:
+        QueryExecutionError: If no valid team exists for the thresholds,
+            or none turns up within the attempt budget
+    """
+    backend = as_backend(source)
+    thresholds = (pts_threshold, reb_threshold, ast_threshold, stl_threshold)
+    counts = pool_counts(backend, thresholds)
+    reason = infeasible_reason(backend, thresholds, counts)
+    if reason is not None:
+        AWAY_TEAM_FAILURES.inc()
+        raise QueryExecutionError(
+            f"No away team can be drawn: {reason}. Try lowering the difficulty."
+        )
+
+    draws, attempts = 1, 0
+    for _ in range(_MAX_BATCHES):
+        AWAY_TEAM_ATTEMPTS.inc(draws)
+        attempts += draws
+        teams = _candidate_teams(backend, thresholds, counts, draws)
+        ordered = np.sort(teams, axis=1)
+        valid = (ordered[:, 1:] != ordered[:, :-1]).all(axis=1)
+        if valid.any():
+            return [int(i) for i in teams[int(valid.argmax())]]
+        logger.debug("No valid team in %d candidates, drawing more", draws)
+        draws = min(draws * 4, _MAX_DRAWS)
+
+    AWAY_TEAM_FAILURES.inc()
+    raise QueryExecutionError(
+        f"No away team can be drawn: no valid team in {attempts} candidates. "
+        "Try lowering the difficulty."
+    )
+
+
+@timed()
 def get_away_team_by_stats(
-    df: pd.DataFrame,
+    source: PlayerSource,
     pts_threshold: int,
     reb_threshold: int,
     ast_threshold: int,
     stl_threshold: int,
-    max_attempts: int = MAX_QUERY_ATTEMPTS,
 ) -> pd.DataFrame:
     """Get a random away team based on stat thresholds.
 
     Ensures 5 unique players are selected who meet various stat criteria.
 
     Args:
-        df: Player DataFrame
+        source: Player DataFrame or backend
         pts_threshold: Minimum career points
         reb_threshold: Minimum career rebounds
         ast_threshold: Minimum career assists
         stl_threshold: Minimum career steals
-        max_attempts: Maximum query attempts before raising error
 
     Returns:
         DataFrame with 5 players
 
     Raises:
-        QueryExecutionError: If unable to get 5 players within max_attempts
+        QueryExecutionError: If no valid team exists for the thresholds,
+            or none turns up within the attempt budget
     """
-    # Pre-filter pools to improve performance and reliability
-    pool_pts = df[df["PTS"] > pts_threshold]
-    pool_reb = df[df["REB"] > reb_threshold]
-    pool_ast = df[df["AST"] > ast_threshold]
-    pool_stl = df[df["STL"] > stl_threshold]
-
-    for attempt in range(max_attempts):
-        try:
-            # We need 5 unique players. Strategy:
-            # 1. Pick 2 from PTS
-            # 2. Pick 1 from REB (not in PTS)
-            # 3. Pick 1 from AST (not in PTS or REB)
-            # 4. Pick 1 from STL (not in PTS, REB, or AST)
-
-            selected_indices: set[int] = set()
-
-            # Step 1: PTS (2 players)
-            if len(pool_pts) < 2:
-                raise ValueError("PTS pool too small")
-            p12 = pool_pts.sample(n=2, replace=False)
-            selected_indices.update(p12.index.tolist())
-
-            # Step 2: REB (1 player)
-            remaining_reb = pool_reb[~pool_reb.index.isin(selected_indices)]
-            if remaining_reb.empty:
-                raise ValueError("REB pool exhausted")
-            p3 = remaining_reb.sample(n=1)
-            selected_indices.update(p3.index.tolist())
-
-            # Step 3: AST (1 player)
-            remaining_ast = pool_ast[~pool_ast.index.isin(selected_indices)]
-            if remaining_ast.empty:
-                raise ValueError("AST pool exhausted")
-            p4 = remaining_ast.sample(n=1)
-            selected_indices.update(p4.index.tolist())
-
-            # Step 4: STL (1 player)
-            remaining_stl = pool_stl[~pool_stl.index.isin(selected_indices)]
-            if remaining_stl.empty:
-                raise ValueError("STL pool exhausted")
-            p5 = remaining_stl.sample(n=1)
-            selected_indices.update(p5.index.tolist())
-
-            results = df.loc[list(selected_indices)]
-            if len(results) == 5:
-                logger.info("Got away team on attempt %d", attempt + 1)
-                return results
-
-        except ValueError as e:
-            logger.debug("Attempt %d failed: %s", attempt + 1, e)
-            continue
-
-    raise QueryExecutionError(
-        f"Could not generate away team with 5 players after {max_attempts} attempts. "
-        "Try lowering the difficulty."
+    backend = as_backend(source)
+    selected = get_away_team_ids_by_stats(
+        backend, pts_threshold, reb_threshold, ast_threshold, stl_threshold
     )
+    return backend.rows(selected)
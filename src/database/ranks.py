@@ -0,0 +1,193 @@
+"""Rank tables for resolving difficulty percentiles to candidate pools.
+
+Each difficulty column is argsorted once when the player store is built.
+The table keeps the row ids in ascending stat order next to the sorted
+values, so every player ranked above a percentile is a suffix of that order
+and its boundary is plain arithmetic. Absolute thresholds find their
+boundary with a binary search over the sorted values. Either way a pool is
+a read-only view and no DataFrame is filtered, which keeps pool sizes and
+the team feasibility check cheap enough to run on every slider move.
+"""
+
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import combinations
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+
+from src.config import DIFFICULTY_COLUMNS, DIFFICULTY_PERCENTILES, DIFFICULTY_SLOTS
+
+Thresholds = tuple[int, int, int, int]
+Percentiles = tuple[float, float, float, float]
+
+
+class ThresholdPools(Protocol):
+    """Sizes and lists the players above a stat threshold."""
+
+    def count_above(self, column: str, threshold: float) -> int:
+        """Number of players whose ``column`` is strictly above ``threshold``."""
+        ...
+
+    def pool_above(self, column: str, threshold: float) -> np.ndarray:
+        """Row ids of the players whose ``column`` is strictly above ``threshold``."""
+        ...
+
+
+class RankTable:
+    """Per-column row ids in ascending stat order, with the sorted values."""
+
+    __slots__ = ("_order", "_values", "size")
+
+    def __init__(
+        self, frame: pd.DataFrame, columns: Iterable[str] = DIFFICULTY_COLUMNS
+    ) -> None:
+        """Rank the players on each column.
+
+        Args:
+            frame: Player DataFrame with a default RangeIndex
+            columns: Numeric columns to rank; missing values count as 0
+        """
+        self.size = len(frame)
+        self._order: dict[str, np.ndarray] = {}
+        self._values: dict[str, np.ndarray] = {}
+        for column in columns:
+            values = np.nan_to_num(frame[column].to_numpy(dtype=np.float64))
+            # Stable, so players tied on a stat keep their row order
+            order = np.argsort(values, kind="stable")
+            ranked = values[order]
+            order.flags.writeable = False
+            ranked.flags.writeable = False
+            self._order[column] = order
+            self._values[column] = ranked
+
+    def boundary(self, percentile: float) -> int:
+        """Rank of the first player above a percentile, in O(1).
+
+        Args:
+            percentile: 0 to 100; the top ``100 - percentile`` percent of
+                players are above it
+
+        Returns:
+            Number of players at or below the percentile
+
+        Raises:
+            ValueError: If the percentile is outside 0 to 100
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100: {percentile}")
+        return min(self.size, math.ceil(self.size * percentile / 100))
+
+    def pool(self, column: str, percentile: float) -> np.ndarray:
+        """Row ids of the players ranked above a percentile on a column.
+
+        The pool holds exactly ``size - boundary(percentile)`` players; ties
+        at the boundary are split by row order.
+        """
+        return self._order[column][self.boundary(percentile) :]
+
+    def pool_above(self, column: str, threshold: float) -> np.ndarray:
+        """Row ids of the players whose stat is strictly above ``threshold``."""
+        start = np.searchsorted(self._values[column], threshold, side="right")
+        return self._order[column][int(start) :]
+
+    def count_above(self, column: str, threshold: float) -> int:
+        """Number of players whose stat is strictly above ``threshold``."""
+        start = np.searchsorted(self._values[column], threshold, side="right")
+        return self.size - int(start)
+
+    def highest(self, column: str) -> float:
+        """Largest value of a column, or 0 for an empty table."""
+        values = self._values[column]
+        return float(values[-1]) if self.size else 0.0
+
+    def threshold(self, column: str, percentile: float) -> int:
+        """Absolute threshold that selects a percentile's pool.
+
+        Players strictly above the returned value are the ones ranked above
+        the percentile, except that players tied with the last one below it
+        are left out as well.
+        """
+        start = self.boundary(percentile)
+        values = self._values[column]
+        if start == 0:
+            return int(np.floor(values[0])) - 1 if self.size else 0
+        return int(np.floor(values[start - 1]))
+
+    def thresholds(self, percentiles: Percentiles) -> Thresholds:
+        """Resolve one percentile per difficulty column to absolute thresholds."""
+        pts, reb, ast, stl = (
+            self.threshold(column, percentile)
+            for column, percentile in zip(DIFFICULTY_COLUMNS, percentiles, strict=True)
+        )
+        return (pts, reb, ast, stl)
+
+
+def pool_counts(pools: ThresholdPools, thresholds: Thresholds) -> list[int]:
+    """Size of each difficulty column's pool, in ``DIFFICULTY_COLUMNS`` order."""
+    return [
+        pools.count_above(column, threshold)
+        for column, threshold in zip(DIFFICULTY_COLUMNS, thresholds, strict=True)
+    ]
+
+
+def infeasible_reason(
+    pools: ThresholdPools,
+    thresholds: Thresholds,
+    counts: Sequence[int] | None = None,
+) -> str | None:
+    """Explain why no away team can be drawn for the thresholds.
+
+    Each difficulty column fills ``DIFFICULTY_SLOTS`` players from its pool,
+    and no player fills two slots. A team exists exactly when every group
+    of columns has at least as many distinct players across its pools as
+    it has slots (Hall's condition). A pool with a full team's worth of
+    players satisfies every group it is in, so only the small pools are
+    ever materialized.
+
+    Args:
+        pools: Rank table or backend of the players in use
+        thresholds: (pts, reb, ast, stl) minimums
+        counts: Pool sizes from ``pool_counts``, if already known
+
+    Returns:
+        A message naming the shortfall, or None if a team exists
+    """
+    team_size = sum(DIFFICULTY_SLOTS)
+    if counts is None:
+        counts = pool_counts(pools, thresholds)
+    for column, threshold, count, slots in zip(
+        DIFFICULTY_COLUMNS, thresholds, counts, DIFFICULTY_SLOTS, strict=True
+    ):
+        if count < slots:
+            return f"{count} in the {column} pool above {threshold}, {slots} needed"
+
+    small = [i for i, count in enumerate(counts) if count < team_size]
+    for size in range(2, len(small) + 1):
+        for group in combinations(small, size):
+            needed = sum(DIFFICULTY_SLOTS[i] for i in group)
+            members = [
+                pools.pool_above(DIFFICULTY_COLUMNS[i], thresholds[i]) for i in group
+            ]
+            distinct = len(np.unique(np.concatenate(members)))
+            if distinct < needed:
+                names = "/".join(DIFFICULTY_COLUMNS[i] for i in group)
+                return f"{distinct} distinct in the {names} pools, {needed} needed"
+    return None
+
+
+def difficulty_thresholds(
+    ranks: RankTable,
+    percentiles: Mapping[str, Percentiles] = DIFFICULTY_PERCENTILES,
+) -> dict[str, Thresholds]:
+    """Resolve the percentile difficulty presets against one player table.
+
+    Args:
+        ranks: Rank table of the player store in use
+        percentiles: Percentiles per difficulty name
+
+    Returns:
+        (pts, reb, ast, stl) thresholds per difficulty name, in preset order
+    """
+    return {name: ranks.thresholds(p) for name, p in percentiles.items()}
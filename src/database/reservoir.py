@@ -0,0 +1,318 @@
+"""Background-refilled reservoir of ready-made away teams.
+
+Teams are kept per stat-threshold tuple as player row id tuples, tagged
+with the version of the player store they were drawn from. A daemon thread
+tops every known threshold up to the target depth, so "Play New Team"
+normally pops a finished team instead of running the sampler on the
+request path. Saving a home team primes the difficulty picked on the home
+page, so custom thresholds are usually ready by the first game too. An
+empty reservoir falls back to generating synchronously, so callers always
+get a team when one is possible. The difficulty presets are percentiles,
+so the thresholds kept filled are re-resolved whenever a new store is
+published.
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
+
+from src.config import MAX_RESERVOIR_KEYS, RESERVOIR_DEPTH
+from src.database.backends import FrameBackend
+from src.database.connection import DatabaseConnectionError, QueryExecutionError
+from src.database.queries import get_away_team_ids_by_stats
+from src.database.ranks import Thresholds, difficulty_thresholds
+from src.database.store import PlayerStore, get_player_store
+from src.telemetry.metrics import REGISTRY
+
+logger = logging.getLogger("streamlit_nba")
+
+TeamIds = tuple[int, ...]
+TeamGenerator = Callable[[PlayerStore, Thresholds], TeamIds]
+PresetResolver = Callable[[PlayerStore], Iterable[Thresholds]]
+
+# Seconds the refill thread sleeps when every reservoir is full
+REFILL_IDLE_SECONDS = 5.0
+
+RESERVOIR_POPS = REGISTRY.counter(
+    "nba_reservoir_pops_total", "Away teams served from the reservoir."
+)
+RESERVOIR_MISSES = REGISTRY.counter(
+    "nba_reservoir_misses_total",
+    "Away-team requests that found the reservoir empty and generated inline.",
+)
+RESERVOIR_GENERATED = REGISTRY.counter(
+    "nba_reservoir_generated_total", "Away teams generated by the refill thread."
+)
+RESERVOIR_REFILL_FAILURES = REGISTRY.counter(
+    "nba_reservoir_refill_failures_total",
+    "Refill attempts that could not produce a team.",
+)
+
+
+def generate_away_team(store: PlayerStore, thresholds: Thresholds) -> TeamIds:
+    """Generate one away team for the given thresholds.
+
+    Args:
+        store: Player store to draw from
+        thresholds: (pts, reb, ast, stl) minimums
+
+    Returns:
+        Player row ids of the team
+
+    Raises:
+        QueryExecutionError: If no team can be generated
+    """
+    pts, reb, ast, stl = thresholds
+    team = get_away_team_ids_by_stats(
+        FrameBackend(store.df, store.ranks),
+        pts_threshold=pts,
+        reb_threshold=reb,
+        ast_threshold=ast,
+        stl_threshold=stl,
+    )
+    return tuple(team)
+
+
+class TeamReservoir:
+    """Per-threshold queues of pre-generated away teams."""
+
+    def __init__(
+        self,
+        depth: int = RESERVOIR_DEPTH,
+        generate: TeamGenerator = generate_away_team,
+        get_store: Callable[[], PlayerStore] = get_player_store,
+        presets: Iterable[Thresholds] | PresetResolver = (),
+        max_keys: int = MAX_RESERVOIR_KEYS,
+    ) -> None:
+        """Create a reservoir; call ``start`` to begin background refills.
+
+        Args:
+            depth: Teams kept ready per threshold tuple
+            generate: Function producing one team
+            get_store: Returns the current player store
+            presets: Thresholds to keep filled from the start, or a callable
+                resolving them for each store; never evicted
+            max_keys: Most threshold tuples tracked at once
+        """
+        self.depth = depth
+        self.max_keys = max_keys
+        self._generate = generate
+        self._get_store = get_store
+        self._resolve_presets = presets if callable(presets) else None
+        self._presets = frozenset(() if callable(presets) else presets)
+        self._presets_version: str | None = None
+        self._teams: OrderedDict[Thresholds, deque[tuple[str, TeamIds]]] = OrderedDict(
+            (key, deque()) for key in self._presets
+        )
+        self._paused: set[Thresholds] = set()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the refill thread if it is not already running."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="team-reservoir", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the refill thread and wait for it to exit."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def depth_of(self, thresholds: Thresholds) -> int:
+        """Number of teams ready for a threshold tuple."""
+        with self._cond:
+            return len(self._teams.get(thresholds, ()))
+
+    def total_depth(self) -> int:
+        """Number of teams ready across all thresholds."""
+        with self._cond:
+            return sum(len(teams) for teams in self._teams.values())
+
+    def pop(self, thresholds: Thresholds, store: PlayerStore | None = None) -> TeamIds:
+        """Take a ready team, generating one inline if none is available.
+
+        Args:
+            thresholds: (pts, reb, ast, stl) minimums
+            store: Store the team's ids must index; the current one if
+                omitted. Callers off the page thread, which do not see the
+                rerun's pinned store, pass the one they resolved.
+
+        Returns:
+            Player row ids of the team
+
+        Raises:
+            DatabaseConnectionError: If the player store cannot be loaded
+            QueryExecutionError: If no team can be generated
+        """
+        current = self._get_store()
+        if store is None:
+            store = current
+        with self._cond:
+            # Presets follow the newest store even when an older one is served
+            self._refresh_presets(current)
+            teams = self._track(thresholds)
+            self._paused.discard(thresholds)
+            ready = None
+            # Queued teams index the current store; an older one generates
+            while teams and store.version == current.version:
+                version, ids = teams.popleft()
+                if version == store.version:
+                    ready = ids
+                    break
+            self._cond.notify()
+
+        if ready is not None:
+            RESERVOIR_POPS.inc()
+            return ready
+
+        RESERVOIR_MISSES.inc()
+        logger.info("Reservoir empty for %s, generating inline", thresholds)
+        return self._generate(store, thresholds)
+
+    def prime(self, thresholds: Thresholds) -> None:
+        """Start filling a threshold tuple ahead of its first pop.
+
+        Returns at once; the refill thread generates the teams. Call it
+        when the thresholds are known but the team is not needed yet.
+
+        Args:
+            thresholds: (pts, reb, ast, stl) minimums
+        """
+        with self._cond:
+            self._track(thresholds)
+            self._paused.discard(thresholds)
+            self._cond.notify()
+
+    def _track(self, thresholds: Thresholds) -> deque[tuple[str, TeamIds]]:
+        # Caller holds the lock
+        teams = self._teams.get(thresholds)
+        if teams is None:
+            teams = self._teams[thresholds] = deque()
+            evictable = [
+                k for k in self._teams if k not in self._presets and k != thresholds
+            ]
+            while len(self._teams) > self.max_keys and evictable:
+                evicted = evictable.pop(0)
+                del self._teams[evicted]
+                self._paused.discard(evicted)
+        self._teams.move_to_end(thresholds)
+        return teams
+
+    def _refresh_presets(self, store: PlayerStore) -> None:
+        # Caller holds the lock; presets of a replaced store stop being filled
+        if self._resolve_presets is None or store.version == self._presets_version:
+            return
+        presets = frozenset(self._resolve_presets(store))
+        for key in self._presets - presets:
+            self._teams.pop(key, None)
+            self._paused.discard(key)
+        for key in presets:
+            self._teams.setdefault(key, deque())
+        self._presets = presets
+        self._presets_version = store.version
+
+    def _next_deficit(self) -> Thresholds | None:
+        # Caller holds the lock; pick the emptiest reservoir below depth
+        candidates = [
+            (len(teams), key)
+            for key, teams in self._teams.items()
+            if len(teams) < self.depth and key not in self._paused
+        ]
+        return min(candidates)[1] if candidates else None
+
+    def _run(self) -> None:
+        version: str | None = None
+        while not self._stop.is_set():
+            if self._resolve_presets is not None:
+                try:
+                    current = self._get_store()
+                except DatabaseConnectionError as e:
+                    logger.warning("Reservoir cannot load player data: %s", e)
+                    self._stop.wait(REFILL_IDLE_SECONDS)
+                    continue
+                with self._cond:
+                    self._refresh_presets(current)
+
+            with self._cond:
+                key = self._next_deficit()
+                if key is None:
+                    self._cond.wait(REFILL_IDLE_SECONDS)
+                    continue
+
+            try:
+                store = self._get_store()
+                if store.version != version:
+                    version = store.version
+                    with self._cond:
+                        for teams in self._teams.values():
+                            teams.clear()
+                ids = self._generate(store, key)
+            except (DatabaseConnectionError, QueryExecutionError) as e:
+                # Wait for the next request for these thresholds before retrying
+                RESERVOIR_REFILL_FAILURES.inc()
+                logger.warning("Reservoir refill failed for %s: %s", key, e)
+                with self._cond:
+                    self._paused.add(key)
+                continue
+
+            RESERVOIR_GENERATED.inc()
+            with self._cond:
+                queue = self._teams.get(key)
+                if queue is not None:
+                    queue.append((store.version, ids))
+
+
+class _ReservoirSlot:
+    """Holder for the process-wide reservoir."""
+
+    __slots__ = ("reservoir",)
+
+    def __init__(self) -> None:
+        self.reservoir: TeamReservoir | None = None
+
+
+_slot = _ReservoirSlot()
+_reservoir_lock = threading.Lock()
+
+
+def _difficulty_presets(store: PlayerStore) -> Iterable[Thresholds]:
+    return difficulty_thresholds(store.ranks).values()
+
+
+def get_team_reservoir() -> TeamReservoir:
+    """Return the shared reservoir, starting its refill thread on first use.
+
+    The percentile difficulty presets, resolved against the current player
+    store, are kept filled from the start.
+
+    Returns:
+        The process-wide TeamReservoir
+    """
+    reservoir = _slot.reservoir
+    if reservoir is not None:
+        return reservoir
+
+    with _reservoir_lock:
+        if _slot.reservoir is None:
+            _slot.reservoir = TeamReservoir(presets=_difficulty_presets)
+            _slot.reservoir.start()
+        return _slot.reservoir
+
+
+REGISTRY.gauge(
+    "nba_reservoir_teams",
+    "Away teams ready in the reservoir across all difficulties.",
+    lambda: float(_slot.reservoir.total_depth() if _slot.reservoir else 0),
+)
@@ -0,0 +1,220 @@
+"""k-nearest-neighbour search for players with similar stat lines.
+
+Each player's ``STAT_COLUMNS`` (optionally per game, dividing the counting
+stats by ``GP``) are standardized to z-scores once per store and kept as a
+contiguous float32 matrix. A query is then a blocked matrix multiply:
+
+    |q - x|^2 = |q|^2 + |x|^2 - 2 q.x
+
+scored ``SIMILARITY_BLOCK_ROWS`` rows at a time, keeping a running top-k
+with ``np.argpartition``. Rows farther than a bound on the k-th best
+distance are dropped with one comparison before partitioning. No pandas
+work happens per query, and the temporary distance matrix stays bounded
+however large the table grows. Results are a positional take from a
+cached frame of names and stats.
+"""
+
+import logging
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.config import SIMILAR_PLAYERS, SIMILARITY_BLOCK_ROWS, STAT_COLUMNS
+from src.database.store import PlayerStore
+from src.telemetry.metrics import SIMILAR_SEARCH_SECONDS, SIMILAR_SEARCHES
+from src.telemetry.timing import timed
+
+logger = logging.getLogger("streamlit_nba")
+
+# Rates are already per attempt, so they are not divided by games played
+RATE_COLUMNS = frozenset(col for col in STAT_COLUMNS if col.endswith("_PCT"))
+
+# Rows per block sampled to bound the k-th best distance before partitioning
+_PRUNE_SAMPLE = 1024
+
+
+class SimilarityIndex:
+    """Standardized stat vectors with blocked nearest-neighbour queries."""
+
+    __slots__ = ("_columns", "_norms", "block_rows")
+
+    def __init__(
+        self,
+        stats: np.ndarray,
+        games: np.ndarray | None = None,
+        block_rows: int = SIMILARITY_BLOCK_ROWS,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            stats: (players, len(STAT_COLUMNS)) matrix in STAT_COLUMNS order
+            games: Games played per player; if given, counting stats are
+                divided by it before standardizing
+            block_rows: Table rows scored per matrix multiply
+        """
+        vectors = np.array(stats, dtype=np.float64)
+        if games is not None:
+            counting = [
+                i for i, col in enumerate(STAT_COLUMNS) if col not in RATE_COLUMNS
+            ]
+            vectors[:, counting] /= np.maximum(games, 1)[:, None]
+
+        std = vectors.std(axis=0)
+        std[std == 0] = 1.0
+        vectors = (vectors - vectors.mean(axis=0)) / std
+
+        # Feature-major: with only a handful of stats per player, multiplying
+        # a query by (features, players) rows is ~3x faster than the transpose
+        self._columns = np.ascontiguousarray(vectors.T, dtype=np.float32)
+        self._norms = np.einsum("ji,ji->i", self._columns, self._columns)
+        self._columns.flags.writeable = False
+        self._norms.flags.writeable = False
+        self.block_rows = block_rows
+
+    def __len__(self) -> int:
+        """Number of indexed players."""
+        return int(self._columns.shape[1])
+
+    def nearest(self, player_id: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Find the players most similar to one player.
+
+        Args:
+            player_id: Row id of the player to match
+            k: Number of neighbours
+
+        Returns:
+            Tuple of (row ids, distances), closest first, excluding the player
+        """
+        ids, distances = self.query(
+            self._columns[:, [player_id]].T, k, exclude=np.array([player_id])
+        )
+        return ids[0], distances[0]
+
+    def query(
+        self, vectors: np.ndarray, k: int, exclude: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the k nearest indexed players to each standardized vector.
+
+        Args:
+            vectors: (queries, len(STAT_COLUMNS)) standardized vectors
+            k: Number of neighbours per query
+            exclude: Optional row id per query to leave out (e.g. itself)
+
+        Returns:
+            Tuple of (row ids, Euclidean distances), each (queries, k') with
+            k' = min(k, players available), closest first
+        """
+        queries = np.asarray(vectors, dtype=np.float32)
+        k = min(k, len(self) - (exclude is not None))
+        if k < 1:
+            return (
+                np.empty((len(queries), 0), dtype=np.int64),
+                np.empty((len(queries), 0), dtype=np.float32),
+            )
+        best_d = np.full((len(queries), k), np.inf, dtype=np.float32)
+        best_i = np.zeros((len(queries), k), dtype=np.int64)
+        rows = np.arange(len(queries))
+        scaled = -2.0 * queries
+
+        for start in range(0, len(self), self.block_rows):
+            block = self._columns[:, start : start + self.block_rows]
+            size = block.shape[1]
+            # |x|^2 - 2 q.x; |q|^2 is the same for every row, added at the end
+            d = scaled @ block
+            d += self._norms[start : start + size]
+            if exclude is not None:
+                inside = (exclude >= start) & (exclude < start + size)
+                d[rows[inside], exclude[inside] - start] = np.inf
+
+            # A row can only enter a query's top k if it is no farther than
+            # the k-th best seen so far, or the k-th best of a strided sample
+            # of this block; one comparison drops the rest before partitioning
+            bound = best_d.max(axis=1, keepdims=True)
+            sample = d[:, :: max(1, size // _PRUNE_SAMPLE)]
+            if sample.shape[1] >= k:
+                kth = np.partition(sample, k - 1, axis=1)[:, k - 1 : k]
+                bound = np.minimum(bound, kth)
+            cols = np.flatnonzero((d <= bound).any(axis=0))
+            if len(cols) == 0:
+                continue
+            if len(cols) < size:
+                d = d[:, cols]
+                size = len(cols)
+
+            # Top k of the block, then of the block's and earlier winners
+            if size > k:
+                part = np.argpartition(d, k - 1, axis=1)[:, :k]
+                d = np.take_along_axis(d, part, axis=1)
+            else:
+                part = np.broadcast_to(np.arange(size), d.shape)
+            merged_d = np.concatenate([best_d, d], axis=1)
+            merged_i = np.concatenate([best_i, cols[part] + start], axis=1)
+            keep = np.argpartition(merged_d, k - 1, axis=1)[:, :k]
+            best_d = np.take_along_axis(merged_d, keep, axis=1)
+            best_i = np.take_along_axis(merged_i, keep, axis=1)
+
+        order = np.argsort(best_d, axis=1, kind="stable")
+        best_d = np.take_along_axis(best_d, order, axis=1)
+        best_i = np.take_along_axis(best_i, order, axis=1)
+        query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        return best_i, np.sqrt(np.maximum(best_d + query_norms, 0.0))
+
+
+@lru_cache(maxsize=4)
+def get_similarity_index(store: PlayerStore, per_game: bool = False) -> SimilarityIndex:
+    """Return the similarity index for a store, building it on first use.
+
+    Args:
+        store: Player store
+        per_game: Compare counting stats per game instead of as totals
+
+    Returns:
+        SimilarityIndex over every player in the store
+    """
+    games = store.df["GP"].to_numpy(dtype=np.float64) if per_game else None
+    index = SimilarityIndex(
+        store.stats, None if games is None else np.nan_to_num(games)
+    )
+    logger.info(
+        "Similarity index built: %d players (per_game=%s)", len(index), per_game
+    )
+    return index
+
+
+@lru_cache(maxsize=2)
+def _result_frame(store: PlayerStore) -> pd.DataFrame:
+    # Names and stats in one consolidated frame, with a DISTANCE slot, so a
+    # result is a positional take instead of a selection from the full table.
+    # Object names take in constant time; a string column scales with rows.
+    frame = store.df[["FULL_NAME", *STAT_COLUMNS]].astype({"FULL_NAME": object})
+    frame.insert(1, "DISTANCE", np.float32(0))
+    return frame
+
+
+@timed()
+def find_similar_players(
+    store: PlayerStore,
+    player_id: int,
+    k: int = SIMILAR_PLAYERS,
+    per_game: bool = False,
+) -> pd.DataFrame:
+    """Find the players whose stat lines are closest to one player's.
+
+    Args:
+        store: Player store
+        player_id: Row id of the player to match
+        k: Number of players to return
+        per_game: Compare counting stats per game instead of as totals
+
+    Returns:
+        DataFrame of the similar players' names and ``STAT_COLUMNS``,
+        closest first, indexed by row id, with a DISTANCE column after
+        FULL_NAME
+    """
+    SIMILAR_SEARCHES.inc()
+    with SIMILAR_SEARCH_SECONDS.time():
+        ids, distances = get_similarity_index(store, per_game).nearest(player_id, k)
+    players = _result_frame(store).take(ids)
+    players["DISTANCE"] = distances.round(3)
+    return players
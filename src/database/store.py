@@ -0,0 +1,223 @@
+"""Process-wide, read-only player data store shared by every session."""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+
+from src.config import RETIRED_SNAPSHOTS, STAT_COLUMNS
+from src.database import connection
+from src.database.ranks import RankTable
+from src.telemetry.timing import RerunTimings, current_rerun
+
+logger = logging.getLogger("streamlit_nba")
+
+
+class PlayerStore:
+    """Immutable player table plus derived arrays, built once per process.
+
+    Callers get the table through ``df``, which is a shallow copy-on-write
+    view: reading it shares memory with the store, and any mutation copies
+    just the touched column instead of changing what other sessions see.
+    """
+
+    __slots__ = ("_frame", "names", "ranks", "stats", "version")
+
+    def __init__(self, frame: pd.DataFrame, version: str) -> None:
+        """Wrap a loaded player table.
+
+        Args:
+            frame: Player DataFrame with a default RangeIndex
+            version: Identifier of the data the store was built from
+        """
+        self._frame = frame.reset_index(drop=True)
+        self.version = version
+
+        stats = np.nan_to_num(self._frame[STAT_COLUMNS].to_numpy(dtype=np.float32))
+        stats.flags.writeable = False
+        self.stats: np.ndarray = stats
+
+        names = self._frame["FULL_NAME"].to_numpy(dtype=object)
+        names.flags.writeable = False
+        self.names: np.ndarray = names
+
+        self.ranks = RankTable(self._frame)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Copy-on-write view of the player table."""
+        return self._frame.copy(deep=False)
+
+    def rows(self, ids: tuple[int, ...] | list[int]) -> pd.DataFrame:
+        """Resolve player row ids to their records, in the given order.
+
+        Args:
+            ids: Positional row ids into the store
+
+        Returns:
+            Copy-on-write DataFrame indexed by the row ids
+        """
+        return self._frame.iloc[list(ids)]
+
+    def name_of(self, player_id: int) -> str:
+        """Return the full name for a player row id."""
+        return str(self.names[player_id])
+
+    def is_valid_id(self, player_id: object) -> bool:
+        """Check whether a value is an in-range player row id."""
+        return (
+            isinstance(player_id, int | np.integer)
+            and not isinstance(player_id, bool)
+            and 0 <= int(player_id) < len(self._frame)
+        )
+
+    def __len__(self) -> int:
+        """Number of players in the store."""
+        return len(self._frame)
+
+
+class _StoreSlot:
+    """Holder for the current store; rebinding ``store`` is atomic.
+
+    ``retired`` keeps the names of the last few replaced stores by version,
+    oldest first, so ids saved against them can still be read.
+    """
+
+    __slots__ = ("retired", "store")
+
+    def __init__(self) -> None:
+        self.store: PlayerStore | None = None
+        self.retired: OrderedDict[str, np.ndarray] = OrderedDict()
+
+
+_slot = _StoreSlot()
+_store_lock = threading.Lock()
+
+# The store a page rerun started with, so a swap mid-rerun cannot mix data
+_pinned: ContextVar[tuple[RerunTimings, PlayerStore] | None] = ContextVar(
+    "pinned_player_store", default=None
+)
+
+
+def _data_version() -> str:
+    stat = connection.CSV_PATH.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def load_player_store() -> PlayerStore:
+    """Build a new store from the CSV without publishing it.
+
+    Returns:
+        A fresh PlayerStore
+
+    Raises:
+        DatabaseConnectionError: If the data cannot be loaded
+    """
+    # Stat before reading: a write that lands mid-read gets a newer version
+    # and is picked up again instead of hiding behind this one
+    try:
+        version = _data_version()
+    except OSError as e:
+        raise connection.DatabaseConnectionError(
+            f"Data file not found: {connection.CSV_PATH}"
+        ) from e
+    return PlayerStore(connection.load_data(), version)
+
+
+def publish_player_store(store: PlayerStore) -> None:
+    """Make ``store`` the shared store with a single reference swap.
+
+    Callers already holding the previous store keep using it; page reruns
+    in flight keep the store they started with.
+
+    Args:
+        store: Fully built store to publish
+    """
+    with _store_lock:
+        previous = _slot.store
+        if previous is not None and previous.version != store.version:
+            _slot.retired[previous.version] = previous.names
+            _slot.retired.pop(store.version, None)
+            while len(_slot.retired) > RETIRED_SNAPSHOTS:
+                _slot.retired.popitem(last=False)
+        _slot.store = store
+    logger.info(
+        "Player store published: %d players (version %s)", len(store), store.version
+    )
+
+
+def get_player_store() -> PlayerStore:
+    """Return the shared player store, loading it on first use.
+
+    Concurrent first calls are serialized so the CSV is parsed exactly once
+    per process; later calls return the same object without locking.
+    Within a page rerun every call returns the same store, even if a newer
+    one is published while the rerun is running.
+
+    Returns:
+        The process-wide PlayerStore
+
+    Raises:
+        DatabaseConnectionError: If the data cannot be loaded
+    """
+    rerun = current_rerun()
+    pinned = _pinned.get()
+    if rerun is not None and pinned is not None and pinned[0] is rerun:
+        return pinned[1]
+
+    store = _slot.store
+    if store is None:
+        with _store_lock:
+            if _slot.store is None:
+                _slot.store = load_player_store()
+                logger.info(
+                    "Player store loaded: %d players (version %s)",
+                    len(_slot.store),
+                    _slot.store.version,
+                )
+            store = _slot.store
+
+    if rerun is not None:
+        _pinned.set((rerun, store))
+    return store
+
+
+def remap_player_ids(
+    ids: tuple[int, ...], version: str, store: PlayerStore
+) -> tuple[int, ...] | None:
+    """Move row ids from an earlier snapshot onto ``store``, by player name.
+
+    Args:
+        ids: Row ids into the snapshot with ``version``
+        version: Version of the store the ids were taken from
+        store: Store to move them to
+
+    Returns:
+        The same players' row ids in ``store``, in order, or None if the
+        old snapshot is no longer known or a player is missing or no
+        longer has a unique name
+    """
+    if version == store.version:
+        return ids
+    names = _slot.retired.get(version)
+    if names is None or not all(0 <= i < len(names) for i in ids):
+        return None
+
+    remapped = []
+    for name in names[list(ids)]:
+        matches = np.flatnonzero(store.names == name)
+        if len(matches) != 1:
+            return None
+        remapped.append(int(matches[0]))
+    return tuple(remapped)
+
+
+def reset_player_store() -> None:
+    """Drop the shared store so the next access reloads it."""
+    with _store_lock:
+        _slot.store = None
+        _slot.retired.clear()
+    _pinned.set(None)
@@ -1,15 +1,73 @@
-"""Machine learning module for game prediction."""
+"""Machine learning module for game prediction.
 
-from src.ml.model import (
-    ModelLoadError,
-    analyze_team_stats,
-    get_winner_model,
-    predict_winner,
-)
+Exports are imported from their submodules on first access, so importing
+the package alone does not load NumPy or the model code.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.ml.bundle import (
+        BundleSchemaError,
+        ModelBundle,
+        ModelLoadError,
+        load_bundle,
+        save_bundle,
+    )
+    from src.ml.model import (
+        analyze_team_stats,
+        get_model_bundle,
+        get_model_version,
+        get_variant_bundle,
+        get_winner_model,
+        predict_win_probabilities,
+        predict_winner,
+        reload_model_bundle,
+    )
+
+# Exported name -> defining submodule
+_EXPORTS: dict[str, str] = {
+    "BundleSchemaError": "src.ml.bundle",
+    "ModelBundle": "src.ml.bundle",
+    "ModelLoadError": "src.ml.bundle",
+    "analyze_team_stats": "src.ml.model",
+    "get_model_bundle": "src.ml.model",
+    "get_model_version": "src.ml.model",
+    "get_variant_bundle": "src.ml.model",
+    "get_winner_model": "src.ml.model",
+    "load_bundle": "src.ml.bundle",
+    "predict_win_probabilities": "src.ml.model",
+    "predict_winner": "src.ml.model",
+    "reload_model_bundle": "src.ml.model",
+    "save_bundle": "src.ml.bundle",
+}
 
 __all__ = [
+    "BundleSchemaError",
+    "ModelBundle",
     "ModelLoadError",
     "analyze_team_stats",
+    "get_model_bundle",
+    "get_model_version",
+    "get_variant_bundle",
     "get_winner_model",
+    "load_bundle",
+    "predict_win_probabilities",
     "predict_winner",
+    "reload_model_bundle",
+    "save_bundle",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,343 @@
+"""Versioned model bundle: weights, feature schema, metrics and checksum.
+
+A bundle is a directory holding ``manifest.json`` and a content-addressed
+``weights-<hash>.npz``. The manifest records the feature order the model was
+trained with, so a bundle that does not match ``STAT_COLUMNS``/``TEAM_SIZE``
+is rejected at load time instead of producing garbage predictions. Inference
+is a plain NumPy forward pass over dense layers, which keeps loading cheap
+and TensorFlow off the serving path.
+"""
+
+import hashlib
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.telemetry.metrics import MODEL_LOAD_FAILURES, MODEL_LOAD_SECONDS, MODEL_LOADS
+
+logger = logging.getLogger("streamlit_nba")
+
+BUNDLE_FORMAT: Final[int] = 1
+MANIFEST_NAME: Final[str] = "manifest.json"
+
+# Default bundle paths relative to the project root
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_BUNDLE_PATH = _PROJECT_ROOT / "winner_bundle"
+STUDENT_BUNDLE_PATH = _PROJECT_ROOT / "student_bundle"
+
+SUPPORTED_ACTIVATIONS: Final[frozenset[str]] = frozenset({"linear", "relu", "sigmoid"})
+
+
+class ModelLoadError(Exception):
+    """Raised when model loading fails."""
+
+    pass
+
+
+class BundleSchemaError(ModelLoadError):
+    """Raised when a bundle's feature schema does not match the application."""
+
+    pass
+
+
+def expected_input_dim() -> int:
+    """Return the model input width implied by the current feature schema."""
+    return 2 * TEAM_SIZE * len(STAT_COLUMNS)
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    out: np.ndarray = np.maximum(x, 0.0)
+    return out
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # tanh form avoids exp overflow for large negative logits
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _linear(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+_ACTIVATIONS = {"linear": _linear, "relu": _relu, "sigmoid": _sigmoid}
+
+
+@dataclass(frozen=True)
+class DenseLayer:
+    """One fully connected layer: ``activation(x @ kernel + bias)``."""
+
+    kernel: np.ndarray
+    bias: np.ndarray
+    activation: str
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A validated, loaded model bundle."""
+
+    version: str
+    content_hash: str
+    stat_columns: tuple[str, ...]
+    team_size: int
+    layers: tuple[DenseLayer, ...]
+    metrics: dict[str, float] = field(default_factory=dict)
+    teacher: str | None = None
+    path: Path | None = None
+
+    @property
+    def input_dim(self) -> int:
+        """Number of input features the bundle expects."""
+        return int(self.layers[0].kernel.shape[0])
+
+    @property
+    def flops(self) -> int:
+        """Multiply-add FLOPs for one prediction."""
+        return sum(2 * layer.kernel.size for layer in self.layers)
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Return the home-win probability for each row of ``features``.
+
+        Args:
+            features: Array of shape (N, input_dim)
+
+        Returns:
+            Float32 array of shape (N,)
+
+        Raises:
+            ValueError: If the feature width does not match the bundle
+        """
+        x = np.asarray(features, dtype=np.float32)
+        if x.ndim != 2 or x.shape[1] != self.input_dim:
+            raise ValueError(
+                f"Expected input shape (N, {self.input_dim}), got {x.shape}"
+            )
+        for layer in self.layers:
+            x = _ACTIVATIONS[layer.activation](x @ layer.kernel + layer.bias)
+        return x[:, 0]
+
+
+def _validate_layers(layers: tuple[DenseLayer, ...], input_dim: int) -> None:
+    if not layers:
+        raise ModelLoadError("Bundle has no layers")
+
+    width = input_dim
+    for i, layer in enumerate(layers):
+        if layer.activation not in SUPPORTED_ACTIVATIONS:
+            raise ModelLoadError(
+                f"Layer {i} has unsupported activation {layer.activation!r}"
+            )
+        if layer.kernel.ndim != 2 or layer.kernel.shape[0] != width:
+            raise ModelLoadError(
+                f"Layer {i} kernel has shape {layer.kernel.shape}, "
+                f"expected ({width}, units)"
+            )
+        if layer.bias.shape != (layer.kernel.shape[1],):
+            raise ModelLoadError(
+                f"Layer {i} bias has shape {layer.bias.shape}, "
+                f"expected ({layer.kernel.shape[1]},)"
+            )
+        width = layer.kernel.shape[1]
+
+    if width != 1:
+        raise ModelLoadError(f"Bundle output width is {width}, expected 1")
+
+
+def _validate_schema(manifest: dict[str, Any]) -> None:
+    stat_columns = list(manifest.get("stat_columns", []))
+    team_size = manifest.get("team_size")
+    if stat_columns != list(STAT_COLUMNS):
+        raise BundleSchemaError(
+            f"Bundle feature order {stat_columns} does not match "
+            f"STAT_COLUMNS {list(STAT_COLUMNS)}"
+        )
+    if team_size != TEAM_SIZE:
+        raise BundleSchemaError(
+            f"Bundle team size {team_size} does not match TEAM_SIZE {TEAM_SIZE}"
+        )
+
+
+def read_manifest(bundle_path: str | Path = DEFAULT_BUNDLE_PATH) -> dict[str, Any]:
+    """Read a bundle manifest without loading weights.
+
+    Args:
+        bundle_path: Bundle directory
+
+    Returns:
+        Parsed manifest
+
+    Raises:
+        ModelLoadError: If the manifest is missing or unreadable
+    """
+    manifest_path = Path(bundle_path) / MANIFEST_NAME
+    if not manifest_path.exists():
+        logger.error("Model bundle not found: %s", manifest_path)
+        raise ModelLoadError(f"Model bundle not found: {manifest_path}")
+    try:
+        manifest: dict[str, Any] = json.loads(manifest_path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        raise ModelLoadError(f"Could not read bundle manifest: {e}") from e
+    return manifest
+
+
+def load_bundle(bundle_path: str | Path = DEFAULT_BUNDLE_PATH) -> ModelBundle:
+    """Load and validate a model bundle.
+
+    The feature schema is checked before the weights are read, and the
+    weights are checked against the manifest's SHA-256 before use.
+
+    Args:
+        bundle_path: Bundle directory
+
+    Returns:
+        Loaded ModelBundle
+
+    Raises:
+        BundleSchemaError: If the feature schema does not match the app
+        ModelLoadError: If the bundle is missing, corrupt or malformed
+    """
+    path = Path(bundle_path)
+    with MODEL_LOAD_SECONDS.time():
+        try:
+            bundle = _read_bundle(path)
+        except ModelLoadError:
+            MODEL_LOAD_FAILURES.inc()
+            raise
+    MODEL_LOADS.inc()
+    logger.info("Loaded model bundle %s from %s", bundle.version, path)
+    return bundle
+
+
+def _read_bundle(path: Path) -> ModelBundle:
+    manifest = read_manifest(path)
+
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ModelLoadError(
+            f"Unsupported bundle format {manifest.get('format')!r}, "
+            f"expected {BUNDLE_FORMAT}"
+        )
+    _validate_schema(manifest)
+
+    weights_path = path / manifest["weights"]
+    try:
+        payload = weights_path.read_bytes()
+    except OSError as e:
+        raise ModelLoadError(f"Could not read bundle weights: {e}") from e
+
+    content_hash = hashlib.sha256(payload).hexdigest()
+    if content_hash != manifest["sha256"]:
+        raise ModelLoadError(
+            f"Checksum mismatch for {weights_path}: "
+            f"expected {manifest['sha256']}, got {content_hash}"
+        )
+
+    with np.load(io.BytesIO(payload), allow_pickle=False) as arrays:
+        layers = tuple(
+            DenseLayer(
+                kernel=arrays[f"kernel_{i}"].astype(np.float32),
+                bias=arrays[f"bias_{i}"].astype(np.float32),
+                activation=activation,
+            )
+            for i, activation in enumerate(manifest["activations"])
+        )
+    _validate_layers(layers, expected_input_dim())
+
+    return ModelBundle(
+        version=manifest["version"],
+        content_hash=content_hash,
+        stat_columns=tuple(manifest["stat_columns"]),
+        team_size=int(manifest["team_size"]),
+        layers=layers,
+        metrics=dict(manifest.get("metrics", {})),
+        teacher=manifest.get("teacher"),
+        path=path,
+    )
+
+
+def save_bundle(
+    bundle_path: str | Path,
+    layers: list[tuple[np.ndarray, np.ndarray, str]],
+    metrics: dict[str, float] | None = None,
+    teacher: str | None = None,
+) -> ModelBundle:
+    """Write a model bundle, publishing it atomically via the manifest.
+
+    Weights are written to a content-addressed file first; replacing the
+    manifest is the commit point, so readers never see a manifest that
+    refers to partially written weights.
+
+    Args:
+        bundle_path: Bundle directory (created if missing)
+        layers: (kernel, bias, activation) for each dense layer, input first
+        metrics: Training/validation metrics to record
+        teacher: Version of the bundle this one was distilled from, if any
+
+    Returns:
+        The bundle as it will be loaded
+
+    Raises:
+        ModelLoadError: If the layers do not form a valid model
+    """
+    path = Path(bundle_path)
+    dense = tuple(
+        DenseLayer(
+            kernel=np.asarray(kernel, dtype=np.float32),
+            bias=np.asarray(bias, dtype=np.float32),
+            activation=activation,
+        )
+        for kernel, bias, activation in layers
+    )
+    _validate_layers(dense, expected_input_dim())
+
+    buffer = io.BytesIO()
+    arrays: dict[str, Any] = {}
+    for i, layer in enumerate(dense):
+        arrays[f"kernel_{i}"] = layer.kernel
+        arrays[f"bias_{i}"] = layer.bias
+    np.savez(buffer, **arrays)
+    payload = buffer.getvalue()
+    content_hash = hashlib.sha256(payload).hexdigest()
+
+    timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    version = f"{timestamp}-{content_hash[:8]}"
+    weights_name = f"weights-{content_hash[:16]}.npz"
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "stat_columns": list(STAT_COLUMNS),
+        "team_size": TEAM_SIZE,
+        "input_dim": expected_input_dim(),
+        "activations": [layer.activation for layer in dense],
+        "weights": weights_name,
+        "sha256": content_hash,
+        "metrics": dict(metrics or {}),
+        "teacher": teacher,
+    }
+
+    path.mkdir(parents=True, exist_ok=True)
+    (path / weights_name).write_bytes(payload)
+    staging = path / f"{MANIFEST_NAME}.tmp"
+    staging.write_text(json.dumps(manifest, indent=2))
+    staging.replace(path / MANIFEST_NAME)
+
+    for stale in path.glob("weights-*.npz"):
+        if stale.name != weights_name:
+            stale.unlink()
+
+    logger.info("Saved model bundle %s to %s", version, path)
+    return ModelBundle(
+        version=version,
+        content_hash=content_hash,
+        stat_columns=tuple(STAT_COLUMNS),
+        team_size=TEAM_SIZE,
+        layers=dense,
+        metrics=dict(metrics or {}),
+        teacher=teacher,
+        path=path,
+    )
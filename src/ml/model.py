@@ -1,27 +1,181 @@
 """Machine learning model loading and prediction."""
 
 import logging
+import threading
+from collections.abc import Mapping, Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
-from tensorflow.keras.models import Model, load_model
 
 from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.ml.bundle import (
+    DEFAULT_BUNDLE_PATH,
+    STUDENT_BUNDLE_PATH,
+    ModelBundle,
+    ModelLoadError,
+    load_bundle,
+    read_manifest,
+)
+from src.telemetry.metrics import (
+    PREDICTION_BATCH_SIZE,
+    PREDICTION_SECONDS,
+    PREDICTIONS,
+)
+from src.telemetry.timing import timed
+
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Model
 
 logger = logging.getLogger("streamlit_nba")
 
 # Default model path relative to the project root
 DEFAULT_MODEL_PATH = Path(__file__).resolve().parent.parent.parent / "winner.keras"
 
+# "teacher" is the full model; "student" is its distilled, much cheaper copy,
+# which scripts/distill_model.py only writes once it agrees with the teacher
+# on 99% of held-out games. None has passed yet, so none is shipped.
+ModelVariant = Literal["teacher", "student"]
 
-class ModelLoadError(Exception):
-    """Raised when model loading fails."""
+# One team's (players, stats) matrix, a batch of them, or nested lists
+TeamStats = np.ndarray | Sequence[Sequence[float]]
+VARIANT_PATHS: dict[str, Path] = {
+    "teacher": DEFAULT_BUNDLE_PATH,
+    "student": STUDENT_BUNDLE_PATH,
+}
 
-    pass
 
+class _BundleSlot:
+    """Holder for the loaded bundles; rebinding ``bundles`` is atomic."""
 
-def get_winner_model(model_path: str | Path = DEFAULT_MODEL_PATH) -> Model:
-    """Load the winner prediction model.
+    __slots__ = ("bundles",)
+
+    def __init__(self) -> None:
+        self.bundles: Mapping[Path, ModelBundle] = {}
+
+
+_bundle_slot = _BundleSlot()
+_bundle_lock = threading.Lock()
+
+
+def get_model_bundle(bundle_path: str | Path = DEFAULT_BUNDLE_PATH) -> ModelBundle:
+    """Return the validated winner prediction bundle used for serving.
+
+    Each bundle is loaded once per process; later calls return the same
+    object without touching the disk until ``reload_model_bundle`` swaps in
+    a new one.
+
+    Args:
+        bundle_path: Path to the bundle directory
+
+    Returns:
+        Loaded ModelBundle
+
+    Raises:
+        ModelLoadError: If the bundle is missing, corrupt or has the wrong schema
+    """
+    path = Path(bundle_path)
+    bundle = _bundle_slot.bundles.get(path)
+    if bundle is not None:
+        return bundle
+
+    with _bundle_lock:
+        bundle = _bundle_slot.bundles.get(path)
+        if bundle is None:
+            bundle = load_bundle(path)
+            _bundle_slot.bundles = {**_bundle_slot.bundles, path: bundle}
+        return bundle
+
+
+def reload_model_bundle(bundle_path: str | Path = DEFAULT_BUNDLE_PATH) -> ModelBundle:
+    """Load a bundle from disk and publish it for later predictions.
+
+    The new bundle is fully validated before the swap, so if loading fails
+    the bundle already being served stays in place.
+
+    Args:
+        bundle_path: Path to the bundle directory
+
+    Returns:
+        The newly published ModelBundle
+
+    Raises:
+        ModelLoadError: If the bundle is missing, corrupt or has the wrong schema
+    """
+    path = Path(bundle_path)
+    bundle = load_bundle(path)
+    with _bundle_lock:
+        _bundle_slot.bundles = {**_bundle_slot.bundles, path: bundle}
+    return bundle
+
+
+def reset_model_bundles() -> None:
+    """Forget the loaded bundles so the next access reads them again."""
+    with _bundle_lock:
+        _bundle_slot.bundles = {}
+
+
+def get_variant_bundle(variant: ModelVariant = "teacher") -> ModelBundle:
+    """Load the serving bundle for a model variant.
+
+    Args:
+        variant: "teacher" for the full model, "student" for the distilled one
+
+    Returns:
+        Loaded ModelBundle
+
+    Raises:
+        ModelLoadError: If the bundle is missing, corrupt or has the wrong schema
+    """
+    return get_model_bundle(VARIANT_PATHS[variant])
+
+
+def get_model_version(bundle_path: str | Path = DEFAULT_BUNDLE_PATH) -> str:
+    """Return the serving bundle's version without loading its weights.
+
+    Suitable as a cache key: it changes whenever the bundle content changes.
+
+    Args:
+        bundle_path: Path to the bundle directory
+
+    Returns:
+        Bundle version string
+
+    Raises:
+        ModelLoadError: If the manifest cannot be read
+    """
+    return str(read_manifest(bundle_path)["version"])
+
+
+def _score(bundle: ModelBundle, features: np.ndarray) -> np.ndarray:
+    with PREDICTION_SECONDS.time():
+        probabilities = bundle.predict_proba(features)
+    PREDICTIONS.inc(len(probabilities))
+    PREDICTION_BATCH_SIZE.observe(len(probabilities))
+    return probabilities
+
+
+def load_model(path: str) -> "Model":
+    """Load a Keras model file, importing TensorFlow on first use.
+
+    TensorFlow takes seconds to import and serving never needs it, so it is
+    kept out of this module's import.
+
+    Args:
+        path: Path to the Keras model file
+
+    Returns:
+        Loaded Keras model
+    """
+    from tensorflow.keras.models import load_model as load_keras_model
+
+    return load_keras_model(path)
+
+
+def get_winner_model(model_path: str | Path = DEFAULT_MODEL_PATH) -> "Model":
+    """Load the Keras training checkpoint.
+
+    Serving uses get_model_bundle; this is kept for training and export.
 
     Args:
         model_path: Path to the Keras model file
@@ -47,12 +201,36 @@ def get_winner_model(model_path: str | Path = DEFAULT_MODEL_PATH) -> Model:
         raise ModelLoadError(f"Failed to load model: {e}") from e
 
 
-def predict_winner(combined_stats: np.ndarray) -> tuple[float, int]:
+def predict_win_probabilities(
+    combined_stats: np.ndarray, variant: ModelVariant = "teacher"
+) -> np.ndarray:
+    """Predict home-win probabilities for a batch of matchups.
+
+    Args:
+        combined_stats: Array of shape (N, 100), one matchup per row
+        variant: Which model to use; "student" trades a little agreement
+            with the teacher for far fewer FLOPs per prediction
+
+    Returns:
+        Float32 array of shape (N,)
+
+    Raises:
+        ModelLoadError: If the model cannot be loaded
+        ValueError: If input shape is invalid
+    """
+    return _score(get_variant_bundle(variant), combined_stats)
+
+
+@timed()
+def predict_winner(
+    combined_stats: np.ndarray, variant: ModelVariant = "teacher"
+) -> tuple[float, int]:
     """Predict game winner from combined team stats.
 
     Args:
         combined_stats: Numpy array of shape (1, 100) containing
             home team stats followed by away team stats
+        variant: Which model to use ("teacher" or "student")
 
     Returns:
         Tuple of (probability, prediction) where:
@@ -66,66 +244,99 @@ def predict_winner(combined_stats: np.ndarray) -> tuple[float, int]:
     if combined_stats.shape != (1, 100):
         raise ValueError(f"Expected input shape (1, 100), got {combined_stats.shape}")
 
-    model = get_winner_model()
-    sigmoid_output = model.predict(combined_stats, verbose=0)
-    probability = float(sigmoid_output[0][0])
+    bundle = get_model_bundle(VARIANT_PATHS[variant])
+    probability = float(_score(bundle, combined_stats)[0])
     prediction = int(np.round(probability))
 
     logger.info("Prediction: probability=%.4f, winner=%d", probability, prediction)
     return probability, prediction
 
 
+def _team_array(stats: TeamStats, side: str) -> np.ndarray:
+    """Convert one side's stats to float32 (..., players, stats) and check it."""
+    expected_stats = len(STAT_COLUMNS)
+    try:
+        array = np.asarray(stats, dtype=np.float32)
+    except ValueError:
+        # Ragged nested lists; find the offending player for the message
+        players = list(stats)
+        if len(players) != TEAM_SIZE:
+            raise ValueError(
+                f"Expected {TEAM_SIZE} players for {side} team, got {len(players)}"
+            ) from None
+        for i, player in enumerate(players):
+            if len(player) != expected_stats:
+                raise ValueError(
+                    f"{side.capitalize()} player {i} has {len(player)} stats, "
+                    f"expected {expected_stats}"
+                ) from None
+        raise
+
+    if array.ndim not in (2, 3):
+        raise ValueError(
+            f"Expected {side} stats of shape ({TEAM_SIZE}, {expected_stats}) or "
+            f"(N, {TEAM_SIZE}, {expected_stats}), got {array.shape}"
+        )
+    if array.shape[-2] != TEAM_SIZE:
+        raise ValueError(
+            f"Expected {TEAM_SIZE} players for {side} team, got {array.shape[-2]}"
+        )
+    if array.shape[-1] != expected_stats:
+        raise ValueError(
+            f"{side.capitalize()} players have {array.shape[-1]} stats, "
+            f"expected {expected_stats}"
+        )
+    return array
+
+
+@timed()
 def analyze_team_stats(
-    home_stats: list[list[float]], away_stats: list[list[float]]
+    home_stats: TeamStats, away_stats: TeamStats | None = None
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Prepare team stats for model prediction.
 
-    Flattens per-player stats into team-level arrays suitable for
-    the prediction model.
+    Accepts one game as two (5, 10) stat matrices, a batch of games as two
+    (N, 5, 10) arrays, or a batch as a single (N, 2, 5, 10) tensor holding
+    home then away. Rows of ``PlayerStore.stats`` can be passed directly;
+    nested lists are still accepted. Shapes are checked without looping
+    over players.
 
     Args:
-        home_stats: List of stat lists for each home player
-        away_stats: List of stat lists for each away player
+        home_stats: Home players' stats, or the (N, 2, 5, 10) game tensor
+        away_stats: Away players' stats; omit when passing a game tensor
 
     Returns:
-        Tuple of (home_array, away_array, combined_array) where:
-            - home_array: Shape (1, 50) - home team flattened stats
-            - away_array: Shape (1, 50) - away team flattened stats
-            - combined_array: Shape (1, 100) - both teams for prediction
-    """
-    expected_stats = len(STAT_COLUMNS)
-
-    if len(home_stats) != TEAM_SIZE:
-        raise ValueError(
-            f"Expected {TEAM_SIZE} players for home team, got {len(home_stats)}"
-        )
-    if len(away_stats) != TEAM_SIZE:
-        raise ValueError(
-            f"Expected {TEAM_SIZE} players for away team, got {len(away_stats)}"
-        )
+        Float32 tuple of (home_array, away_array, combined_array) with shapes
+        (N, 50), (N, 50) and (N, 100); N is 1 for a single game. The home and
+        away arrays are views of the input when it is already a contiguous
+        float32 array, and for a game tensor so is the combined array.
 
-    for i, player in enumerate(home_stats):
-        if len(player) != expected_stats:
-            raise ValueError(
-                f"Home player {i} has {len(player)} stats, expected {expected_stats}"
-            )
-    for i, player in enumerate(away_stats):
-        if len(player) != expected_stats:
+    Raises:
+        ValueError: If a team does not have 5 players with 10 stats each
+    """
+    if away_stats is None:
+        games = np.asarray(home_stats, dtype=np.float32)
+        expected = (2, TEAM_SIZE, len(STAT_COLUMNS))
+        if games.ndim != 4 or games.shape[1:] != expected:
             raise ValueError(
-                f"Away player {i} has {len(player)} stats, expected {expected_stats}"
+                f"Expected a game tensor of shape (N, {', '.join(map(str, expected))}), "
+                f"got {games.shape}"
             )
+        n = games.shape[0]
+        return (
+            games[:, 0].reshape(n, -1),
+            games[:, 1].reshape(n, -1),
+            games.reshape(n, -1),
+        )
 
-    home_flat: list[float] = []
-    away_flat: list[float] = []
-
-    for player_stats in home_stats:
-        home_flat.extend(player_stats)
-
-    for player_stats in away_stats:
-        away_flat.extend(player_stats)
-
-    home_array = np.array(home_flat).reshape(1, -1)
-    away_array = np.array(away_flat).reshape(1, -1)
-    combined_array = np.array(home_flat + away_flat).reshape(1, -1)
+    home = _team_array(home_stats, "home")
+    away = _team_array(away_stats, "away")
+    if home.shape != away.shape:
+        raise ValueError(
+            f"Home and away stats differ in shape: {home.shape} vs {away.shape}"
+        )
 
+    home_array = home.reshape(-1, home.shape[-2] * home.shape[-1])
+    away_array = away.reshape(home_array.shape)
+    combined_array = np.concatenate((home_array, away_array), axis=1)
     return home_array, away_array, combined_array
@@ -0,0 +1,19 @@
+"""Possession-level game simulation."""
+
+from src.simulation.engine import (
+    BOX_COLUMNS,
+    RATE_COLUMNS,
+    SimulatedGames,
+    player_rates,
+    simulate_games,
+    store_rates,
+)
+
+__all__ = [
+    "BOX_COLUMNS",
+    "RATE_COLUMNS",
+    "SimulatedGames",
+    "player_rates",
+    "simulate_games",
+    "store_rates",
+]
@@ -0,0 +1,471 @@
+"""Vectorized possession-level game simulation.
+
+Every game is played as ``SIM_POSSESSIONS_PER_QUARTER`` possessions per team
+per quarter. Each possession is ended by one player, chosen in proportion to
+their per-game usage (field-goal attempts, free-throw trips and turnovers),
+and ends in a turnover, a free-throw trip or a two- or three-point attempt
+at that player's shooting percentages. Misses are rebounded, made shots
+assisted, turnovers stolen and misses blocked by players chosen in
+proportion to the matching per-game rate, so every box score line adds up
+to its team's score.
+
+The model's home-win probability tilts both teams' shooting percentages,
+and each requested game is played ``SIM_CANDIDATES`` times in the same
+batch; the first candidate whose winner matches the prediction is kept. In
+the rare case none does, the closest candidate is finished with late free
+throws by the winning side's most frequent free-throw shooter, so the
+result is always consistent without a rejection loop.
+
+All possessions of all games are drawn as flat NumPy arrays and tallied
+with ``np.bincount``, so thousands of full games simulate per second.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    SIM_CANDIDATES,
+    SIM_MAX_EDGE,
+    SIM_POSSESSIONS_PER_QUARTER,
+    TEAM_SIZE,
+)
+from src.database.store import PlayerStore
+
+logger = logging.getLogger("streamlit_nba")
+
+QUARTERS = 4
+
+# Per-player inputs: per-game counts followed by shooting percentages
+RATE_COLUMNS: tuple[str, ...] = (
+    "FGA",
+    "FG3A",
+    "FTA",
+    "OREB",
+    "DREB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "FG2_PCT",
+    "FG3_PCT",
+    "FT_PCT",
+)
+
+# Per-player box score line
+BOX_COLUMNS: tuple[str, ...] = (
+    "PTS",
+    "FGM",
+    "FGA",
+    "FG3M",
+    "FG3A",
+    "FTM",
+    "FTA",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+)
+
+SCOREBOARD_COLUMNS = ["1", "2", "3", "4", "Final"]
+SCOREBOARD_INDEX = ["Home Team", "Away Team"]
+
+# League-average shooting used to shrink small samples (e.g. 1-for-1 from
+# three), weighted as this many attempts
+LEAGUE_FG2_PCT = 0.48
+LEAGUE_FG3_PCT = 0.35
+LEAGUE_FT_PCT = 0.75
+PRIOR_ATTEMPTS = 50.0
+
+# Free throws per possession-ending trip (and-ones, technicals, three-shot
+# fouls), the usual possession-estimate factor
+FT_TRIP_FACTOR = 0.44
+
+# Fallbacks for teams whose players have no recorded rate
+DEFAULT_OREB_RATE = 0.25
+
+# Keeps every weight positive so a player with no rate can still be chosen
+WEIGHT_FLOOR = 1e-3
+MAX_MAKE_PCT = 0.95
+
+
+@dataclass(frozen=True)
+class SimulatedGames:
+    """Results of a batch of simulated games.
+
+    Attributes:
+        quarter_scores: Points per quarter, shape (games, 2, 4), home first
+        box: Player box score lines, shape (games, 2, 5, len(BOX_COLUMNS)),
+            players in roster order
+    """
+
+    quarter_scores: np.ndarray
+    box: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of games."""
+        return len(self.quarter_scores)
+
+    @property
+    def final_scores(self) -> np.ndarray:
+        """Final (home, away) scores, shape (games, 2)."""
+        final: np.ndarray = self.quarter_scores.sum(axis=-1)
+        return final
+
+    @property
+    def home_won(self) -> np.ndarray:
+        """Whether the home team won each game, shape (games,)."""
+        final = self.final_scores
+        return final[:, 0] > final[:, 1]
+
+    def scoreboard(self, game: int = 0) -> pd.DataFrame:
+        """Quarter-by-quarter scoreboard for one game.
+
+        Args:
+            game: Game index
+
+        Returns:
+            DataFrame with quarter and final columns, home row first
+        """
+        quarters = self.quarter_scores[game]
+        return pd.DataFrame(
+            np.column_stack([quarters, quarters.sum(axis=1)]),
+            columns=SCOREBOARD_COLUMNS,
+            index=SCOREBOARD_INDEX,
+        )
+
+    def box_score(self, game: int, side: int, names: list[str]) -> pd.DataFrame:
+        """Player box score lines for one team.
+
+        Args:
+            game: Game index
+            side: 0 for the home team, 1 for the away team
+            names: Player names in roster order
+
+        Returns:
+            DataFrame indexed by player name with BOX_COLUMNS
+        """
+        return pd.DataFrame(
+            self.box[game, side], columns=list(BOX_COLUMNS), index=names
+        )
+
+
+def _shrunk_pct(made: np.ndarray, attempts: np.ndarray, prior: float) -> np.ndarray:
+    return (made + PRIOR_ATTEMPTS * prior) / (attempts + PRIOR_ATTEMPTS)
+
+
+def player_rates(frame: pd.DataFrame) -> np.ndarray:
+    """Derive simulation inputs from season totals.
+
+    Args:
+        frame: Player DataFrame with box score total columns and GP
+
+    Returns:
+        Read-only float64 array of shape (players, len(RATE_COLUMNS))
+    """
+    columns = ["GP", "FGA", "FGM", "FG3A", "FG3M", "FTA", "FTM"]
+    columns += ["OREB", "DREB", "AST", "STL", "BLK", "TOV"]
+    totals = {
+        col: np.nan_to_num(frame[col].to_numpy(dtype=np.float64)).clip(min=0)
+        for col in columns
+    }
+    games = np.maximum(totals["GP"], 1.0)
+    fg2a = np.maximum(totals["FGA"] - totals["FG3A"], 0.0)
+    fg2m = np.minimum(np.maximum(totals["FGM"] - totals["FG3M"], 0.0), fg2a)
+
+    per_game = [totals[col] / games for col in RATE_COLUMNS[:9]]
+    rates = np.column_stack(
+        [
+            *per_game,
+            _shrunk_pct(fg2m, fg2a, LEAGUE_FG2_PCT),
+            _shrunk_pct(totals["FG3M"], totals["FG3A"], LEAGUE_FG3_PCT),
+            _shrunk_pct(totals["FTM"], totals["FTA"], LEAGUE_FT_PCT),
+        ]
+    )
+    rates.flags.writeable = False
+    return rates
+
+
+@lru_cache(maxsize=2)
+def store_rates(store: PlayerStore) -> np.ndarray:
+    """Simulation inputs for every player in a store, computed once per store.
+
+    Args:
+        store: Player store
+
+    Returns:
+        Read-only array of shape (len(store), len(RATE_COLUMNS)), indexed by
+        player row id
+    """
+    return player_rates(store.df)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, default: float) -> np.ndarray:
+    out = np.full(np.broadcast(num, den).shape, default)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _cumulative(weights: np.ndarray) -> np.ndarray:
+    """Normalized cumulative weights per row, for ``_choose``.
+
+    The last column is always 1 and never compared, so it is dropped.
+    """
+    cum = np.cumsum(weights + WEIGHT_FLOOR, axis=1)
+    return (cum[:, :-1] / cum[:, -1:]).astype(np.float32)
+
+
+def _choose(cum: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Pick one column per row of normalized cumulative weights using ``u``."""
+    picked: np.ndarray = (cum < u[:, None]).sum(axis=1)
+    return picked
+
+
+@dataclass(frozen=True)
+class _Teams:
+    """Per-team lookup tables for a batch of games.
+
+    Team rows are [game 0 home, game 0 away, game 1 home, ...], so a team's
+    opponent is ``row ^ 1``. Player tables are (teams, 5, ...) and team
+    rates are (teams,).
+    """
+
+    usage: np.ndarray
+    outcomes: np.ndarray
+    assists: np.ndarray
+    boards: np.ndarray
+    steals: np.ndarray
+    blocks: np.ndarray
+    fta: np.ndarray
+    assist_rate: np.ndarray
+    oreb_rate: np.ndarray
+    steal_rate: np.ndarray
+    block_rate: np.ndarray
+
+
+def _prepare(rates: np.ndarray, probability: np.ndarray) -> _Teams:
+    """Build lookup tables, tilting shooting by the home-win probability."""
+    teams = rates.reshape(-1, TEAM_SIZE, len(RATE_COLUMNS))
+    fga, fg3a, fta, oreb, dreb, ast, stl, blk, tov, pct2, pct3, pct_ft = np.moveaxis(
+        teams, -1, 0
+    )
+    edge = SIM_MAX_EDGE * (2.0 * probability - 1.0)
+    tilt = np.column_stack([1.0 + edge, 1.0 - edge]).reshape(-1, 1)
+    pct2 = np.clip(pct2 * tilt, 0.0, MAX_MAKE_PCT)
+    pct3 = np.clip(pct3 * tilt, 0.0, MAX_MAKE_PCT)
+
+    trips = FT_TRIP_FACTOR * fta
+    usage = fga + trips + tov
+    p_tov = _ratio(tov, usage, 0.0)
+    p_trip = _ratio(trips, usage, 0.0)
+    # Per player: cumulative turnover / trip thresholds, three-point share
+    # and the three make percentages, gathered once per possession
+    outcomes = np.stack(
+        [p_tov, p_tov + p_trip, _ratio(fg3a, fga, 0.0), pct2, pct3, pct_ft], axis=-1
+    ).reshape(-1, 6)
+
+    team_fgm = ((fga - fg3a) * pct2 + fg3a * pct3).sum(axis=1)
+    opponent = np.arange(len(teams)) ^ 1
+    team_oreb = oreb.sum(axis=1)
+    return _Teams(
+        usage=_cumulative(usage),
+        outcomes=outcomes,
+        assists=ast,
+        boards=np.stack([_cumulative(dreb), _cumulative(oreb)]),
+        steals=_cumulative(stl),
+        blocks=_cumulative(blk),
+        fta=fta,
+        assist_rate=np.clip(_ratio(ast.sum(axis=1), team_fgm, 0.0), 0.0, 1.0),
+        oreb_rate=_ratio(
+            team_oreb, team_oreb + dreb.sum(axis=1)[opponent], DEFAULT_OREB_RATE
+        ),
+        steal_rate=np.clip(
+            _ratio(stl.sum(axis=1)[opponent], tov.sum(axis=1), 0.0), 0.0, 1.0
+        ),
+        block_rate=np.clip(
+            _ratio(blk.sum(axis=1)[opponent], fga.sum(axis=1) - team_fgm, 0.0),
+            0.0,
+            1.0,
+        ),
+    )
+
+
+def _play(
+    teams: _Teams,
+    candidates: int,
+    possessions: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Play ``candidates`` games per matchup.
+
+    Returns:
+        Tuple of quarter scores (games, candidates, 2, 4) and box score
+        lines (games, candidates, 2, 5, len(BOX_COLUMNS))
+    """
+    n = len(teams.fta) // 2
+    # One entry per possession of every candidate game, flattened from
+    # (games, candidates, side, quarter, possession)
+    shape = (n, candidates, 2, QUARTERS, possessions)
+    game_ix = np.arange(n).reshape(n, 1, 1, 1, 1)
+    cand_ix = np.arange(candidates).reshape(1, candidates, 1, 1, 1)
+    side_ix = np.arange(2).reshape(1, 1, 2, 1, 1)
+    row = np.broadcast_to(game_ix * 2 + side_ix, shape).ravel()
+    slot = np.broadcast_to(
+        (game_ix * candidates + cand_ix) * 2 + side_ix, shape
+    ).ravel()
+    total = row.size
+
+    def draw(size: int) -> np.ndarray:
+        return rng.random(size, dtype=np.float32)
+
+    # Uniforms: ball handler, outcome, three or two, make, and whether the
+    # make is assisted, the turnover a steal or the miss blocked
+    draws = rng.random((5, total), dtype=np.float32)
+    player = _choose(teams.usage[row], draws[0])
+    odds = teams.outcomes[row * TEAM_SIZE + player].T
+    is_tov = draws[1] < odds[0]
+    is_trip = ~is_tov & (draws[1] < odds[1])
+    is_shot = ~(is_tov | is_trip)
+    is_three = is_shot & (draws[2] < odds[2])
+    made = is_shot & (draws[3] < np.where(is_three, odds[4], odds[3]))
+    missed = is_shot & ~made
+    ft_made = np.zeros(total, dtype=np.int64)
+    ft_pct = odds[5][is_trip]
+    ft_made[is_trip] = (rng.random((2, len(ft_pct)), dtype=np.float32) < ft_pct).sum(0)
+    points = made * (2 + is_three) + ft_made
+
+    # Assists go to a teammate of the shooter
+    assisted = made & (draws[4] < teams.assist_rate[row])
+    weights = teams.assists[row[assisted]] + WEIGHT_FLOOR
+    weights[np.arange(len(weights)), player[assisted]] = 0.0
+    cum = np.cumsum(weights, axis=1)
+    assister = _choose(cum[:, :-1] / cum[:, -1:], draw(len(cum)))
+
+    # Misses are rebounded by either side; steals and blocks by the defense
+    missed_rows = row[missed]
+    offensive = draw(len(missed_rows)) < teams.oreb_rate[missed_rows]
+    board_rows = np.where(offensive, missed_rows, missed_rows ^ 1)
+    rebounder = _choose(
+        teams.boards[offensive.view(np.int8), board_rows], draw(len(board_rows))
+    )
+    board_slots = np.where(offensive, slot[missed], slot[missed] ^ 1)
+
+    stolen = is_tov & (draws[4] < teams.steal_rate[row])
+    stealer = _choose(teams.steals[row[stolen] ^ 1], draw(int(stolen.sum())))
+    blocked = missed & (draws[4] < teams.block_rate[row])
+    blocker = _choose(teams.blocks[row[blocked] ^ 1], draw(int(blocked.sum())))
+
+    size = n * candidates * 2 * TEAM_SIZE
+    line = slot * TEAM_SIZE + player
+
+    def tally(index: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(index, weights, minlength=size)
+
+    box = np.column_stack(
+        [
+            tally(line, points),
+            tally(line[made]),
+            tally(line[is_shot]),
+            tally(line[made & is_three]),
+            tally(line[is_three]),
+            tally(line, ft_made),
+            2 * tally(line[is_trip]),
+            tally(board_slots * TEAM_SIZE + rebounder),
+            tally(line[assisted] + assister - player[assisted]),
+            tally((slot[stolen] ^ 1) * TEAM_SIZE + stealer),
+            tally((slot[blocked] ^ 1) * TEAM_SIZE + blocker),
+            tally(line[is_tov]),
+        ]
+    ).astype(np.int32)
+    quarters = points.reshape(shape).sum(axis=-1, dtype=np.int32)
+    return quarters, box.reshape(n, candidates, 2, TEAM_SIZE, len(BOX_COLUMNS))
+
+
+def simulate_games(
+    rates: np.ndarray,
+    home_win_probability: float | np.ndarray,
+    home_wins: bool | np.ndarray | None = None,
+    rng: np.random.Generator | None = None,
+    possessions: int = SIM_POSSESSIONS_PER_QUARTER,
+    candidates: int = SIM_CANDIDATES,
+) -> SimulatedGames:
+    """Simulate full games possession by possession.
+
+    Args:
+        rates: Player inputs from ``player_rates``, shape (2, 5, R) for one
+            game or (games, 2, 5, R), home team first
+        home_win_probability: Model probability per game (or one for all)
+        home_wins: Required winner per game; defaults to the predicted winner
+            (probability >= 0.5)
+        rng: Random generator; a fresh unseeded one if omitted
+        possessions: Possessions per team per quarter
+        candidates: Games played per requested game to match the winner
+
+    Returns:
+        SimulatedGames with one game per requested game
+
+    Raises:
+        ValueError: If rates has the wrong shape
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    if rates.ndim == 3:
+        rates = rates[None]
+    if rates.ndim != 4 or rates.shape[1:] != (2, TEAM_SIZE, len(RATE_COLUMNS)):
+        raise ValueError(
+            f"Expected rates of shape (games, 2, {TEAM_SIZE}, {len(RATE_COLUMNS)}),"
+            f" got {rates.shape}"
+        )
+    n = len(rates)
+    probability = np.broadcast_to(
+        np.asarray(home_win_probability, dtype=np.float64), (n,)
+    )
+    wins = (
+        probability >= 0.5
+        if home_wins is None
+        else np.broadcast_to(np.asarray(home_wins, dtype=bool), (n,))
+    )
+    rng = rng if rng is not None else np.random.default_rng()
+
+    teams = _prepare(rates, probability)
+    quarters, box = _play(teams, candidates, possessions, rng)
+
+    # Keep the first candidate with the required winner, else the closest
+    final = quarters.sum(axis=-1)
+    margin = np.where(wins[:, None], 1, -1) * (final[..., 0] - final[..., 1])
+    matches = margin > 0
+    chosen = np.where(
+        matches.any(axis=1), matches.argmax(axis=1), margin.argmax(axis=1)
+    )
+    games = np.arange(n)
+    quarters = quarters[games, chosen]
+    box = box[games, chosen]
+
+    short = games[~matches[games, chosen]]
+    if short.size:
+        _finish_with_free_throws(
+            quarters, box, teams.fta, short, wins, margin[short, chosen[short]]
+        )
+    return SimulatedGames(quarter_scores=quarters, box=box)
+
+
+def _finish_with_free_throws(
+    quarters: np.ndarray,
+    box: np.ndarray,
+    fta: np.ndarray,
+    games: np.ndarray,
+    wins: np.ndarray,
+    margin: np.ndarray,
+) -> None:
+    """Give the required winner enough late fourth-quarter free throws."""
+    logger.debug("Finishing %d simulated games with free throws", len(games))
+    side = np.where(wins[games], 0, 1)
+    shooter = fta.reshape(-1, 2, TEAM_SIZE)[games, side].argmax(axis=1)
+    # Two made free throws per trip, enough trips to win by one or two
+    extra = 2 * (-margin // 2 + 1)
+    quarters[games, side, QUARTERS - 1] += extra
+    for col in ("PTS", "FTM", "FTA"):
+        box[games, side, shooter, BOX_COLUMNS.index(col)] += extra
@@ -1,5 +1,23 @@
 """Session state management module."""
 
-from src.state.session import get_away_stats, get_home_team_df, init_session_state
+from src.state.session import (
+    get_away_stats,
+    get_away_team_df,
+    get_away_team_ids,
+    get_home_team_df,
+    get_home_team_ids,
+    init_session_state,
+    set_away_team_ids,
+    set_home_team_ids,
+)
 
-__all__ = ["get_away_stats", "get_home_team_df", "init_session_state"]
+__all__ = [
+    "get_away_stats",
+    "get_away_team_df",
+    "get_away_team_ids",
+    "get_home_team_df",
+    "get_home_team_ids",
+    "init_session_state",
+    "set_away_team_ids",
+    "set_home_team_ids",
+]
@@ -1,4 +1,15 @@
-"""Session state management for the Streamlit application."""
+"""Session state management for the Streamlit application.
+
+Rosters are kept in session state as tuples of player row ids into the
+shared player store; the accessors here resolve them to DataFrames on
+demand, so per-session memory stays a handful of integers.
+
+Row ids are positions in one store snapshot and mean nothing in another,
+so every roster is saved as ``(store version, ids)``. The accessors only
+hand out ids whose version matches the store in use. When the player data
+is hot reloaded, a roster is moved to the new ids by player name through
+the old snapshot. If that fails, it is cleared and the user is told.
+"""
 
 import logging
 from typing import cast
@@ -6,13 +17,22 @@ from typing import cast
 import pandas as pd
 import streamlit as st
 
-from src.config import DIFFICULTY_PRESETS
+from src.config import DIFFICULTY_PRESETS, PLAYER_COLUMNS
+from src.database.connection import DatabaseConnectionError
+from src.database.store import PlayerStore, get_player_store, remap_player_ids
+from src.telemetry.metrics import ROSTER_LOOKUP_SECONDS, ROSTER_LOOKUPS
 
 logger = logging.getLogger("streamlit_nba")
 
 # Default difficulty preset
 DEFAULT_DIFFICULTY = "Regular"
 
+PlayerIds = tuple[int, ...]
+# (store version, ids); the ids are only valid in that version's store
+Roster = tuple[str, PlayerIds]
+
+EMPTY_ROSTER: Roster = ("", ())
+
 
 def init_session_state() -> None:
     """Initialize all session state keys with safe defaults.
@@ -21,11 +41,9 @@ def init_session_state() -> None:
     all required state keys exist before access.
     """
     defaults = {
-        "home_team": [],
-        "away_team": [],
-        "away_team_df": pd.DataFrame(),
+        "home_team_ids": EMPTY_ROSTER,
+        "away_team_ids": EMPTY_ROSTER,
         "away_stats": list(DIFFICULTY_PRESETS[DEFAULT_DIFFICULTY]),
-        "home_team_df": pd.DataFrame(),
         "radio_index": 0,
     }
 
@@ -53,18 +71,203 @@ def get_away_stats() -> list[int]:
     return cast("list[int]", stats)
 
 
+def _is_roster(value: object) -> bool:
+    if not isinstance(value, tuple) or len(value) != 2:
+        return False
+    version, ids = value
+    return (
+        isinstance(version, str)
+        and isinstance(ids, tuple)
+        and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    )
+
+
+def _get_roster(key: str) -> Roster:
+    init_session_state()
+    roster = st.session_state.get(key)
+
+    if not _is_roster(roster):
+        logger.warning("Invalid %s in session, using empty team", key)
+        st.session_state[key] = EMPTY_ROSTER
+        return EMPTY_ROSTER
+
+    return cast("Roster", roster)
+
+
+def _get_team_ids(key: str) -> PlayerIds:
+    version, ids = _get_roster(key)
+    if not ids:
+        return ()
+
+    try:
+        store = get_player_store()
+    except DatabaseConnectionError as e:
+        logger.error("Could not resolve %s: %s", key, e)
+        return ()
+
+    if version != store.version:
+        return _carry_over(key, version, ids, store)
+
+    return ids
+
+
+def _carry_over(
+    key: str, version: str, ids: PlayerIds, store: PlayerStore
+) -> PlayerIds:
+    remapped = remap_player_ids(ids, version, store)
+    if remapped is None:
+        logger.warning(
+            "Could not move %s from player data %s to %s; using empty team",
+            key,
+            version,
+            store.version,
+        )
+        st.session_state[key] = EMPTY_ROSTER
+        st.warning(
+            "The player data was updated and some of your players could not be "
+            "found again, so that team was cleared."
+        )
+        return ()
+
+    logger.info("Moved %s from player data %s to %s", key, version, store.version)
+    st.session_state[key] = (store.version, remapped)
+    return remapped
+
+
+def _set_team_ids(
+    key: str, ids: list[int] | tuple[int, ...], version: str | None
+) -> None:
+    ids = tuple(int(i) for i in ids)
+    if not ids:
+        st.session_state[key] = EMPTY_ROSTER
+        return
+    if version is None:
+        try:
+            version = get_player_store().version
+        except DatabaseConnectionError as e:
+            logger.error("Could not save %s: %s", key, e)
+            st.session_state[key] = EMPTY_ROSTER
+            return
+    st.session_state[key] = (version, ids)
+
+
+def _resolve_team(key: str) -> pd.DataFrame:
+    ids = _get_team_ids(key)
+    if not ids:
+        return pd.DataFrame(columns=PLAYER_COLUMNS)
+
+    try:
+        store = get_player_store()
+    except DatabaseConnectionError as e:
+        logger.error("Could not resolve %s: %s", key, e)
+        return pd.DataFrame(columns=PLAYER_COLUMNS)
+
+    if not all(store.is_valid_id(i) for i in ids):
+        logger.warning("Stale player ids in %s, using empty team", key)
+        st.session_state[key] = EMPTY_ROSTER
+        return pd.DataFrame(columns=PLAYER_COLUMNS)
+
+    ROSTER_LOOKUPS.inc()
+    with ROSTER_LOOKUP_SECONDS.time():
+        return store.rows(ids)
+
+
+def get_home_team_ids() -> PlayerIds:
+    """Safely get the saved home team's player row ids.
+
+    Returns:
+        Tuple of row ids into the current store, or an empty tuple if not
+        set or saved against other player data
+    """
+    return _get_team_ids("home_team_ids")
+
+
+def set_home_team_ids(
+    ids: list[int] | tuple[int, ...], version: str | None = None
+) -> None:
+    """Save the home team as player row ids.
+
+    Args:
+        ids: Player row ids into the shared store
+        version: Version of the store the ids came from; defaults to the
+            current store
+    """
+    _set_team_ids("home_team_ids", ids, version)
+
+
+def get_away_team_ids() -> PlayerIds:
+    """Safely get the current away team's player row ids.
+
+    Returns:
+        Tuple of row ids into the current store, or an empty tuple if no
+        team is generated or it came from other player data
+    """
+    return _get_team_ids("away_team_ids")
+
+
+def set_away_team_ids(
+    ids: list[int] | tuple[int, ...], version: str | None = None
+) -> None:
+    """Save the away team as player row ids; an empty tuple clears it.
+
+    Args:
+        ids: Player row ids into the shared store
+        version: Version of the store the ids came from; defaults to the
+            current store
+    """
+    _set_team_ids("away_team_ids", ids, version)
+
+
 def get_home_team_df() -> pd.DataFrame:
-    """Safely get home team DataFrame from session state.
+    """Resolve the home team against the player store.
 
     Returns:
         DataFrame with home team player data, or empty DataFrame if not set
     """
-    init_session_state()
-    df = st.session_state.get("home_team_df")
+    return _resolve_team("home_team_ids")
+
+
+def get_away_team_df() -> pd.DataFrame:
+    """Resolve the away team against the player store.
+
+    Returns:
+        DataFrame with away team player data, or empty DataFrame if not set
+    """
+    return _resolve_team("away_team_ids")
+
+
+def sync_player_selection(key: str) -> str | None:
+    """Keep a widget's selected player ids pointing at the same players.
+
+    Call before the widget is created. The selection is tagged with the
+    store version it was made against, under ``{key}_version``; after a
+    reload it is moved to the new ids by name, or cleared if that fails.
+
+    Args:
+        key: Session state key of a widget holding player row ids
+
+    Returns:
+        Version of the store the selection is now valid for, or None if the
+        player data cannot be loaded
+    """
+    try:
+        store = get_player_store()
+    except DatabaseConnectionError as e:
+        logger.error("Could not check %s: %s", key, e)
+        return None
 
-    if df is None or not isinstance(df, pd.DataFrame):
-        logger.warning("Invalid home_team_df in session, using empty DataFrame")
-        return pd.DataFrame()
+    version_key = f"{key}_version"
+    version = st.session_state.get(version_key)
+    ids = st.session_state.get(key)
+    if ids and isinstance(version, str) and version != store.version:
+        remapped = remap_player_ids(tuple(ids), version, store)
+        if remapped is None:
+            logger.warning("Could not move %s to player data %s", key, store.version)
+            st.warning(
+                "The player data was updated and some selected players could not "
+                "be found again, so the selection was cleared."
+            )
+        st.session_state[key] = list(remapped or ())
 
-    # isinstance check above already narrows df to pd.DataFrame (cast would be redundant)
-    return df
+    st.session_state[version_key] = store.version
+    return store.version
@@ -0,0 +1,41 @@
+"""Lightweight in-process instrumentation."""
+
+from src.telemetry.exporter import (
+    start_exporters_from_env,
+    start_file_exporter,
+    start_http_exporter,
+    write_metrics_file,
+)
+from src.telemetry.metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from src.telemetry.timing import (
+    RerunTimings,
+    current_rerun,
+    finish_rerun,
+    stage,
+    start_rerun,
+    timed,
+)
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "RerunTimings",
+    "current_rerun",
+    "finish_rerun",
+    "stage",
+    "start_exporters_from_env",
+    "start_file_exporter",
+    "start_http_exporter",
+    "start_rerun",
+    "timed",
+    "write_metrics_file",
+]
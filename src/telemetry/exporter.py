@@ -0,0 +1,162 @@
+"""Expose the metrics registry over local HTTP or as a periodically written file.
+
+Both exporters run on daemon threads so they never block the app. They
+are started once per process by ``start_exporters_from_env``:
+
+    NBA_METRICS_PORT=9464 streamlit run app.py      # GET /metrics
+    NBA_METRICS_FILE=/var/lib/node_exporter/nba.prom streamlit run app.py
+"""
+
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.config import (
+    METRICS_FILE_ENV,
+    METRICS_HOST_ENV,
+    METRICS_INTERVAL_ENV,
+    METRICS_PORT_ENV,
+)
+from src.telemetry.metrics import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger("streamlit_nba")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_FILE_INTERVAL = 15.0
+
+
+def _handler_for(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            logger.debug("metrics %s", format % args)
+
+    return MetricsHandler
+
+
+def start_http_exporter(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a background thread.
+
+    Args:
+        port: TCP port (0 picks a free port)
+        host: Interface to bind; loopback by default
+        registry: Registry to expose
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _handler_for(registry))
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    )
+    thread.start()
+    logger.info(
+        "Metrics exporter listening on http://%s:%d/metrics",
+        host,
+        server.server_address[1],
+    )
+    return server
+
+
+def write_metrics_file(path: str | Path, registry: MetricsRegistry = REGISTRY) -> None:
+    """Write the current metrics to ``path`` atomically.
+
+    Args:
+        path: Destination file, typically ``*.prom``
+        registry: Registry to expose
+    """
+    target = Path(path)
+    staging = target.with_name(f"{target.name}.tmp")
+    staging.write_text(registry.render_prometheus())
+    staging.replace(target)
+
+
+def start_file_exporter(
+    path: str | Path,
+    interval: float = DEFAULT_FILE_INTERVAL,
+    registry: MetricsRegistry = REGISTRY,
+) -> threading.Event:
+    """Rewrite the metrics file every ``interval`` seconds in the background.
+
+    Args:
+        path: Destination file
+        interval: Seconds between writes
+        registry: Registry to expose
+
+    Returns:
+        Event that stops the exporter when set
+    """
+    stop = threading.Event()
+
+    def run() -> None:
+        while True:
+            try:
+                write_metrics_file(path, registry)
+            except OSError as e:
+                logger.warning("Could not write metrics file %s: %s", path, e)
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="metrics-file", daemon=True).start()
+    logger.info("Writing metrics to %s every %.0fs", path, interval)
+    return stop
+
+
+class _ExporterState:
+    """Records whether the env-configured exporters have been started."""
+
+    __slots__ = ("started",)
+
+    def __init__(self) -> None:
+        self.started = False
+
+
+_state = _ExporterState()
+_state_lock = threading.Lock()
+
+
+def start_exporters_from_env() -> None:
+    """Start the exporters configured by environment variables, once.
+
+    ``NBA_METRICS_PORT`` enables the HTTP endpoint (bound to
+    ``NBA_METRICS_HOST``, loopback by default); ``NBA_METRICS_FILE`` enables
+    the file exporter, rewritten every ``NBA_METRICS_INTERVAL`` seconds.
+    Safe to call on every rerun.
+    """
+    with _state_lock:
+        if _state.started:
+            return
+        _state.started = True
+
+        port = os.environ.get(METRICS_PORT_ENV)
+        if port:
+            host = os.environ.get(METRICS_HOST_ENV, "127.0.0.1")
+            try:
+                start_http_exporter(int(port), host)
+            except (OSError, ValueError) as e:
+                logger.error("Could not start metrics endpoint: %s", e)
+
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            try:
+                interval = float(
+                    os.environ.get(METRICS_INTERVAL_ENV, DEFAULT_FILE_INTERVAL)
+                )
+            except ValueError:
+                interval = DEFAULT_FILE_INTERVAL
+            start_file_exporter(path, interval)
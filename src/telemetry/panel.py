@@ -0,0 +1,32 @@
+"""Optional sidebar panel showing the stage timings of the last rerun."""
+
+import os
+
+import streamlit as st
+
+from src.config import DEBUG_TIMINGS_ENV
+from src.telemetry.timing import finish_rerun
+
+
+def debug_panel_enabled() -> bool:
+    """Check whether the timing panel is switched on via the environment."""
+    return os.environ.get(DEBUG_TIMINGS_ENV, "").lower() in {"1", "true", "yes"}
+
+
+def finish_page() -> None:
+    """Finish the page's rerun timing and render the debug panel if enabled.
+
+    Call this as the last statement of a page.
+    """
+    timings = finish_rerun()
+    if timings is None or not debug_panel_enabled():
+        return
+
+    with st.sidebar.expander("Rerun timings", expanded=True):
+        st.caption(f"{timings.page}: {timings.total_ms or 0.0:.1f} ms total")
+        st.table(
+            {
+                "stage": list(timings.by_stage()),
+                "ms": [round(ms, 2) for ms in timings.by_stage().values()],
+            }
+        )
@@ -0,0 +1,132 @@
+"""Per-rerun stage timing.
+
+A page starts a rerun with ``start_rerun``; every call to a function
+wrapped in ``@timed`` (or a block in ``with stage(...)``) during that rerun
+records its duration. ``finish_rerun`` emits one structured log line per
+rerun and returns the timings for display. Stages that run outside a rerun,
+such as in scripts or background threads, are logged but not collected.
+"""
+
+import functools
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import ParamSpec, TypeVar
+
+logger = logging.getLogger("streamlit_nba")
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class RerunTimings:
+    """Stage durations recorded during one page rerun."""
+
+    page: str
+    started_ns: int = field(default_factory=time.perf_counter_ns)
+    stages: list[tuple[str, float]] = field(default_factory=list)
+    total_ms: float | None = None
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        """Append a stage duration."""
+        self.stages.append((name, elapsed_ms))
+
+    def by_stage(self) -> dict[str, float]:
+        """Total milliseconds per stage name, in first-seen order."""
+        totals: dict[str, float] = {}
+        for name, elapsed_ms in self.stages:
+            totals[name] = totals.get(name, 0.0) + elapsed_ms
+        return totals
+
+
+_current: ContextVar[RerunTimings | None] = ContextVar("rerun_timings", default=None)
+
+
+def start_rerun(page: str) -> RerunTimings:
+    """Begin collecting stage timings for a page rerun.
+
+    Args:
+        page: Page identifier used in log lines
+
+    Returns:
+        The collector for this rerun
+    """
+    timings = RerunTimings(page=page)
+    _current.set(timings)
+    return timings
+
+
+def current_rerun() -> RerunTimings | None:
+    """Return the collector of the rerun in progress, if any."""
+    return _current.get()
+
+
+def finish_rerun() -> RerunTimings | None:
+    """Close the current rerun and log its timings as one JSON line.
+
+    Returns:
+        The finished collector, or None if no rerun was started
+    """
+    timings = _current.get()
+    if timings is None:
+        return None
+    _current.set(None)
+
+    timings.total_ms = (time.perf_counter_ns() - timings.started_ns) / 1e6
+    logger.info(
+        "rerun_timing %s",
+        json.dumps(
+            {
+                "page": timings.page,
+                "total_ms": round(timings.total_ms, 3),
+                "stages": {k: round(v, 3) for k, v in timings.by_stage().items()},
+            }
+        ),
+    )
+    return timings
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block of code as a named stage.
+
+    Args:
+        name: Stage name
+    """
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter_ns() - started) / 1e6
+        timings = _current.get()
+        if timings is not None:
+            timings.record(name, elapsed_ms)
+        logger.debug("stage=%s elapsed_ms=%.3f", name, elapsed_ms)
+
+
+def timed(name: str | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function so each call is timed as a stage.
+
+    Args:
+        name: Stage name (defaults to the function name)
+
+    Returns:
+        Decorator preserving the wrapped function's signature
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
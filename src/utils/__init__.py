@@ -1,5 +1,6 @@
 """Utility functions for HTML sanitization and other helpers."""
 
 from src.utils.html import safe_heading, safe_paragraph
+from src.utils.preload import start_preload
 
-__all__ = ["safe_heading", "safe_paragraph"]
+__all__ = ["safe_heading", "safe_paragraph", "start_preload"]
@@ -0,0 +1,275 @@
+"""Hot reload of the player data and model bundles with an atomic swap.
+
+A daemon thread polls the watched files every
+``HOT_RELOAD_INTERVAL_SECONDS``. A file whose mtime or size moved is hashed,
+and only a real content change triggers a rebuild: a fresh ``PlayerStore``
+with its similarity and simulation indexes, or a freshly validated model
+bundle. The rebuild runs on the watcher thread and the result is published
+with a single reference swap, so requests never wait on a reload or see a
+half-built one. Page reruns already in flight keep the store they started
+with. If a rebuild fails the previous version keeps serving.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.config import HOT_RELOAD_ENV, HOT_RELOAD_INTERVAL_SECONDS
+from src.telemetry.metrics import HOT_RELOAD_FAILURES, HOT_RELOAD_SECONDS, HOT_RELOADS
+
+logger = logging.getLogger("streamlit_nba")
+
+# (name, watched files, rebuild-and-publish callable)
+ReloadTarget = tuple[str, tuple[Path, ...], Callable[[], object]]
+
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """What a file looked like when it was last checked."""
+
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+def fingerprint(path: Path, previous: Fingerprint | None = None) -> Fingerprint | None:
+    """Fingerprint a file, hashing it only if its mtime or size moved.
+
+    Args:
+        path: File to check
+        previous: Last fingerprint of the same file, if any
+
+    Returns:
+        The file's fingerprint, or None if it does not exist
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    if (
+        previous is not None
+        and previous.mtime_ns == stat.st_mtime_ns
+        and previous.size == stat.st_size
+    ):
+        return previous
+
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(_HASH_CHUNK):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return Fingerprint(stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+
+class FileWatcher:
+    """Detects content changes to a fixed set of files."""
+
+    def __init__(self, paths: Sequence[Path]) -> None:
+        """Record the files' current state as the baseline.
+
+        Args:
+            paths: Files to watch; missing files are allowed
+        """
+        self.paths = tuple(paths)
+        self._seen = {path: fingerprint(path) for path in self.paths}
+
+    def changed(self) -> bool:
+        """Check whether any file's content changed since the last check.
+
+        A touch that leaves the content alone updates the baseline without
+        reporting a change.
+        """
+        changed = False
+        for path in self.paths:
+            previous = self._seen[path]
+            current = fingerprint(path, previous)
+            if current is previous:
+                continue
+            if (current is None) != (previous is None) or (
+                current is not None
+                and previous is not None
+                and current.sha256 != previous.sha256
+            ):
+                changed = True
+            self._seen[path] = current
+        return changed
+
+
+def _reload_player_store() -> object:
+    from src.database.similarity import get_similarity_index
+    from src.database.store import load_player_store, publish_player_store
+    from src.simulation import store_rates
+
+    store = load_player_store()
+    # Build the derived indexes before the swap so no request pays for them
+    store_rates(store)
+    for per_game in (False, True):
+        get_similarity_index(store, per_game)
+    publish_player_store(store)
+    return store
+
+
+def _model_reloader(path: Path) -> Callable[[], object]:
+    def reload() -> object:
+        from src.ml.model import reload_model_bundle
+
+        return reload_model_bundle(path)
+
+    return reload
+
+
+def default_targets() -> tuple[ReloadTarget, ...]:
+    """The player CSV and each model variant's bundle manifest.
+
+    Bundles are published by writing ``manifest.json`` last, so watching the
+    manifest alone sees every complete bundle update.
+    """
+    from src.database.connection import CSV_PATH
+    from src.ml.bundle import MANIFEST_NAME
+    from src.ml.model import VARIANT_PATHS
+
+    players: ReloadTarget = ("player store", (CSV_PATH,), _reload_player_store)
+    models = tuple(
+        (f"{variant} model", (path / MANIFEST_NAME,), _model_reloader(path))
+        for variant, path in VARIANT_PATHS.items()
+    )
+    return (players, *models)
+
+
+class HotReloader:
+    """Polls reload targets and rebuilds the ones whose files changed."""
+
+    def __init__(
+        self,
+        targets: Sequence[ReloadTarget] | Callable[[], Sequence[ReloadTarget]],
+        interval: float = HOT_RELOAD_INTERVAL_SECONDS,
+    ) -> None:
+        """Create a reloader; the files' current state is the baseline.
+
+        Args:
+            targets: (name, files, rebuild) triples to watch, or a callable
+                returning them, which is then called on the watcher thread
+            interval: Seconds between polls
+        """
+        self.interval = interval
+        self._targets = targets
+        self._watched = None if callable(targets) else self._watch(targets)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _watch(
+        targets: Sequence[ReloadTarget],
+    ) -> list[tuple[str, FileWatcher, Callable[[], object]]]:
+        return [(name, FileWatcher(paths), rebuild) for name, paths, rebuild in targets]
+
+    def _watched_targets(self) -> list[tuple[str, FileWatcher, Callable[[], object]]]:
+        if self._watched is None:
+            targets = self._targets() if callable(self._targets) else self._targets
+            self._watched = self._watch(targets)
+        return self._watched
+
+    def check(self) -> list[str]:
+        """Poll once and rebuild every target whose files changed.
+
+        Returns:
+            Names of the targets that were reloaded successfully
+        """
+        reloaded = []
+        for name, watcher, rebuild in self._watched_targets():
+            if not watcher.changed():
+                continue
+            started = time.perf_counter()
+            try:
+                rebuild()
+            except Exception as e:
+                # The next write to the files triggers another attempt
+                HOT_RELOAD_FAILURES.inc()
+                logger.warning("Reloading %s failed, keeping current: %s", name, e)
+                continue
+            elapsed = time.perf_counter() - started
+            HOT_RELOADS.inc()
+            HOT_RELOAD_SECONDS.observe(elapsed)
+            logger.info("Reloaded %s in %.0f ms", name, elapsed * 1000)
+            reloaded.append(name)
+        return reloaded
+
+    def start(self) -> None:
+        """Start polling on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="nba-hot-reload", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        self._watched_targets()
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+class _ReloaderState:
+    """Holds the process-wide reloader once it has been started."""
+
+    __slots__ = ("reloader",)
+
+    def __init__(self) -> None:
+        self.reloader: HotReloader | None = None
+
+
+_state = _ReloaderState()
+_state_lock = threading.Lock()
+
+
+def hot_reload_enabled() -> bool:
+    """Check that hot reloading has not been switched off."""
+    return os.environ.get(HOT_RELOAD_ENV, "1").lower() not in {"0", "false", "no"}
+
+
+def start_hot_reload(
+    targets: Sequence[ReloadTarget] | None = None,
+) -> HotReloader | None:
+    """Start watching the data and model files, once per process.
+
+    Safe to call on every rerun; the watcher starts on the first call.
+
+    Args:
+        targets: Targets to watch instead of ``default_targets()``, which
+            are resolved on the watcher thread to keep imports off the page
+
+    Returns:
+        The running reloader, or None if hot reloading is disabled
+    """
+    if not hot_reload_enabled():
+        return None
+    with _state_lock:
+        if _state.reloader is None:
+            _state.reloader = HotReloader(
+                default_targets if targets is None else targets
+            )
+            _state.reloader.start()
+        return _state.reloader
+
+
+def stop_hot_reload() -> None:
+    """Stop the process-wide reloader so the next call starts a new one."""
+    with _state_lock:
+        reloader, _state.reloader = _state.reloader, None
+    if reloader is not None:
+        reloader.stop()
@@ -0,0 +1,130 @@
+"""Background warm-up of the heavy modules and shared data.
+
+The landing page imports only Streamlit and the HTML helpers so it paints
+quickly. Once the first page of a session has rendered, whichever one it
+is, ``start_preload`` imports pandas and the model code on a daemon thread.
+It builds the shared player store, starts the away-team reservoir and runs
+one throwaway prediction through the model bundle. By the time the user has
+built a team, the play page finds the model warm and opponents waiting
+instead of paying for them.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+
+from src.config import PRELOAD_ENV
+
+logger = logging.getLogger("streamlit_nba")
+
+PreloadStep = tuple[str, Callable[[], object]]
+
+
+def _player_store() -> object:
+    from src.database.store import get_player_store
+
+    return get_player_store()
+
+
+def _team_reservoir() -> object:
+    from src.database.reservoir import get_team_reservoir
+
+    return get_team_reservoir()
+
+
+def _model_bundle() -> object:
+    import numpy as np
+
+    from src.ml.model import get_model_bundle
+
+    # One prediction off the record, so the first real one skips the
+    # allocations and kernel setup of a cold call
+    bundle = get_model_bundle()
+    bundle.predict_proba(np.zeros((1, bundle.input_dim), dtype=np.float32))
+    return bundle
+
+
+def _simulation_rates() -> object:
+    from src.database.store import get_player_store
+    from src.simulation import store_rates
+
+    return store_rates(get_player_store())
+
+
+DEFAULT_STEPS: tuple[PreloadStep, ...] = (
+    ("player store", _player_store),
+    ("team reservoir", _team_reservoir),
+    ("model bundle", _model_bundle),
+    ("simulation rates", _simulation_rates),
+)
+
+
+class _PreloadState:
+    """Holds the preload thread once it has been started."""
+
+    __slots__ = ("thread",)
+
+    def __init__(self) -> None:
+        self.thread: threading.Thread | None = None
+
+
+_state = _PreloadState()
+_state_lock = threading.Lock()
+
+
+def preload_enabled() -> bool:
+    """Check that background preloading has not been switched off."""
+    return os.environ.get(PRELOAD_ENV, "1").lower() not in {"0", "false", "no"}
+
+
+def run_preload(steps: Sequence[PreloadStep] = DEFAULT_STEPS) -> None:
+    """Run preload steps in order, logging and skipping any that fail.
+
+    A failed step is only logged: the page that needs the data loads it
+    again in the foreground and reports the error there.
+
+    Args:
+        steps: (name, callable) pairs to run
+    """
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning("Preloading %s failed: %s", name, e)
+            continue
+        logger.info(
+            "Preloaded %s in %.0f ms", name, (time.perf_counter() - started) * 1000
+        )
+
+
+def start_preload(
+    steps: Sequence[PreloadStep] = DEFAULT_STEPS,
+) -> threading.Thread | None:
+    """Start preloading on a daemon thread, once per process.
+
+    Call after the page has rendered. Safe to call on every rerun.
+
+    Args:
+        steps: (name, callable) pairs to run
+
+    Returns:
+        The preload thread, or None if preloading is disabled
+    """
+    if not preload_enabled():
+        return None
+    with _state_lock:
+        if _state.thread is None:
+            _state.thread = threading.Thread(
+                target=run_preload, args=(steps,), name="nba-preload", daemon=True
+            )
+            _state.thread.start()
+        return _state.thread
+
+
+def reset_preload() -> None:
+    """Forget the started thread so the next call starts a new one."""
+    with _state_lock:
+        _state.thread = None
@@ -0,0 +1,397 @@
+"""Tests for the async JSON API, driven in-process through the ASGI interface."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api import ApiApp, PredictionBatcher, create_app
+from src.config import STAT_COLUMNS
+from src.database.connection import QueryExecutionError
+from src.database.ranks import difficulty_thresholds
+from src.database.store import PlayerStore
+from src.ml.bundle import ModelLoadError
+
+PLAYER_NAMES = [f"Player {chr(ord('A') + i)}" for i in range(12)]
+
+
+async def request(
+    app: ApiApp,
+    method: str,
+    path: str,
+    body: Any = None,
+    query: str = "",
+) -> tuple[int, dict[str, Any]]:
+    """Send one HTTP request through the ASGI interface."""
+    raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"" if body is None else raw}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def call(app: ApiApp, *args: Any, **kwargs: Any) -> tuple[int, dict[str, Any]]:
+    """Synchronous wrapper around ``request``."""
+    return asyncio.run(request(app, *args, **kwargs))
+
+
+class FakeReservoir:
+    """Serves the same team for any thresholds and records what was asked."""
+
+    def __init__(self, team: tuple[int, ...]) -> None:
+        self.team = team
+        self.requested: list[tuple[int, int, int, int]] = []
+        self.stores: list[PlayerStore | None] = []
+        self.error: Exception | None = None
+
+    def pop(
+        self, thresholds: tuple[int, int, int, int], store: PlayerStore | None = None
+    ) -> tuple[int, ...]:
+        self.requested.append(thresholds)
+        self.stores.append(store)
+        if self.error is not None:
+            raise self.error
+        return self.team
+
+
+class FakeModel:
+    """Records every batch it scores and returns a fixed probability."""
+
+    def __init__(self, probability: float = 0.8) -> None:
+        self.probability = probability
+        self.batches: list[tuple[np.ndarray, str]] = []
+        self.error: Exception | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, rows: np.ndarray, variant: str) -> np.ndarray:
+        with self._lock:
+            self.batches.append((rows.copy(), variant))
+        if self.error is not None:
+            raise self.error
+        return np.full(len(rows), self.probability, dtype=np.float32)
+
+
+@pytest.fixture
+def store(sample_player_df: pd.DataFrame) -> PlayerStore:
+    """Store of twelve distinct players plus two sharing a name."""
+    template = sample_player_df.iloc[[0]]
+    rows = []
+    for i, name in enumerate([*PLAYER_NAMES, "Twin Name", "Twin Name"]):
+        row = template.copy()
+        first, last = name.split()
+        row["FULL_NAME"] = name
+        row["FULL_NAME_LOWER"] = name.lower()
+        row["FIRST_NAME_LOWER"] = first.lower()
+        row["LAST_NAME_LOWER"] = last.lower()
+        row["PTS"] = 1000 + i
+        rows.append(row)
+    return PlayerStore(pd.concat(rows, ignore_index=True), "test-v1")
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    """Worker pool shared by the app under test."""
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def reservoir() -> FakeReservoir:
+    """Reservoir serving players G..K."""
+    return FakeReservoir((6, 7, 8, 9, 10))
+
+
+@pytest.fixture
+def model() -> FakeModel:
+    """Stand-in prediction model."""
+    return FakeModel()
+
+
+@pytest.fixture
+def app(
+    store: PlayerStore,
+    reservoir: FakeReservoir,
+    model: FakeModel,
+    executor: ThreadPoolExecutor,
+) -> ApiApp:
+    """API wired to the test store, reservoir and model."""
+    return create_app(
+        get_store=lambda: store,
+        get_reservoir=lambda: reservoir,
+        predict=model,
+        executor=executor,
+    )
+
+
+class TestRouting:
+    """Tests for health, routing and error responses."""
+
+    def test_health(self, app: ApiApp) -> None:
+        """Health reports store size and version."""
+        status, payload = call(app, "GET", "/health")
+        assert status == 200
+        assert payload == {"status": "ok", "players": 14, "version": "test-v1"}
+
+    def test_unknown_path_is_404(self, app: ApiApp) -> None:
+        """Unknown paths are reported as not found."""
+        status, payload = call(app, "GET", "/nope")
+        assert status == 404
+        assert "error" in payload
+
+    def test_wrong_method_is_405(self, app: ApiApp) -> None:
+        """Known paths reject other methods."""
+        status, _ = call(app, "GET", "/predict")
+        assert status == 405
+
+    def test_malformed_json_is_422(self, app: ApiApp) -> None:
+        """Bodies that are not valid JSON are rejected."""
+        status, _ = call(app, "POST", "/players/lookup", body=b"{not json")
+        assert status == 422
+
+    def test_lifespan_protocol(self) -> None:
+        """The app completes the lifespan protocol."""
+        app = create_app()
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent: list[str] = []
+
+        async def receive() -> dict[str, Any]:
+            return next(messages)
+
+        async def send(message: dict[str, Any]) -> None:
+            sent.append(message["type"])
+
+        asyncio.run(app({"type": "lifespan"}, receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+class TestPlayerEndpoints:
+    """Tests for search and roster lookup."""
+
+    def test_search_returns_ids_and_names(self, app: ApiApp) -> None:
+        """Search matches names and reports row ids."""
+        status, payload = call(app, "GET", "/players/search", query="q=player+b")
+        assert status == 200
+        assert payload["total"] == 1
+        assert payload["players"] == [{"id": 1, "name": "Player B"}]
+
+    def test_search_rejects_invalid_term(self, app: ApiApp) -> None:
+        """Search terms go through the same validation as the UI."""
+        status, _ = call(app, "GET", "/players/search", query="q=%3Cscript%3E")
+        assert status == 400
+
+    def test_lookup_returns_records(self, app: ApiApp) -> None:
+        """Lookup returns each player's id, name and stats."""
+        status, payload = call(
+            app, "POST", "/players/lookup", {"names": ["Player A", "Player C"]}
+        )
+        assert status == 200
+        players = payload["players"]
+        assert [p["id"] for p in players] == [0, 2]
+        assert set(players[0]) == {"id", "FULL_NAME", *STAT_COLUMNS}
+
+    def test_lookup_sends_non_finite_stats_as_null(
+        self, store: PlayerStore, executor: ThreadPoolExecutor
+    ) -> None:
+        """Missing and infinite stats come back as null, not invalid JSON."""
+        df = store.df.copy()
+        df[["PTS", "OREB"]] = df[["PTS", "OREB"]].astype(float)
+        df.loc[1, "PTS"] = np.nan
+        df.loc[1, "OREB"] = np.inf
+        patched = PlayerStore(df, "test-v2")
+        app = create_app(get_store=lambda: patched, executor=executor)
+
+        status, payload = call(app, "POST", "/players/lookup", {"names": ["Player B"]})
+
+        assert status == 200
+        (player,) = payload["players"]
+        assert player["PTS"] is None
+        assert player["OREB"] is None
+        assert player["AST"] == df.loc[1, "AST"]
+
+    def test_lookup_requires_names(self, app: ApiApp) -> None:
+        """An empty name list is a validation error."""
+        status, payload = call(app, "POST", "/players/lookup", {"names": []})
+        assert status == 422
+        assert "names" in payload["error"]
+
+
+class TestTeamsAndPrediction:
+    """Tests for away-team generation and prediction."""
+
+    def test_away_team_uses_preset(
+        self, app: ApiApp, store: PlayerStore, reservoir: FakeReservoir
+    ) -> None:
+        """Away teams are drawn for the preset resolved against the store."""
+        status, payload = call(app, "POST", "/teams/away", {"difficulty": "All-Stars"})
+        assert status == 200
+        presets = difficulty_thresholds(store.ranks)
+        assert reservoir.requested == [presets["All-Stars"]]
+        assert [p["name"] for p in payload["players"]] == PLAYER_NAMES[6:11]
+
+    def test_one_store_per_request(
+        self,
+        store: PlayerStore,
+        reservoir: FakeReservoir,
+        model: FakeModel,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """A store published mid-request does not reach the rest of it."""
+        renamed = store.df.copy()
+        renamed["FULL_NAME"] = [f"New {name}" for name in renamed["FULL_NAME"]]
+        stores = iter([store, PlayerStore(renamed, "test-v2")])
+        app = create_app(
+            get_store=lambda: next(stores),
+            get_reservoir=lambda: reservoir,
+            predict=model,
+            executor=executor,
+        )
+
+        status, payload = call(app, "POST", "/teams/away", {})
+
+        assert status == 200
+        assert reservoir.stores == [store]
+        assert [p["name"] for p in payload["players"]] == PLAYER_NAMES[6:11]
+
+    def test_unknown_difficulty_is_422(self, app: ApiApp) -> None:
+        """Only preset difficulties are accepted."""
+        status, _ = call(app, "POST", "/teams/away", {"difficulty": "Easy"})
+        assert status == 422
+
+    def test_generation_failure_is_503(
+        self, app: ApiApp, reservoir: FakeReservoir
+    ) -> None:
+        """A team that cannot be generated is reported as unavailable."""
+        reservoir.error = QueryExecutionError("pool too small")
+        status, _ = call(app, "POST", "/teams/away", {})
+        assert status == 503
+
+    def test_predict_explicit_matchup(
+        self, app: ApiApp, store: PlayerStore, model: FakeModel
+    ) -> None:
+        """Features are home stats then away stats, in roster order."""
+        home, away = PLAYER_NAMES[4::-1], PLAYER_NAMES[5:10]
+        status, payload = call(app, "POST", "/predict", {"home": home, "away": away})
+
+        assert status == 200
+        assert payload["home_win_probability"] == pytest.approx(0.8)
+        assert payload["winner"] == "home"
+        assert [p["name"] for p in payload["home"]] == home
+        (rows, variant), *_ = model.batches
+        expected = np.concatenate([store.stats[[4, 3, 2, 1, 0]], store.stats[5:10]])
+        np.testing.assert_array_equal(rows[0], expected.ravel())
+        assert variant == "teacher"
+
+    def test_predict_generates_missing_opponent(
+        self, app: ApiApp, store: PlayerStore, reservoir: FakeReservoir
+    ) -> None:
+        """Without an away team, one is drawn for the difficulty."""
+        status, payload = call(
+            app,
+            "POST",
+            "/predict",
+            {"home": PLAYER_NAMES[:5], "difficulty": "Dream Team"},
+        )
+        assert status == 200
+        presets = difficulty_thresholds(store.ranks)
+        assert reservoir.requested == [presets["Dream Team"]]
+        assert [p["id"] for p in payload["away"]] == [6, 7, 8, 9, 10]
+
+    @pytest.mark.parametrize(
+        "home",
+        [
+            [*PLAYER_NAMES[:4], "Nobody Known"],
+            [*PLAYER_NAMES[:4], "Twin Name"],
+        ],
+        ids=["unknown", "ambiguous"],
+    )
+    def test_predict_rejects_unresolvable_names(
+        self, app: ApiApp, home: list[str]
+    ) -> None:
+        """Unknown and ambiguous names are reported back."""
+        status, payload = call(app, "POST", "/predict", {"home": home})
+        assert status == 422
+        assert home[-1] in payload["error"]
+
+    def test_predict_model_failure_is_503(self, app: ApiApp, model: FakeModel) -> None:
+        """A model that cannot load is reported as unavailable."""
+        model.error = ModelLoadError("missing bundle")
+        status, _ = call(app, "POST", "/predict", {"home": PLAYER_NAMES[:5]})
+        assert status == 503
+
+    def test_concurrent_predictions_are_batched(
+        self, app: ApiApp, model: FakeModel
+    ) -> None:
+        """Hundreds of concurrent requests share a few model calls."""
+
+        async def burst() -> list[tuple[int, dict[str, Any]]]:
+            body = {"home": PLAYER_NAMES[:5], "away": PLAYER_NAMES[5:10]}
+            return await asyncio.gather(
+                *(request(app, "POST", "/predict", body) for _ in range(300))
+            )
+
+        responses = asyncio.run(burst())
+
+        assert all(status == 200 for status, _ in responses)
+        assert sum(len(rows) for rows, _ in model.batches) == 300
+        assert len(model.batches) < 300
+
+
+class TestPredictionBatcher:
+    """Tests for request batching."""
+
+    def test_flushes_at_max_batch(self) -> None:
+        """A full batch is scored without waiting for the timer."""
+        sizes: list[int] = []
+
+        def predict(rows: np.ndarray) -> np.ndarray:
+            sizes.append(len(rows))
+            return rows[:, 0]
+
+        async def run() -> list[float]:
+            batcher = PredictionBatcher(predict, max_batch=4, max_wait=10.0)
+            return await asyncio.gather(
+                *(batcher.predict(np.array([float(i)])) for i in range(8))
+            )
+
+        assert asyncio.run(run()) == [float(i) for i in range(8)]
+        assert sizes == [4, 4]
+
+    def test_errors_reach_every_waiter(self) -> None:
+        """A failed batch fails each request in it."""
+
+        def predict(rows: np.ndarray) -> np.ndarray:
+            raise ModelLoadError("boom")
+
+        async def run() -> list[BaseException | float]:
+            batcher = PredictionBatcher(predict, max_wait=0.001)
+            return await asyncio.gather(
+                *(batcher.predict(np.zeros(1)) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ModelLoadError) for r in results)
+
+    def test_rejects_non_positive_batch(self) -> None:
+        """max_batch must be at least one."""
+        with pytest.raises(ValueError, match="max_batch"):
+            PredictionBatcher(lambda rows: rows, max_batch=0)
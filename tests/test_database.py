@@ -1,11 +1,29 @@
 """Tests for database module using local pandas data."""
 
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from itertools import combinations, permutations
+from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.config import PLAYER_COLUMNS
+from src.config import DIFFICULTY_COLUMNS, PLAYER_COLUMNS, STAT_COLUMNS
+from src.database.backends import (
+    FrameBackend,
+    SQLiteBackend,
+    build_player_database,
+)
+from src.database.cache import (
+    LRUCache,
+    cached_search_player_ids,
+    get_search_cache,
+)
 from src.database.connection import (
     DatabaseConnectionError,
     QueryExecutionError,
@@ -14,9 +32,43 @@ from src.database.connection import (
 )
 from src.database.queries import (
     get_away_team_by_stats,
+    get_away_team_ids_by_stats,
     get_players_by_full_names,
+    resolve_player_ids,
     search_player_by_name,
+    search_player_ids_by_name,
+)
+from src.database.ranks import RankTable, difficulty_thresholds, infeasible_reason
+from src.database.reservoir import (
+    TeamGenerator,
+    TeamIds,
+    TeamReservoir,
+    Thresholds,
+    generate_away_team,
+)
+from src.database.similarity import (
+    SimilarityIndex,
+    find_similar_players,
+    get_similarity_index,
 )
+from src.database.store import (
+    PlayerStore,
+    get_player_store,
+    load_player_store,
+    publish_player_store,
+    remap_player_ids,
+    reset_player_store,
+)
+from src.telemetry.metrics import AWAY_TEAM_ATTEMPTS
+from src.telemetry.timing import finish_rerun, start_rerun
+
+
+@pytest.fixture
+def fresh_store() -> Iterator[None]:
+    """Reset the shared player store before and after a test."""
+    reset_player_store()
+    yield
+    reset_player_store()
 
 
 class TestLoadData:
@@ -92,6 +144,25 @@ class TestSearchPlayerByName:
         assert result == []
 
 
+class TestSearchPlayerIdsByName:
+    """Tests for search_player_ids_by_name function."""
+
+    def test_returns_row_ids(self, sample_player_df: pd.DataFrame) -> None:
+        """Verify matches are returned as row ids."""
+        result = search_player_ids_by_name(sample_player_df, "lebron")
+        assert result == [0]
+        assert all(isinstance(i, int) for i in result)
+
+    def test_players_sharing_a_name_are_distinct(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify two players with the same full name get separate ids."""
+        doubled = pd.concat([sample_player_df, sample_player_df.iloc[[0]]])
+        doubled = doubled.reset_index(drop=True)
+        result = search_player_ids_by_name(doubled, "LeBron James")
+        assert result == [0, len(doubled) - 1]
+
+
 class TestGetPlayersByFullNames:
     """Tests for get_players_by_full_names batch query."""
 
@@ -119,8 +190,8 @@ class TestGetPlayersByFullNames:
 class TestGetAwayTeamByStats:
     """Tests for get_away_team_by_stats."""
 
-    def test_max_attempts_raises_error(self) -> None:
-        """Test that max_attempts limit works when population is too small."""
+    def test_infeasible_thresholds_fail_fast(self) -> None:
+        """Test that a population too small for a team is rejected up front."""
         # Create a DF with only 2 players
         df = pd.DataFrame(
             [
@@ -133,6 +204,7 @@ class TestGetAwayTeamByStats:
             if col not in df.columns:
                 df[col] = 0
 
+        attempts = AWAY_TEAM_ATTEMPTS.value
         with pytest.raises(QueryExecutionError) as exc_info:
             get_away_team_by_stats(
                 df,
@@ -140,10 +212,10 @@ class TestGetAwayTeamByStats:
                 reb_threshold=500,
                 ast_threshold=300,
                 stl_threshold=100,
-                max_attempts=3,
             )
 
-        assert "3 attempts" in str(exc_info.value)
+        assert "2 distinct in the PTS/REB pools, 3 needed" in str(exc_info.value)
+        assert AWAY_TEAM_ATTEMPTS.value == attempts
 
     def test_success_with_enough_players(self) -> None:
         """Test successful generation with sufficient population."""
@@ -175,6 +247,68 @@ class TestGetAwayTeamByStats:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 5
 
+    def test_tight_pools_always_succeed(self) -> None:
+        """Test that a feasible team is found even when one draw rarely fits."""
+        df = _team_frame(5)
+        # Only players 3 and 4 can fill the PTS slots
+        df.loc[3:4, ["REB", "AST", "STL"]] = 0
+
+        for seed in range(20):
+            np.random.seed(seed)
+            team = get_away_team_ids_by_stats(df, 1000, 500, 300, 100)
+            assert sorted(team[:2]) == [3, 4]
+            assert sorted(team[2:]) == [0, 1, 2]
+
+    def test_sampling_gives_up_after_the_attempt_budget(self) -> None:
+        """Test that a sampler that never finds a valid team stops and raises."""
+        backend = FrameBackend(_team_frame(10))
+        attempts = AWAY_TEAM_ATTEMPTS.value
+
+        # Every slot draws the same player, so no candidate is ever valid
+        with (
+            patch.object(
+                FrameBackend,
+                "pick_above",
+                lambda *args: np.zeros_like(args[-1]),
+            ),
+            patch("src.database.queries._MAX_BATCHES", 3),
+            pytest.raises(QueryExecutionError, match="no valid team in 21 candidates"),
+        ):
+            get_away_team_ids_by_stats(backend, 1000, 500, 300, 100)
+
+        assert AWAY_TEAM_ATTEMPTS.value == attempts + 21
+
+    def test_teams_are_uniform(self) -> None:
+        """Test that every valid team is drawn equally often."""
+        df = _team_frame(6)
+        df.loc[4:5, ["REB", "AST", "STL"]] = 0
+        df.loc[0, "PTS"] = 0
+        backend = FrameBackend(df, RankTable(df))
+        np.random.seed(0)
+
+        draws = 3000
+        counts = Counter(
+            tuple(get_away_team_ids_by_stats(backend, 1000, 500, 300, 100))
+            for _ in range(draws)
+        )
+
+        # PTS picks two of 1-5, then REB/AST/STL take three more of 0-3
+        valid = [
+            (*pts, *rest)
+            for pts in combinations(range(1, 6), 2)
+            for rest in permutations(range(4), 3)
+            if not set(pts) & set(rest)
+        ]
+        assert len(valid) == 60
+        unordered: Counter[tuple[int, ...]] = Counter()
+        for team, n in counts.items():
+            unordered[(*sorted(team[:2]), *team[2:])] += n
+        assert set(unordered) == set(valid)
+        expected = draws / len(valid)
+        # Chi-squared with 59 degrees of freedom; 100 is far in the tail
+        chi2 = sum((n - expected) ** 2 / expected for n in unordered.values())
+        assert chi2 < 100
+
 
 class TestCsvColumnValidation:
     """Integration tests validating CSV data matches config."""
@@ -184,3 +318,750 @@ class TestCsvColumnValidation:
         df = load_data()
         assert not df.empty, "CSV file should not be empty"
         assert list(df.columns) == PLAYER_COLUMNS
+
+
+class TestPlayerStore:
+    """Tests for the shared read-only player store."""
+
+    def test_same_store_returned_across_calls(self, fresh_store: None) -> None:
+        """Verify the store is built once and shared by reference."""
+        assert get_player_store() is get_player_store()
+
+    def test_concurrent_first_access_loads_once(self, fresh_store: None) -> None:
+        """Verify concurrent first calls parse the CSV only once."""
+        real_load = load_data
+        calls: list[int] = []
+
+        def counting_load() -> pd.DataFrame:
+            calls.append(1)
+            return real_load()
+
+        with patch("src.database.connection.load_data", side_effect=counting_load):
+            threads = [threading.Thread(target=get_player_store) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+
+    def test_mutating_view_does_not_change_store(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify writes to a handed-out view never reach the shared table."""
+        store = PlayerStore(sample_player_df, "test")
+
+        view = store.df
+        view.loc[0, "PTS"] = -1
+        view["FULL_NAME"] = "changed"
+
+        assert store.df.loc[0, "PTS"] == sample_player_df.loc[0, "PTS"]
+        assert store.df.loc[0, "FULL_NAME"] == "LeBron James"
+
+    def test_stats_matrix_is_read_only(self, sample_player_df: pd.DataFrame) -> None:
+        """Verify the precomputed stat matrix cannot be written."""
+        store = PlayerStore(sample_player_df, "test")
+
+        assert store.stats.dtype == np.float32
+        assert store.stats.shape == (2, 10)
+        with pytest.raises(ValueError, match="read-only"):
+            store.stats[0, 0] = 0.0
+
+    def test_published_store_replaces_current(
+        self, fresh_store: None, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a loaded store is only served once it is published."""
+        current = get_player_store()
+        fresh = load_player_store()
+        assert fresh is not current
+        assert get_player_store() is current
+
+        publish_player_store(PlayerStore(sample_player_df, "v2"))
+        assert get_player_store().version == "v2"
+
+    def test_ids_move_to_a_reordered_store_by_name(self, fresh_store: None) -> None:
+        """Verify ids from a replaced snapshot resolve to the same players."""
+        frame = _team_frame(4)
+        old = PlayerStore(frame, "v1")
+        publish_player_store(old)
+        new = PlayerStore(frame.iloc[[3, 1, 0, 2]], "v2")
+        publish_player_store(new)
+
+        remapped = remap_player_ids((0, 3), "v1", new)
+
+        assert remapped == (2, 0)
+        assert [new.name_of(i) for i in remapped] == ["Player0", "Player3"]
+        assert remap_player_ids((0, 3), "v2", new) == (0, 3)
+
+    def test_ids_that_cannot_be_moved(self, fresh_store: None) -> None:
+        """Verify unknown snapshots, lost players and shared names give None."""
+        frame = _team_frame(3)
+        publish_player_store(PlayerStore(frame, "v1"))
+        renamed = frame.copy()
+        renamed.loc[0, "FULL_NAME"] = "Player1"
+        new = PlayerStore(renamed, "v2")
+        publish_player_store(new)
+
+        assert remap_player_ids((2,), "v0", new) is None
+        assert remap_player_ids((5,), "v1", new) is None
+        assert remap_player_ids((1,), "v1", new) is None
+        assert remap_player_ids((2,), "v1", new) == (2,)
+
+    def test_rerun_keeps_its_store_across_a_swap(
+        self, fresh_store: None, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a rerun in flight never sees a store published after it began."""
+        start_rerun("test")
+        try:
+            pinned = get_player_store()
+            publish_player_store(PlayerStore(sample_player_df, "v2"))
+            assert get_player_store() is pinned
+        finally:
+            finish_rerun()
+
+        start_rerun("test")
+        try:
+            assert get_player_store().version == "v2"
+        finally:
+            finish_rerun()
+
+
+class TestSearchCache:
+    """Tests for the LRU search cache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Verify the oldest untouched entry is evicted first."""
+        cache: LRUCache[int] = LRUCache(maxsize=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 0)  # touch "a"
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("a", lambda: -1) == 1
+        assert cache.get_or_compute("b", lambda: -2) == -2
+        assert cache.stats().evictions == 2
+
+    def test_hit_rate(self) -> None:
+        """Verify hits and misses are counted."""
+        cache: LRUCache[int] = LRUCache(maxsize=4)
+        for _ in range(4):
+            cache.get_or_compute("k", lambda: 1)
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (3, 1)
+        assert stats.hit_rate == 0.75
+
+    def test_concurrent_lookups_compute_once(self) -> None:
+        """Verify identical concurrent lookups share one computation."""
+        cache: LRUCache[int] = LRUCache(maxsize=4)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow() -> int:
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 42
+
+        results: list[int] = []
+        leader = threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("k", slow))
+        )
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute("k", slow))
+            )
+            for _ in range(7)
+        ]
+        for thread in followers:
+            thread.start()
+        while cache.stats().coalesced < len(followers):
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [42] * 8
+        assert cache.stats().coalesced == 7
+
+    def test_failures_are_not_cached(self) -> None:
+        """Verify an error propagates and the next lookup recomputes."""
+        cache: LRUCache[int] = LRUCache(maxsize=4)
+
+        def fail() -> int:
+            raise QueryExecutionError("boom")
+
+        with pytest.raises(QueryExecutionError):
+            cache.get_or_compute("k", fail)
+        assert cache.get_or_compute("k", lambda: 5) == 5
+
+    def test_search_keys_on_normalized_term_and_version(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify spellings of one term share an entry per store version."""
+        get_search_cache().clear()
+        store = PlayerStore(sample_player_df, "v1")
+
+        assert cached_search_player_ids(store, "LeBron") == (0,)
+        assert cached_search_player_ids(store, "  lebron ") == (0,)
+        assert get_search_cache().stats().hits == 1
+
+        cached_search_player_ids(PlayerStore(sample_player_df, "v2"), "lebron")
+        assert get_search_cache().stats().misses == 2
+        get_search_cache().clear()
+
+
+class TestTeamReservoir:
+    """Tests for the away-team reservoir."""
+
+    PRESET = (850, 400, 200, 60)
+
+    @staticmethod
+    def _counting_generator() -> tuple[list[int], TeamGenerator]:
+        calls: list[int] = []
+
+        def generate(store: PlayerStore, thresholds: Thresholds) -> TeamIds:
+            calls.append(1)
+            return (len(calls), 0, 0, 0, 0)
+
+        return calls, generate
+
+    @staticmethod
+    def _wait_for(condition: Callable[[], bool]) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.005)
+
+    def test_background_fill_and_pop(self, sample_player_df: pd.DataFrame) -> None:
+        """Verify presets are filled to depth and pops need no generation."""
+        store = PlayerStore(sample_player_df, "v1")
+        calls, generate = self._counting_generator()
+        reservoir = TeamReservoir(
+            depth=3, generate=generate, get_store=lambda: store, presets=[self.PRESET]
+        )
+        reservoir.start()
+        try:
+            self._wait_for(lambda: reservoir.depth_of(self.PRESET) == 3)
+            generated = len(calls)
+            team = reservoir.pop(self.PRESET)
+        finally:
+            reservoir.stop(timeout=5)
+
+        assert team == (1, 0, 0, 0, 0)
+        assert generated == 3
+
+    def test_primed_thresholds_are_ready_for_the_first_pop(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify priming fills untracked thresholds in the background."""
+        store = PlayerStore(sample_player_df, "v1")
+        calls, generate = self._counting_generator()
+        reservoir = TeamReservoir(depth=2, generate=generate, get_store=lambda: store)
+        reservoir.start()
+        try:
+            reservoir.prime(self.PRESET)
+            self._wait_for(lambda: reservoir.depth_of(self.PRESET) == 2)
+            team = reservoir.pop(self.PRESET)
+            generated = len(calls)
+        finally:
+            reservoir.stop(timeout=5)
+
+        assert team == (1, 0, 0, 0, 0)
+        assert generated <= 3
+
+    def test_empty_reservoir_generates_inline(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a pop never fails just because the reservoir is empty."""
+        store = PlayerStore(sample_player_df, "v1")
+        calls, generate = self._counting_generator()
+        reservoir = TeamReservoir(depth=3, generate=generate, get_store=lambda: store)
+
+        assert reservoir.pop(self.PRESET) == (1, 0, 0, 0, 0)
+        assert len(calls) == 1
+
+    def test_teams_from_old_store_are_discarded(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify ids drawn from a replaced store are never served."""
+        stores = [PlayerStore(sample_player_df, "v1")]
+        _, generate = self._counting_generator()
+        reservoir = TeamReservoir(
+            depth=2,
+            generate=generate,
+            get_store=lambda: stores[0],
+            presets=[self.PRESET],
+        )
+        reservoir.start()
+        try:
+            self._wait_for(lambda: reservoir.depth_of(self.PRESET) == 2)
+            reservoir.stop(timeout=5)
+            stores[0] = PlayerStore(sample_player_df, "v2")
+            team = reservoir.pop(self.PRESET)
+        finally:
+            reservoir.stop(timeout=5)
+
+        assert team == (3, 0, 0, 0, 0)
+
+    def test_pop_for_an_older_store_leaves_the_queue(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a caller pinned to an older store gets a team drawn from it."""
+        old, new = (
+            PlayerStore(sample_player_df, "v1"),
+            PlayerStore(sample_player_df, "v2"),
+        )
+        drawn_from: list[str] = []
+
+        def generate(store: PlayerStore, thresholds: Thresholds) -> TeamIds:
+            drawn_from.append(store.version)
+            return (len(drawn_from), 0, 0, 0, 0)
+
+        reservoir = TeamReservoir(
+            depth=1, generate=generate, get_store=lambda: new, presets=[self.PRESET]
+        )
+        reservoir.start()
+        try:
+            self._wait_for(lambda: reservoir.depth_of(self.PRESET) == 1)
+            reservoir.stop(timeout=5)
+            team = reservoir.pop(self.PRESET, old)
+            depth = reservoir.depth_of(self.PRESET)
+        finally:
+            reservoir.stop(timeout=5)
+
+        assert team == (2, 0, 0, 0, 0)
+        assert drawn_from == ["v2", "v1"]
+        assert depth == 1
+
+    def test_infeasible_thresholds_raise_and_pause(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify failures reach the caller and refills stop retrying."""
+        store = PlayerStore(sample_player_df, "v1")
+        calls: list[int] = []
+
+        def fail(store: PlayerStore, thresholds: Thresholds) -> TeamIds:
+            calls.append(1)
+            raise QueryExecutionError("impossible")
+
+        reservoir = TeamReservoir(
+            depth=3, generate=fail, get_store=lambda: store, presets=[self.PRESET]
+        )
+        reservoir.start()
+        try:
+            self._wait_for(lambda: len(calls) >= 1)
+            time.sleep(0.05)
+            background_calls = len(calls)
+            with pytest.raises(QueryExecutionError):
+                reservoir.pop(self.PRESET)
+        finally:
+            reservoir.stop(timeout=5)
+
+        assert background_calls == 1
+
+    def test_custom_thresholds_are_bounded(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify old custom thresholds are evicted but presets are kept."""
+        store = PlayerStore(sample_player_df, "v1")
+        _, generate = self._counting_generator()
+        reservoir = TeamReservoir(
+            depth=1,
+            generate=generate,
+            get_store=lambda: store,
+            presets=[self.PRESET],
+            max_keys=3,
+        )
+        for pts in range(5):
+            reservoir.pop((pts, 0, 0, 0))
+
+        tracked = list(reservoir._teams)
+        assert len(tracked) == 3
+        assert self.PRESET in tracked
+        assert (4, 0, 0, 0) in tracked
+
+    def test_presets_follow_the_store(self, sample_player_df: pd.DataFrame) -> None:
+        """Verify resolved presets are re-resolved when the store changes."""
+        stores = [PlayerStore(sample_player_df, "v1")]
+        _, generate = self._counting_generator()
+        reservoir = TeamReservoir(
+            depth=1,
+            generate=generate,
+            get_store=lambda: stores[0],
+            presets=lambda store: [(len(store.version), 0, 0, 0)],
+        )
+        reservoir.pop((0, 0, 0, 0))
+        assert (2, 0, 0, 0) in reservoir._teams
+
+        stores[0] = PlayerStore(sample_player_df, "v10")
+        reservoir.pop((0, 0, 0, 0))
+
+        assert (2, 0, 0, 0) not in reservoir._teams
+        assert (3, 0, 0, 0) in reservoir._teams
+
+
+class TestSimilarPlayers:
+    """Tests for the k-nearest-neighbour similar-player search."""
+
+    def test_blocked_search_matches_brute_force(self) -> None:
+        """Top-k merged across blocks equals a full sort of distances."""
+        rng = np.random.default_rng(0)
+        stats = rng.random((50, len(STAT_COLUMNS))).astype(np.float32)
+        index = SimilarityIndex(stats, block_rows=7)
+
+        ids, distances = index.nearest(3, k=6)
+
+        z = (stats - stats.mean(axis=0)) / stats.std(axis=0)
+        expected = np.sqrt(((z - z[3]) ** 2).sum(axis=1))
+        expected[3] = np.inf
+        np.testing.assert_array_equal(ids, np.argsort(expected)[:6])
+        np.testing.assert_allclose(distances, np.sort(expected)[:6], rtol=1e-4)
+
+    def test_pruning_keeps_every_query_exact(self) -> None:
+        """Sampled bounds drop rows without changing any query's top k."""
+        rng = np.random.default_rng(1)
+        stats = rng.random((400, len(STAT_COLUMNS))).astype(np.float32)
+        index = SimilarityIndex(stats, block_rows=128)
+        z = (stats - stats.mean(axis=0)) / stats.std(axis=0)
+        queries = z[[0, 17, 250, 399]]
+
+        with patch("src.database.similarity._PRUNE_SAMPLE", 8):
+            ids, distances = index.query(queries, k=5)
+
+        expected = np.sqrt(((z[None, :, :] - queries[:, None, :]) ** 2).sum(axis=2))
+        np.testing.assert_array_equal(ids, np.argsort(expected, axis=1)[:, :5])
+        np.testing.assert_allclose(
+            distances, np.sort(expected, axis=1)[:, :5], rtol=1e-3, atol=1e-3
+        )
+
+    def test_k_is_capped_by_table_size(self) -> None:
+        """Asking for more neighbours than exist returns everyone else."""
+        index = SimilarityIndex(np.eye(3, len(STAT_COLUMNS), dtype=np.float32))
+        ids, _ = index.nearest(0, k=10)
+        assert sorted(ids.tolist()) == [1, 2]
+
+    def test_per_game_compares_rates(self) -> None:
+        """Per game, a half-season copy of a player is their closest match."""
+        full = np.arange(1, len(STAT_COLUMNS) + 1, dtype=np.float32) * 10
+        rate_cols = [i for i, col in enumerate(STAT_COLUMNS) if col.endswith("_PCT")]
+        half = full / 2
+        half[rate_cols] = full[rate_cols]
+        stats = np.stack([full, half, full * 0.6, full * 3])
+        games = np.array([80.0, 40.0, 80.0, 80.0])
+
+        totals_ids, _ = SimilarityIndex(stats).nearest(0, k=1)
+        per_game_ids, per_game_d = SimilarityIndex(stats, games).nearest(0, k=1)
+
+        assert totals_ids.tolist() == [2]
+        assert per_game_ids.tolist() == [1]
+        # float32 |q|^2 + |x|^2 - 2q.x leaves a little rounding at distance 0
+        assert per_game_d[0] == pytest.approx(0.0, abs=1e-2)
+
+    def test_find_similar_players_frame(self, sample_player_df: pd.DataFrame) -> None:
+        """Results are player records with a DISTANCE column, closest first."""
+        frame = pd.concat([sample_player_df] * 3, ignore_index=True)
+        store = PlayerStore(frame, "test-v1")
+
+        similar = find_similar_players(store, 0, k=3)
+
+        assert list(similar.columns) == ["FULL_NAME", "DISTANCE", *STAT_COLUMNS]
+        assert 0 not in similar.index
+        # Rows 2 and 4 are copies of row 0
+        assert set(similar.index[:2]) == {2, 4}
+        assert similar.loc[2, "DISTANCE"] == pytest.approx(0.0, abs=1e-2)
+        assert similar["DISTANCE"].is_monotonic_increasing
+        assert get_similarity_index(store) is get_similarity_index(store)
+        assert get_similarity_index(store, per_game=True) is not get_similarity_index(
+            store
+        )
+
+
+class TestRankTable:
+    """Tests for percentile pools from precomputed rank tables."""
+
+    @pytest.fixture
+    def frame(self) -> pd.DataFrame:
+        """Two hundred players with distinct, shuffled stats."""
+        rng = np.random.default_rng(7)
+        return pd.DataFrame(
+            {col: rng.permutation(200) * 10 + 5 for col in DIFFICULTY_COLUMNS}
+        )
+
+    @pytest.mark.parametrize("percentile", [0, 50, 92.5, 99.9, 100])
+    def test_pool_size_follows_percentile(
+        self, frame: pd.DataFrame, percentile: float
+    ) -> None:
+        """Verify a percentile's pool is exactly the players ranked above it."""
+        ranks = RankTable(frame)
+        pool = ranks.pool("PTS", percentile)
+
+        expected = len(frame) - int(np.ceil(len(frame) * percentile / 100))
+        assert len(pool) == expected
+        rest = frame["PTS"].drop(index=pool)
+        if len(pool) and len(rest):
+            assert frame["PTS"][pool].min() > rest.max()
+
+    def test_thresholds_select_the_same_pools(self, frame: pd.DataFrame) -> None:
+        """Verify resolved thresholds reproduce the percentile pools."""
+        ranks = RankTable(frame)
+        percentiles = (90.0, 95.0, 50.0, 0.0)
+
+        for column, percentile, threshold in zip(
+            DIFFICULTY_COLUMNS, percentiles, ranks.thresholds(percentiles), strict=True
+        ):
+            above = frame.index[frame[column] > threshold]
+            assert set(ranks.pool_above(column, threshold)) == set(above)
+            assert set(above) == set(ranks.pool(column, percentile))
+
+        with pytest.raises(ValueError, match="between 0 and 100"):
+            ranks.pool("PTS", 101)
+
+    @pytest.mark.parametrize("threshold", [-1, 4, 5, 1000, 1994, 1995, 5000])
+    def test_count_above_matches_filter(
+        self, frame: pd.DataFrame, threshold: int
+    ) -> None:
+        """Verify pool sizes from binary search match a DataFrame filter."""
+        ranks = RankTable(frame)
+        for column in DIFFICULTY_COLUMNS:
+            assert ranks.count_above(column, threshold) == int(
+                (frame[column] > threshold).sum()
+            )
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_feasibility_matches_brute_force(self, seed: int) -> None:
+        """Verify the feasibility check agrees with trying every team."""
+        rng = np.random.default_rng(seed)
+        frame = pd.DataFrame(
+            {col: rng.integers(0, 6, size=8) for col in DIFFICULTY_COLUMNS}
+        )
+        ranks = RankTable(frame)
+        thresholds = (
+            int(rng.integers(2, 5)),
+            int(rng.integers(2, 5)),
+            int(rng.integers(2, 5)),
+            int(rng.integers(2, 5)),
+        )
+        pools = [
+            set(frame.index[frame[column] > threshold])
+            for column, threshold in zip(DIFFICULTY_COLUMNS, thresholds, strict=True)
+        ]
+        pts, reb, ast, stl = pools
+        exists = any(
+            team[0] in pts and team[1] in pts and team[2] in reb
+            for team in permutations(range(len(frame)), 5)
+            if team[3] in ast and team[4] in stl
+        )
+
+        reason = infeasible_reason(ranks, thresholds)
+        assert (reason is None) == exists, reason
+
+    def test_overlapping_pools_are_infeasible(self) -> None:
+        """Verify pools that are each big enough can still be too shared."""
+        frame = pd.DataFrame(
+            {"PTS": [9] * 6, "REB": [9, 9, 0, 0, 0, 0], "AST": [9, 9, 0, 0, 0, 0]}
+        )
+        frame["STL"] = frame["REB"]
+        ranks = RankTable(frame)
+
+        reason = infeasible_reason(ranks, (0, 5, 5, 5))
+
+        assert reason == "2 distinct in the REB/AST/STL pools, 3 needed"
+        assert infeasible_reason(ranks, (0, -1, 5, 5)) is None
+
+    def test_presets_scale_with_the_data(self) -> None:
+        """Verify preset pools keep their share of a larger table."""
+        df = load_data()
+        store = PlayerStore(df, "1x")
+        larger = PlayerStore(pd.concat([df] * 3, ignore_index=True), "3x")
+
+        small = difficulty_thresholds(store.ranks)
+        for name, thresholds in difficulty_thresholds(larger.ranks).items():
+            assert len(set(generate_away_team(larger, thresholds))) == 5
+            in_small = len(store.ranks.pool_above("PTS", small[name][0]))
+            in_large = len(larger.ranks.pool_above("PTS", thresholds[0]))
+            assert in_large == pytest.approx(3 * in_small, abs=3)
+
+
+def _team_frame(count: int) -> pd.DataFrame:
+    """Players who all clear the Regular thresholds."""
+    df = pd.DataFrame(
+        {
+            "FULL_NAME": [f"Player{i}" for i in range(count)],
+            "PTS": 2000,
+            "REB": 1000,
+            "AST": 500,
+            "STL": 200,
+        }
+    )
+    for col in PLAYER_COLUMNS:
+        if col not in df.columns:
+            df[col] = df["FULL_NAME"].str.lower() if col.endswith("_LOWER") else 0
+    return df
+
+
+@pytest.fixture
+def player_db(tmp_path: Path, sample_player_df: pd.DataFrame) -> SQLiteBackend:
+    """The sample players plus a LeBron namesake, as a SQLite backend."""
+    frame = pd.concat([sample_player_df, sample_player_df.iloc[[0]]])
+    frame.to_csv(tmp_path / "players.csv", index=False)
+    return SQLiteBackend(
+        build_player_database(tmp_path / "players.csv", tmp_path / "players.sqlite")
+    )
+
+
+class TestSQLiteBackend:
+    """Tests for running the player queries against SQLite."""
+
+    @pytest.mark.parametrize("term", ["lebron", "Jordan", "mi", "j", "", "nobody"])
+    def test_search_matches_dataframe(
+        self, player_db: SQLiteBackend, sample_player_df: pd.DataFrame, term: str
+    ) -> None:
+        """FTS5 and short-term LIKE search agree with the pandas search."""
+        frame = pd.concat([sample_player_df, sample_player_df.iloc[[0]]])
+        frame = frame.reset_index(drop=True)
+
+        assert search_player_ids_by_name(player_db, term) == (
+            search_player_ids_by_name(frame, term)
+        )
+        assert search_player_by_name(player_db, term) == (
+            search_player_by_name(frame, term)
+        )
+
+    def test_full_name_lookup_matches_dataframe(
+        self, player_db: SQLiteBackend, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Records, row ids and dtypes match the CSV read through pandas."""
+        names = ["Michael Jordan", "LeBron James", "Nobody"]
+        frame = pd.concat([sample_player_df, sample_player_df.iloc[[0]]])
+        expected = get_players_by_full_names(frame.reset_index(drop=True), names)
+
+        pd.testing.assert_frame_equal(
+            get_players_by_full_names(player_db, names), expected
+        )
+        assert resolve_player_ids(player_db, names) == {"Michael Jordan": 1}
+
+    def test_away_team_from_indexes(self, tmp_path: Path) -> None:
+        """An away team is five distinct players drawn from the database."""
+        _team_frame(10).to_csv(tmp_path / "team.csv", index=False)
+        db = SQLiteBackend(
+            build_player_database(tmp_path / "team.csv", tmp_path / "team.sqlite")
+        )
+
+        team = get_away_team_by_stats(db, 1000, 500, 300, 100)
+        assert len(team) == 5
+        assert team.index.is_unique
+        with pytest.raises(QueryExecutionError):
+            get_away_team_by_stats(db, 5000, 500, 300, 100)
+
+    @staticmethod
+    def _ranked_db(tmp_path: Path) -> tuple[SQLiteBackend, FrameBackend]:
+        rng = np.random.default_rng(7)
+        df = _team_frame(200)
+        # Plenty of ties, so pool order depends on the id tiebreak
+        for col in DIFFICULTY_COLUMNS:
+            df[col] = rng.integers(0, 20, len(df))
+        df.to_csv(tmp_path / "ranked.csv", index=False)
+        db = SQLiteBackend(
+            build_player_database(
+                tmp_path / "ranked.csv", tmp_path / "ranked.sqlite", batch_rows=64
+            )
+        )
+        return db, FrameBackend(df, RankTable(df))
+
+    def test_rank_table_pools_match_memory(self, tmp_path: Path) -> None:
+        """Pool sizes and picked positions agree with the in-memory backend."""
+        db, frame = self._ranked_db(tmp_path)
+        assert db.ranked_columns == frozenset(DIFFICULTY_COLUMNS)
+
+        for col in DIFFICULTY_COLUMNS:
+            for threshold in (-1, 0, 7, 18.5, 19, 25):
+                count = frame.count_above(col, threshold)
+                assert db.count_above(col, threshold) == count
+                np.testing.assert_array_equal(
+                    db.pool_above(col, threshold), frame.pool_above(col, threshold)
+                )
+                positions = np.random.default_rng(1).integers(0, max(count, 1), 50)
+                if count:
+                    np.testing.assert_array_equal(
+                        db.pick_above(col, threshold, positions),
+                        frame.pick_above(col, threshold, positions),
+                    )
+
+    def test_picks_are_batched_index_lookups(self, tmp_path: Path) -> None:
+        """A large batch of picks runs a few IN queries, never an OFFSET walk."""
+        db, _ = self._ranked_db(tmp_path)
+        assert db.ranked_columns and len(db)
+        statements: list[str] = []
+        db._connection().set_trace_callback(statements.append)
+
+        positions = np.random.default_rng(2).integers(0, 100, 5000)
+        db.pick_above("PTS", 9, positions)
+
+        # One probe for the pool's first rank, one IN query for the picks
+        assert len(statements) == 2
+        assert not any("OFFSET" in sql for sql in statements)
+
+    def test_databases_without_ranks_still_pick(self, tmp_path: Path) -> None:
+        """Databases built before the rank table fall back to the stat indexes."""
+        db, frame = self._ranked_db(tmp_path)
+        with sqlite3.connect(db.path) as conn:
+            conn.execute("DROP TABLE player_ranks")
+        old = SQLiteBackend(db.path)
+        positions = np.arange(5)
+
+        assert old.ranked_columns == frozenset()
+        assert old.count_above("REB", 10) == frame.count_above("REB", 10)
+        np.testing.assert_array_equal(
+            old.pick_above("REB", 10, positions),
+            frame.pick_above("REB", 10, positions),
+        )
+
+    def test_missing_values_in_later_batches(self, tmp_path: Path) -> None:
+        """Column dtypes follow the whole CSV, not just its first batch."""
+        df = _team_frame(6)
+        df["FLAG"] = pd.Series([True] * 6, dtype=object)
+        df["GP"] = df["GP"].astype(object)
+        df.loc[4, ["GP", "FLAG"]] = None
+        df.to_csv(tmp_path / "gaps.csv", index=False)
+        db = SQLiteBackend(
+            build_player_database(
+                tmp_path / "gaps.csv", tmp_path / "gaps.sqlite", batch_rows=2
+            )
+        )
+        expected = pd.read_csv(tmp_path / "gaps.csv")
+
+        rows = db.rows([0, 4])
+
+        assert rows["GP"].dtype == expected["GP"].dtype == np.float64
+        assert np.isnan(rows.loc[4, "GP"])
+        assert rows["FLAG"].dtype == expected["FLAG"].dtype
+        assert rows.loc[4, "FLAG"] is None
+
+    def test_connections_pooled_per_thread(self, player_db: SQLiteBackend) -> None:
+        """Each thread reuses one read-only connection of its own."""
+        search_player_ids_by_name(player_db, "lebron")
+        mine = player_db._connection()
+        assert player_db._connection() is mine
+
+        theirs: list[object] = []
+        thread = threading.Thread(target=lambda: theirs.append(player_db._connection()))
+        thread.start()
+        thread.join()
+        assert theirs[0] is not mine
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            mine.execute("DELETE FROM players")
+
+    def test_missing_inputs_raise_connection_error(self, tmp_path: Path) -> None:
+        """A missing database, or a CSV without the player columns, is rejected."""
+        with pytest.raises(DatabaseConnectionError, match="not found"):
+            SQLiteBackend(tmp_path / "missing.sqlite")
+
+        pd.DataFrame({"NAME": ["x"]}).to_csv(tmp_path / "bad.csv", index=False)
+        with pytest.raises(DatabaseConnectionError, match="missing columns"):
+            build_player_database(tmp_path / "bad.csv", tmp_path / "bad.sqlite")
+        assert not (tmp_path / "bad.sqlite").exists()
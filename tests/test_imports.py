@@ -0,0 +1,105 @@
+"""Import-time budgets for the landing page and the core packages.
+
+Each check imports in a fresh interpreter under ``-X importtime`` and
+counts only modules the interpreter does not load on its own.
+"""
+
+import ast
+import subprocess
+import sys
+from functools import cache
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Seconds of import time allowed per statement; generous enough for a slow
+# CI runner, far below what pandas or TensorFlow at module scope would cost
+BUDGETS = {
+    "app.py": 1.5,
+    "src.database": 0.25,
+    "src.ml": 0.25,
+    "src.ml.model": 1.0,
+}
+
+
+def import_statement(target: str) -> str:
+    """Build the import statement for a module, or for a script's imports."""
+    if not target.endswith(".py"):
+        return f"import {target}"
+    tree = ast.parse((PROJECT_ROOT / target).read_text())
+    modules = [
+        node.module
+        for node in tree.body
+        if isinstance(node, ast.ImportFrom) and node.module
+    ]
+    modules += [
+        alias.name
+        for node in tree.body
+        if isinstance(node, ast.Import)
+        for alias in node.names
+    ]
+    return f"import {', '.join(modules)}"
+
+
+@cache
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import made by ``statement``."""
+    result = subprocess.run(  # noqa: S603 - runs this interpreter on fixed code
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nesting is shown by indentation after the separator's one space
+        times[name[1:].rstrip()] = int(cumulative)
+    return times
+
+
+def loaded(statement: str) -> set[str]:
+    """Every module name imported while running ``statement``."""
+    return {name.strip() for name in import_times(statement)}
+
+
+def own_seconds(statement: str) -> float:
+    """Import time of ``statement`` beyond interpreter startup."""
+    startup = import_times("pass")
+    return (
+        sum(
+            micros
+            for name, micros in import_times(statement).items()
+            if not name.startswith(" ") and name not in startup
+        )
+        / 1e6
+    )
+
+
+@pytest.mark.parametrize("target", list(BUDGETS))
+def test_import_budget(target: str) -> None:
+    """Importing each target stays within its budget."""
+    seconds = own_seconds(import_statement(target))
+    assert seconds < BUDGETS[target], f"{target} took {seconds:.2f}s to import"
+
+
+def test_landing_page_skips_data_and_model_stack() -> None:
+    """app.py renders without pandas, NumPy or TensorFlow."""
+    heavy = {"pandas", "numpy", "tensorflow"}
+    assert not heavy & loaded(import_statement("app.py"))
+
+
+def test_database_package_is_lazy() -> None:
+    """Importing the package does not load pandas until a name is used."""
+    assert "pandas" not in loaded("import src.database")
+    assert "pandas" in loaded("from src.database import PlayerStore")
+
+
+def test_model_module_skips_tensorflow() -> None:
+    """Serving code never imports TensorFlow."""
+    assert not {"tensorflow", "keras"} & loaded("import src.ml.model")
@@ -1,11 +1,39 @@
 """Tests for ML model module."""
 
+import json
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
 
-from src.ml.model import ModelLoadError, analyze_team_stats, predict_winner
+from src.config import STAT_COLUMNS
+from src.ml.bundle import (
+    MANIFEST_NAME,
+    BundleSchemaError,
+    load_bundle,
+    save_bundle,
+)
+from src.ml.model import (
+    ModelLoadError,
+    analyze_team_stats,
+    get_model_bundle,
+    get_model_version,
+    get_variant_bundle,
+    predict_win_probabilities,
+    predict_winner,
+    reload_model_bundle,
+    reset_model_bundles,
+)
+
+
+def _random_layers(seed: int = 0) -> list[tuple[np.ndarray, np.ndarray, str]]:
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.normal(size=(100, 8)), rng.normal(size=8), "relu"),
+        (rng.normal(size=(8, 1)), rng.normal(size=1), "sigmoid"),
+    ]
 
 
 class TestAnalyzeTeamStats:
@@ -38,6 +66,43 @@ class TestAnalyzeTeamStats:
         assert combined[0][0] == 0.0
         assert combined[0][50] == 50.0
 
+    def test_float32_arrays_are_viewed(self) -> None:
+        """Float32 stat matrices come back as views, not copies."""
+        home = np.arange(50, dtype=np.float32).reshape(5, 10)
+        away = home + 50
+
+        home_array, away_array, combined = analyze_team_stats(home, away)
+
+        assert home_array.dtype == np.float32
+        assert np.shares_memory(home_array, home)
+        assert np.shares_memory(away_array, away)
+        np.testing.assert_array_equal(combined[0], np.arange(100))
+
+    def test_batched_teams(self) -> None:
+        """(N, 5, 10) inputs produce one row per game."""
+        rng = np.random.default_rng(0)
+        home = rng.random((4, 5, 10), dtype=np.float32)
+        away = rng.random((4, 5, 10), dtype=np.float32)
+
+        home_array, away_array, combined = analyze_team_stats(home, away)
+
+        assert home_array.shape == away_array.shape == (4, 50)
+        assert combined.shape == (4, 100)
+        np.testing.assert_array_equal(
+            combined[2], np.concatenate([home[2].ravel(), away[2].ravel()])
+        )
+
+    def test_game_tensor_needs_no_copy(self) -> None:
+        """A (N, 2, 5, 10) tensor is split and flattened as views."""
+        games = np.random.default_rng(1).random((3, 2, 5, 10), dtype=np.float32)
+
+        home_array, away_array, combined = analyze_team_stats(games)
+
+        assert combined.shape == (3, 100)
+        assert np.shares_memory(combined, games)
+        np.testing.assert_array_equal(home_array[1], games[1, 0].ravel())
+        np.testing.assert_array_equal(away_array[1], games[1, 1].ravel())
+
 
 class TestAnalyzeTeamStatsValidation:
     """Tests for input shape validation in analyze_team_stats."""
@@ -74,17 +139,32 @@ class TestAnalyzeTeamStatsValidation:
         with pytest.raises(ValueError, match="stats, expected 10"):
             analyze_team_stats(home_stats, away_stats)
 
+    def test_wrong_stat_count_in_array_raises_error(self) -> None:
+        """Array inputs are validated by shape."""
+        with pytest.raises(ValueError, match="stats, expected 10"):
+            analyze_team_stats(np.zeros((5, 10)), np.zeros((5, 9)))
+
+    def test_mismatched_batches_raise_error(self) -> None:
+        """Home and away batches must be the same size."""
+        with pytest.raises(ValueError, match="differ in shape"):
+            analyze_team_stats(np.zeros((3, 5, 10)), np.zeros((2, 5, 10)))
+
+    def test_bad_game_tensor_raises_error(self) -> None:
+        """A game tensor must be (N, 2, 5, 10)."""
+        with pytest.raises(ValueError, match="game tensor"):
+            analyze_team_stats(np.zeros((3, 2, 4, 10)))
+
 
 class TestPredictWinner:
     """Tests for predict_winner function."""
 
-    @patch("src.ml.model.get_winner_model")
+    @patch("src.ml.model.get_model_bundle")
     def test_returns_probability_and_prediction(
         self, mock_get_model: MagicMock
     ) -> None:
         """Test that function returns (probability, prediction) tuple."""
         mock_model = MagicMock()
-        mock_model.predict.return_value = np.array([[0.75]])
+        mock_model.predict_proba.return_value = np.array([0.75])
         mock_get_model.return_value = mock_model
 
         stats = np.random.rand(1, 100)
@@ -95,11 +175,11 @@ class TestPredictWinner:
         assert 0.0 <= probability <= 1.0
         assert prediction in (0, 1)
 
-    @patch("src.ml.model.get_winner_model")
+    @patch("src.ml.model.get_model_bundle")
     def test_high_probability_predicts_win(self, mock_get_model: MagicMock) -> None:
         """Test that high probability (>0.5) predicts home win (1)."""
         mock_model = MagicMock()
-        mock_model.predict.return_value = np.array([[0.8]])
+        mock_model.predict_proba.return_value = np.array([0.8])
         mock_get_model.return_value = mock_model
 
         stats = np.random.rand(1, 100)
@@ -108,11 +188,11 @@ class TestPredictWinner:
         assert probability == 0.8
         assert prediction == 1
 
-    @patch("src.ml.model.get_winner_model")
+    @patch("src.ml.model.get_model_bundle")
     def test_low_probability_predicts_loss(self, mock_get_model: MagicMock) -> None:
         """Test that low probability (<0.5) predicts home loss (0)."""
         mock_model = MagicMock()
-        mock_model.predict.return_value = np.array([[0.3]])
+        mock_model.predict_proba.return_value = np.array([0.3])
         mock_get_model.return_value = mock_model
 
         stats = np.random.rand(1, 100)
@@ -121,7 +201,7 @@ class TestPredictWinner:
         assert probability == 0.3
         assert prediction == 0
 
-    @patch("src.ml.model.get_winner_model")
+    @patch("src.ml.model.get_model_bundle")
     def test_invalid_shape_raises_error(self, mock_get_model: MagicMock) -> None:
         """Test that invalid input shape raises ValueError."""
         mock_model = MagicMock()
@@ -135,17 +215,17 @@ class TestPredictWinner:
 
         assert "Expected input shape (1, 100)" in str(exc_info.value)
 
-    @patch("src.ml.model.get_winner_model")
-    def test_model_called_with_verbose_zero(self, mock_get_model: MagicMock) -> None:
-        """Test that model.predict is called with verbose=0."""
+    @patch("src.ml.model.get_model_bundle")
+    def test_bundle_called_with_stats(self, mock_get_model: MagicMock) -> None:
+        """Test that the serving bundle is called once with the input stats."""
         mock_model = MagicMock()
-        mock_model.predict.return_value = np.array([[0.5]])
+        mock_model.predict_proba.return_value = np.array([0.5])
         mock_get_model.return_value = mock_model
 
         stats = np.random.rand(1, 100)
         predict_winner(stats)
 
-        mock_model.predict.assert_called_once_with(stats, verbose=0)
+        mock_model.predict_proba.assert_called_once_with(stats)
 
 
 class TestLoadRealModel:
@@ -183,3 +263,146 @@ class TestGetWinnerModel:
             get_winner_model("nonexistent.keras")
 
         assert "not found" in str(exc_info.value)
+
+
+class TestModelBundle:
+    """Tests for saving, validating and loading model bundles."""
+
+    def test_round_trip_preserves_predictions(self, tmp_path: Path) -> None:
+        """Verify a saved bundle loads back with identical outputs."""
+        saved = save_bundle(tmp_path, _random_layers(), {"val_accuracy": 0.7})
+        loaded = load_bundle(tmp_path)
+
+        x = np.random.default_rng(1).random((16, 100)).astype(np.float32)
+        np.testing.assert_array_equal(saved.predict_proba(x), loaded.predict_proba(x))
+        assert loaded.version == saved.version
+        assert loaded.metrics == {"val_accuracy": 0.7}
+        assert loaded.stat_columns == tuple(STAT_COLUMNS)
+
+    def test_version_changes_with_content(self, tmp_path: Path) -> None:
+        """Verify different weights produce a different version."""
+        first = save_bundle(tmp_path / "a", _random_layers(0))
+        second = save_bundle(tmp_path / "b", _random_layers(1))
+
+        assert first.version != second.version
+        assert get_model_version(tmp_path / "a") == first.version
+
+    def test_checksum_mismatch_raises_error(self, tmp_path: Path) -> None:
+        """Verify tampered weights are rejected."""
+        save_bundle(tmp_path, _random_layers())
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        weights = tmp_path / manifest["weights"]
+        weights.write_bytes(weights.read_bytes() + b"\0")
+
+        with pytest.raises(ModelLoadError, match="Checksum mismatch"):
+            load_bundle(tmp_path)
+
+    def test_schema_mismatch_fails_fast(self, tmp_path: Path) -> None:
+        """Verify a bundle with a different feature order is rejected on load."""
+        save_bundle(tmp_path, _random_layers())
+        manifest_path = tmp_path / MANIFEST_NAME
+        manifest = json.loads(manifest_path.read_text())
+        manifest["stat_columns"] = list(reversed(manifest["stat_columns"]))
+        manifest_path.write_text(json.dumps(manifest))
+
+        with pytest.raises(BundleSchemaError, match="STAT_COLUMNS"):
+            load_bundle(tmp_path)
+
+    def test_wrong_input_width_rejected_on_save(self, tmp_path: Path) -> None:
+        """Verify layers that do not accept 100 features cannot be saved."""
+        layers = [(np.ones((50, 1)), np.ones(1), "sigmoid")]
+
+        with pytest.raises(ModelLoadError, match="kernel has shape"):
+            save_bundle(tmp_path, layers)
+
+    def test_missing_bundle_raises_error(self, tmp_path: Path) -> None:
+        """Verify a missing bundle raises ModelLoadError."""
+        with pytest.raises(ModelLoadError, match="not found"):
+            load_bundle(tmp_path / "missing")
+
+    def test_real_bundle_matches_keras_checkpoint(self) -> None:
+        """Verify the shipped bundle reproduces winner.keras predictions."""
+        from src.ml.model import get_winner_model
+
+        bundle = get_model_bundle()
+        model = get_winner_model()
+        x = np.random.default_rng(2).random((32, 100)).astype(np.float32) * 100
+
+        np.testing.assert_allclose(
+            bundle.predict_proba(x), model.predict(x, verbose=0)[:, 0], atol=1e-5
+        )
+
+
+@pytest.fixture
+def fresh_bundles() -> Iterator[None]:
+    """Forget loaded bundles before and after a test."""
+    reset_model_bundles()
+    yield
+    reset_model_bundles()
+
+
+class TestBundleReload:
+    """Tests for serving a cached bundle and swapping in a new one."""
+
+    def test_bundle_loaded_once(self, tmp_path: Path, fresh_bundles: None) -> None:
+        """Verify repeated lookups share one bundle without rereading it."""
+        save_bundle(tmp_path, _random_layers())
+        first = get_model_bundle(tmp_path)
+
+        save_bundle(tmp_path, _random_layers(1))
+        assert get_model_bundle(tmp_path) is first
+
+    def test_reload_swaps_in_new_bundle(
+        self, tmp_path: Path, fresh_bundles: None
+    ) -> None:
+        """Verify a reload publishes the bundle now on disk."""
+        first = save_bundle(tmp_path, _random_layers())
+        get_model_bundle(tmp_path)
+
+        second = save_bundle(tmp_path, _random_layers(1))
+        reload_model_bundle(tmp_path)
+        assert get_model_bundle(tmp_path).version == second.version != first.version
+
+    def test_failed_reload_keeps_current_bundle(
+        self, tmp_path: Path, fresh_bundles: None
+    ) -> None:
+        """Verify a corrupt update leaves the served bundle in place."""
+        saved = save_bundle(tmp_path, _random_layers())
+        current = get_model_bundle(tmp_path)
+        weights = (
+            tmp_path / json.loads((tmp_path / MANIFEST_NAME).read_text())["weights"]
+        )
+        weights.write_bytes(b"corrupt")
+
+        with pytest.raises(ModelLoadError):
+            reload_model_bundle(tmp_path)
+        assert get_model_bundle(tmp_path) is current
+        assert current.version == saved.version
+
+
+class TestStudentServing:
+    """Tests for serving the distilled student model."""
+
+    def test_no_student_is_shipped(self) -> None:
+        """Verify no student is served until one meets the agreement bar."""
+        with pytest.raises(ModelLoadError, match="not found"):
+            get_variant_bundle("student")
+
+    def test_student_served_from_its_bundle(self, tmp_path: Path) -> None:
+        """Verify a written student bundle is served with its teacher recorded."""
+        teacher = get_variant_bundle("teacher")
+        save_bundle(tmp_path, _random_layers(), teacher=teacher.version)
+        x = np.random.default_rng(3).random((8, 100)).astype(np.float32) * 100
+
+        with patch.dict("src.ml.model.VARIANT_PATHS", {"student": tmp_path}):
+            assert get_variant_bundle("student").teacher == teacher.version
+            for variant in ("teacher", "student"):
+                probabilities = predict_win_probabilities(x, variant=variant)
+                assert probabilities.shape == (8,)
+                assert np.all((probabilities >= 0.0) & (probabilities <= 1.0))
+
+    def test_teacher_records_no_teacher(self, tmp_path: Path) -> None:
+        """Verify bundles saved without a teacher load with teacher=None."""
+        save_bundle(tmp_path, _random_layers())
+
+        assert load_bundle(tmp_path).teacher is None
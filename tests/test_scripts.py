@@ -0,0 +1,139 @@
+"""Tests for the command-line scripts' pure helpers."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.generate_matchups import (
+    SHARD_MANIFEST,
+    heuristic_teacher,
+    matchup_features,
+    sample_matchups,
+    write_shards,
+)
+from scripts.play_games import (
+    AWAY_COLUMNS,
+    HOME_COLUMNS,
+    Game,
+    parse_args,
+    plan_games,
+    read_matchups,
+)
+from src.config import STAT_COLUMNS, TEAM_SIZE
+from src.database.store import PlayerStore
+
+PLAYER_NAMES = [f"Player {chr(ord('A') + i)}" for i in range(10)]
+
+
+@pytest.fixture
+def named_store(sample_player_df: pd.DataFrame) -> PlayerStore:
+    """Store of ten distinct players, Player A..J."""
+    template = sample_player_df.iloc[[0]]
+    rows = []
+    for name in PLAYER_NAMES:
+        row = template.copy()
+        row["FULL_NAME"] = name
+        rows.append(row)
+    return PlayerStore(pd.concat(rows, ignore_index=True), "test-v1")
+
+
+class TestPlayGames:
+    """Tests for the headless game runner's input handling."""
+
+    def test_short_rows_are_skipped(
+        self, tmp_path: Path, named_store: PlayerStore
+    ) -> None:
+        """A row with fewer cells than the header skips, and the run goes on."""
+        path = tmp_path / "matchups.csv"
+        full = ",".join(PLAYER_NAMES)
+        path.write_text(
+            ",".join(HOME_COLUMNS + AWAY_COLUMNS)
+            + "\n"
+            + ",".join(PLAYER_NAMES[:3])
+            + "\n"
+            + full
+            + "\n"
+        )
+
+        matchups = list(read_matchups(path, "Regular"))
+        games = list(plan_games(iter(matchups), named_store, games_per_roster=1))
+
+        assert matchups[0].home == (*PLAYER_NAMES[:3], "", "")
+        assert matchups[0].away is None
+        assert games == [None, Game(1, (0, 1, 2, 3, 4), (5, 6, 7, 8, 9), "explicit")]
+
+    @pytest.mark.parametrize("batch_size", ["0", "-1"])
+    def test_batch_size_must_be_positive(self, tmp_path: Path, batch_size: str) -> None:
+        """A batch size below 1 is a usage error, not an empty or failed run."""
+        path = tmp_path / "rosters.txt"
+        path.write_text(",".join(PLAYER_NAMES[:5]) + "\n")
+
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args([str(path), "--batch-size", batch_size])
+
+        assert exc_info.value.code == 2
+
+    def test_matchup_csv_needs_home_columns(self, tmp_path: Path) -> None:
+        """A matchup CSV without the home columns is rejected up front."""
+        path = tmp_path / "matchups.csv"
+        path.write_text("a,b\nx,y\n")
+
+        with pytest.raises(SystemExit):
+            parse_args([str(path)])
+
+
+class TestGenerateMatchups:
+    """Tests for synthetic matchup sampling and sharding."""
+
+    def test_rosters_are_distinct_players(self) -> None:
+        """Every matchup is ten distinct players, five a side."""
+        ids = sample_matchups(np.random.default_rng(0), n_players=40, n_games=500)
+
+        assert ids.shape == (500, 2 * TEAM_SIZE)
+        assert ids.dtype == np.int32
+        assert ids.min() >= 0 and ids.max() < 40
+        for row in ids:
+            assert len(set(row[:TEAM_SIZE])) == TEAM_SIZE
+            assert len(set(row)) == 2 * TEAM_SIZE
+
+    def test_duplicates_are_redrawn(self) -> None:
+        """With an exactly-sized pool nearly every first draw repeats a player."""
+        ids = sample_matchups(np.random.default_rng(1), n_players=10, n_games=50)
+
+        np.testing.assert_array_equal(
+            np.sort(ids, axis=1), np.tile(np.arange(10), (50, 1))
+        )
+        again = sample_matchups(np.random.default_rng(1), n_players=10, n_games=50)
+        np.testing.assert_array_equal(ids, again)
+
+    def test_pool_must_fill_a_matchup(self) -> None:
+        """Fewer players than matchup slots is rejected, not looped on."""
+        with pytest.raises(ValueError, match="at least 10"):
+            sample_matchups(np.random.default_rng(0), n_players=9, n_games=1)
+
+    def test_shard_shapes(self, tmp_path: Path) -> None:
+        """Shards split at shard_rows and hold features, labels and ids per row."""
+        stats = np.random.default_rng(2).random((30, len(STAT_COLUMNS)))
+        stats = stats.astype(np.float32)
+        width = 2 * TEAM_SIZE * len(STAT_COLUMNS)
+
+        shards = write_shards(
+            stats, heuristic_teacher(stats, 4.0), tmp_path, 7, 3, seed=3
+        )
+
+        manifest = json.loads((tmp_path / SHARD_MANIFEST).read_text())
+        assert manifest["shards"] == shards
+        assert [s["rows"] for s in shards] == [3, 3, 1]
+        for shard in shards:
+            rows = shard["rows"]
+            features = np.load(tmp_path / str(shard["features"]), mmap_mode="r")
+            labels = np.load(tmp_path / str(shard["labels"]), mmap_mode="r")
+            ids = np.load(tmp_path / str(shard["ids"]))
+            assert features.shape == (rows, width)
+            assert labels.shape == (rows,)
+            assert ids.shape == (rows, 2 * TEAM_SIZE)
+            np.testing.assert_array_equal(features, matchup_features(stats, ids))
+            assert ((labels > 0) & (labels < 1)).all()
@@ -0,0 +1,139 @@
+"""Tests for the possession-level game simulation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import TEAM_SIZE
+from src.database.store import PlayerStore
+from src.simulation import (
+    BOX_COLUMNS,
+    RATE_COLUMNS,
+    player_rates,
+    simulate_games,
+    store_rates,
+)
+
+PTS, FGM, FGA, FG3M, FG3A, FTM, FTA, REB, AST, STL, BLK, TOV = range(len(BOX_COLUMNS))
+
+
+@pytest.fixture
+def rates(sample_player_df: pd.DataFrame) -> np.ndarray:
+    """Per-player simulation inputs for the sample players."""
+    return player_rates(sample_player_df)
+
+
+@pytest.fixture
+def matchup(rates: np.ndarray) -> np.ndarray:
+    """One game: LeBron James' line five times against Michael Jordan's."""
+    return np.stack([np.repeat(rates[[0]], TEAM_SIZE, axis=0), rates[[1] * 5]])
+
+
+class TestPlayerRates:
+    """Tests for deriving simulation inputs from season totals."""
+
+    def test_per_game_counts(
+        self, sample_player_df: pd.DataFrame, rates: np.ndarray
+    ) -> None:
+        """Counting stats are divided by games played."""
+        lebron = sample_player_df.iloc[0]
+        fga = rates[0, RATE_COLUMNS.index("FGA")]
+        assert fga == pytest.approx(lebron["FGA"] / lebron["GP"])
+        assert rates.shape == (len(sample_player_df), len(RATE_COLUMNS))
+        assert not rates.flags.writeable
+
+    def test_small_samples_shrink_to_league_average(self) -> None:
+        """A 1-for-1 three-point shooter is not treated as a 100% shooter."""
+        frame = pd.DataFrame(
+            {col: [0] for col in ("FGA", "FGM", "FTA", "FTM", "OREB", "DREB")}
+            | {col: [0] for col in ("AST", "STL", "BLK", "TOV")}
+            | {"GP": [1], "FG3A": [1], "FG3M": [1]}
+        )
+        pct = player_rates(frame)[0, RATE_COLUMNS.index("FG3_PCT")]
+        assert 0.3 < pct < 0.4
+
+    def test_store_rates_are_cached(self, sample_player_df: pd.DataFrame) -> None:
+        """Rates are derived once per store."""
+        store = PlayerStore(sample_player_df, "test-v1")
+        assert store_rates(store) is store_rates(store)
+
+
+class TestSimulateGames:
+    """Tests for simulate_games."""
+
+    def test_single_game_shapes(self, matchup: np.ndarray) -> None:
+        """One game gives four quarters and five lines per team."""
+        games = simulate_games(matchup, 0.7, rng=np.random.default_rng(0))
+        assert len(games) == 1
+        assert games.quarter_scores.shape == (1, 2, 4)
+        assert games.box.shape == (1, 2, TEAM_SIZE, len(BOX_COLUMNS))
+
+    def test_box_scores_add_up(self, matchup: np.ndarray) -> None:
+        """Player points sum to team scores and lines are internally valid."""
+        batch = np.broadcast_to(matchup, (200, *matchup.shape))
+        games = simulate_games(batch, 0.6, rng=np.random.default_rng(1))
+        box = games.box
+
+        np.testing.assert_array_equal(box[..., PTS].sum(axis=-1), games.final_scores)
+        np.testing.assert_array_equal(
+            box[..., PTS],
+            2 * box[..., FGM] + box[..., FG3M] + box[..., FTM],
+        )
+        assert (box[..., FGM] <= box[..., FGA]).all()
+        assert (box[..., FG3M] <= box[..., FG3A]).all()
+        assert (box[..., FTM] <= box[..., FTA]).all()
+        assert (box[..., AST].sum(axis=-1) <= box[..., FGM].sum(axis=-1)).all()
+
+    @pytest.mark.parametrize("probability", [0.0, 0.3, 0.5, 0.51, 1.0])
+    def test_winner_matches_prediction(
+        self, matchup: np.ndarray, probability: float
+    ) -> None:
+        """Every game is won by the predicted side, with no ties."""
+        batch = np.broadcast_to(matchup, (300, *matchup.shape))
+        games = simulate_games(batch, probability, rng=np.random.default_rng(2))
+        final = games.final_scores
+        assert (games.home_won == (probability >= 0.5)).all()
+        assert (final[:, 0] != final[:, 1]).all()
+
+    def test_explicit_winner_overrides_probability(self, matchup: np.ndarray) -> None:
+        """A required winner is honoured even against the probability."""
+        batch = np.broadcast_to(matchup, (50, *matchup.shape))
+        home_wins = np.arange(50) % 2 == 0
+        games = simulate_games(
+            batch, 0.99, home_wins=home_wins, rng=np.random.default_rng(3)
+        )
+        np.testing.assert_array_equal(games.home_won, home_wins)
+
+    def test_stats_drive_scoring(self, rates: np.ndarray) -> None:
+        """A roster that shoots more scores more than one that barely plays."""
+        idle = np.zeros_like(rates[[0] * 5])
+        batch = np.broadcast_to(
+            np.stack([rates[[0] * 5], idle]), (100, 2, TEAM_SIZE, len(RATE_COLUMNS))
+        )
+        games = simulate_games(batch, 0.5, rng=np.random.default_rng(4))
+        home, away = games.final_scores.mean(axis=0)
+        assert home > away
+
+    def test_seeded_runs_repeat(self, matchup: np.ndarray) -> None:
+        """The same seed gives the same games."""
+        first = simulate_games(matchup, 0.5, rng=np.random.default_rng(5))
+        second = simulate_games(matchup, 0.5, rng=np.random.default_rng(5))
+        np.testing.assert_array_equal(first.box, second.box)
+
+    def test_frames(self, matchup: np.ndarray) -> None:
+        """Scoreboard and box score frames are labelled for display."""
+        games = simulate_games(matchup, 0.8, rng=np.random.default_rng(6))
+        board = games.scoreboard()
+        assert list(board.columns) == ["1", "2", "3", "4", "Final"]
+        assert list(board.index) == ["Home Team", "Away Team"]
+        assert (board["Final"] == board[["1", "2", "3", "4"]].sum(axis=1)).all()
+
+        names = [f"P{i}" for i in range(TEAM_SIZE)]
+        lines = games.box_score(0, 1, names)
+        assert list(lines.index) == names
+        assert list(lines.columns) == list(BOX_COLUMNS)
+
+    def test_rejects_wrong_shape(self, rates: np.ndarray) -> None:
+        """Rates must be (games, 2, 5, R)."""
+        with pytest.raises(ValueError, match="Expected rates of shape"):
+            simulate_games(rates[:4], 0.5)
@@ -1,11 +1,40 @@
 """Tests for session state management functions."""
 
+import os
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
 
 from src.config import DIFFICULTY_PRESETS
-from src.state.session import get_away_stats, get_home_team_df, init_session_state
+from src.database import connection
+from src.database.connection import DatabaseConnectionError
+from src.database.store import (
+    PlayerStore,
+    load_player_store,
+    publish_player_store,
+    reset_player_store,
+)
+from src.state.session import (
+    get_away_stats,
+    get_away_team_df,
+    get_home_team_df,
+    get_home_team_ids,
+    init_session_state,
+    set_away_team_ids,
+    set_home_team_ids,
+    sync_player_selection,
+)
+
+
+@pytest.fixture
+def store(sample_player_df: pd.DataFrame) -> Iterator[PlayerStore]:
+    """Serve the sample players as the shared store."""
+    player_store = PlayerStore(sample_player_df, "test")
+    with patch("src.state.session.get_player_store", return_value=player_store):
+        yield player_store
 
 
 class TestInitSessionState:
@@ -19,23 +48,21 @@ class TestInitSessionState:
             init_session_state()
 
         expected_keys = {
-            "home_team",
-            "away_team",
-            "away_team_df",
+            "home_team_ids",
+            "away_team_ids",
             "away_stats",
-            "home_team_df",
             "radio_index",
         }
         assert set(state.keys()) == expected_keys
 
     def test_does_not_overwrite_existing_values(self) -> None:
         """Verify calling init twice does not overwrite existing values."""
-        state: dict = {"home_team": ["Player A"]}
+        state: dict = {"home_team_ids": ("v1", (3, 1))}
         with patch("src.state.session.st") as mock_st:
             mock_st.session_state = state
             init_session_state()
 
-        assert state["home_team"] == ["Player A"]
+        assert state["home_team_ids"] == ("v1", (3, 1))
 
     def test_sets_correct_default_away_stats(self) -> None:
         """Verify away_stats defaults to Regular difficulty preset."""
@@ -46,17 +73,16 @@ class TestInitSessionState:
 
         assert state["away_stats"] == list(DIFFICULTY_PRESETS["Regular"])
 
-    def test_sets_empty_dataframes_by_default(self) -> None:
-        """Verify DataFrames start empty."""
+    def test_sets_empty_rosters_by_default(self) -> None:
+        """Verify rosters start as empty id tuples, not DataFrames."""
         state: dict = {}
         with patch("src.state.session.st") as mock_st:
             mock_st.session_state = state
             init_session_state()
 
-        assert isinstance(state["away_team_df"], pd.DataFrame)
-        assert state["away_team_df"].empty
-        assert isinstance(state["home_team_df"], pd.DataFrame)
-        assert state["home_team_df"].empty
+        assert state["home_team_ids"] == ("", ())
+        assert state["away_team_ids"] == ("", ())
+        assert not any(isinstance(v, pd.DataFrame) for v in state.values())
 
 
 class TestGetAwayStats:
@@ -99,18 +125,69 @@ class TestGetAwayStats:
         assert result == list(DIFFICULTY_PRESETS["Regular"])
 
 
+class TestTeamIds:
+    """Tests for roster id accessors."""
+
+    def test_set_stores_tuple_of_ints(self, store: PlayerStore) -> None:
+        """Verify saved rosters are compact int tuples tagged with the store."""
+        state: dict = {}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            set_home_team_ids([4, 2, 0])
+
+        assert state["home_team_ids"] == ("test", (4, 2, 0))
+
+    def test_invalid_ids_reset_to_empty(self) -> None:
+        """Verify malformed rosters are discarded."""
+        for bad in (
+            ["a", "b"],
+            ("a",),
+            None,
+            (4, 2, 0),
+            ("v1", ("a",)),
+            ("v1", (True,)),
+            (1, (0,)),
+        ):
+            state: dict = {"home_team_ids": bad}
+            with patch("src.state.session.st") as mock_st:
+                mock_st.session_state = state
+                assert get_home_team_ids() == ()
+            assert state["home_team_ids"] == ("", ())
+
+    def test_ids_are_only_valid_for_their_store(self, store: PlayerStore) -> None:
+        """Verify ids saved against other player data are never handed out."""
+        state: dict = {"home_team_ids": ("older", (1, 0))}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            assert get_home_team_ids() == ()
+            assert get_home_team_df().empty
+
+        assert state["home_team_ids"] == ("", ())
+
+    def test_explicit_version_is_kept(self, store: PlayerStore) -> None:
+        """Verify ids are tagged with the store they were picked from."""
+        state: dict = {}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            set_away_team_ids((1, 0), version="older")
+
+        assert state["away_team_ids"] == ("older", (1, 0))
+
+
 class TestGetHomeTeamDf:
     """Tests for get_home_team_df."""
 
-    def test_returns_dataframe_from_session(self) -> None:
-        """Verify returns DataFrame when set in session."""
-        expected_df = pd.DataFrame({"FULL_NAME": ["Player A"]})
-        state: dict = {"home_team_df": expected_df}
+    def test_resolves_ids_against_store(self, store: PlayerStore) -> None:
+        """Verify ids resolve to store rows in saved order."""
+        state: dict = {"home_team_ids": ("test", (1, 0))}
         with patch("src.state.session.st") as mock_st:
             mock_st.session_state = state
             result = get_home_team_df()
 
-        pd.testing.assert_frame_equal(result, expected_df)
+        assert result["FULL_NAME"].tolist() == [
+            store.name_of(1),
+            store.name_of(0),
+        ]
 
     def test_returns_empty_dataframe_when_not_set(self) -> None:
         """Verify returns empty DataFrame when not set."""
@@ -121,3 +198,103 @@ class TestGetHomeTeamDf:
 
         assert isinstance(result, pd.DataFrame)
         assert result.empty
+
+    def test_out_of_range_ids_are_dropped(self, store: PlayerStore) -> None:
+        """Verify ids that no longer exist in the store clear the team."""
+        state: dict = {"home_team_ids": ("test", (0, len(store)))}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            result = get_home_team_df()
+
+        assert result.empty
+        assert state["home_team_ids"] == ("", ())
+
+    def test_returns_empty_when_store_unavailable(self) -> None:
+        """Verify a data load failure yields an empty team."""
+        state: dict = {"away_team_ids": ("test", (0, 1))}
+        with (
+            patch("src.state.session.st") as mock_st,
+            patch(
+                "src.state.session.get_player_store",
+                side_effect=DatabaseConnectionError("boom"),
+            ),
+        ):
+            mock_st.session_state = state
+            result = get_away_team_df()
+
+        assert result.empty
+
+
+@pytest.fixture
+def players_csv(
+    sample_player_df: pd.DataFrame, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Path]:
+    """Serve the shared store from a CSV the test can rewrite and reload."""
+    path = tmp_path / "players.csv"
+    sample_player_df.to_csv(path, index=False)
+    monkeypatch.setattr(connection, "CSV_PATH", path)
+    reset_player_store()
+    yield path
+    reset_player_store()
+
+
+def _reload(path: Path, frame: pd.DataFrame, mtime_ns: int) -> None:
+    """Rewrite the CSV and publish the store rebuilt from it, as hot reload does."""
+    frame.to_csv(path, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    publish_player_store(load_player_store())
+
+
+class TestRostersAcrossReloads:
+    """Tests for rosters saved before the player data is reloaded."""
+
+    def test_reordered_reload_keeps_the_same_players(
+        self, players_csv: Path, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a saved roster still names the same players after a reorder."""
+        state: dict = {}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            set_home_team_ids([0, 1])
+            saved = get_home_team_df()["FULL_NAME"].tolist()
+
+            _reload(players_csv, sample_player_df.iloc[::-1], 1)
+            reloaded = get_home_team_df()["FULL_NAME"].tolist()
+
+        assert saved == ["LeBron James", "Michael Jordan"]
+        assert reloaded == saved
+        assert state["home_team_ids"][1] == (1, 0)
+        mock_st.warning.assert_not_called()
+
+    def test_roster_with_a_removed_player_is_cleared(
+        self, players_csv: Path, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify a roster that cannot be carried over is cleared with a notice."""
+        state: dict = {}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            set_away_team_ids([0, 1])
+
+            _reload(players_csv, sample_player_df.iloc[[1]], 1)
+            result = get_away_team_df()
+
+        assert result.empty
+        assert state["away_team_ids"] == ("", ())
+        mock_st.warning.assert_called_once()
+
+    def test_selection_follows_a_reordered_reload(
+        self, players_csv: Path, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify widget selections are moved to the reloaded ids."""
+        state: dict = {}
+        with patch("src.state.session.st") as mock_st:
+            mock_st.session_state = state
+            first = sync_player_selection("player_selector")
+            state["player_selector"] = [0]
+
+            _reload(players_csv, sample_player_df.iloc[::-1], 1)
+            second = sync_player_selection("player_selector")
+
+        assert first != second
+        assert state["player_selector"] == [1]
+        assert state["player_selector_version"] == second
@@ -0,0 +1,262 @@
+"""Tests for rerun timing, metrics and exporters."""
+
+import http.client
+import json
+import logging
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import PLAYER_COLUMNS
+from src.database.connection import QueryExecutionError
+from src.database.queries import get_away_team_by_stats, search_player_by_name
+from src.ml.model import predict_win_probabilities
+from src.telemetry.exporter import start_http_exporter, write_metrics_file
+from src.telemetry.metrics import (
+    AWAY_TEAM_ATTEMPTS,
+    AWAY_TEAM_FAILURES,
+    PREDICTION_BATCH_SIZE,
+    PREDICTIONS,
+    REGISTRY,
+    MetricsRegistry,
+)
+from src.telemetry.panel import debug_panel_enabled
+from src.telemetry.timing import (
+    current_rerun,
+    finish_rerun,
+    stage,
+    start_rerun,
+    timed,
+)
+
+
+class TestStageTiming:
+    """Tests for stage/timed collection."""
+
+    def test_stages_recorded_in_current_rerun(self) -> None:
+        """Verify stages inside a rerun are collected in order."""
+        timings = start_rerun("page")
+        with stage("a"):
+            pass
+        with stage("b"):
+            pass
+        finish_rerun()
+
+        assert [name for name, _ in timings.stages] == ["a", "b"]
+        assert all(ms >= 0 for _, ms in timings.stages)
+        assert timings.total_ms is not None
+
+    def test_timed_preserves_function(self) -> None:
+        """Verify the decorator keeps name, arguments and return value."""
+
+        @timed()
+        def add(a: int, b: int = 1) -> int:
+            return a + b
+
+        timings = start_rerun("page")
+        assert add(2, b=3) == 5
+        finish_rerun()
+
+        assert add.__name__ == "add"
+        assert timings.by_stage().keys() == {"add"}
+
+    def test_repeated_stages_are_summed(self) -> None:
+        """Verify by_stage aggregates repeated calls."""
+        timings = start_rerun("page")
+        timings.record("x", 1.5)
+        timings.record("x", 2.0)
+        finish_rerun()
+
+        assert timings.by_stage() == {"x": 3.5}
+
+    def test_stage_records_on_exception(self) -> None:
+        """Verify a failing stage is still timed."""
+        timings = start_rerun("page")
+        with pytest.raises(RuntimeError), stage("boom"):
+            raise RuntimeError
+        finish_rerun()
+
+        assert timings.by_stage().keys() == {"boom"}
+
+    def test_instrumented_query_is_recorded(
+        self, sample_player_df: pd.DataFrame
+    ) -> None:
+        """Verify the shipped query functions report their stage."""
+        timings = start_rerun("page")
+        search_player_by_name(sample_player_df, "James")
+        finish_rerun()
+
+        assert "search_player_by_name" in timings.by_stage()
+
+    def test_finish_logs_json_and_resets(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Verify one structured line is logged and the rerun is closed."""
+        start_rerun("play_game")
+        with stage("predict_winner"):
+            pass
+        with caplog.at_level(logging.INFO, logger="streamlit_nba"):
+            finish_rerun()
+
+        line = next(r.getMessage() for r in caplog.records if "rerun_timing" in r.msg)
+        payload = json.loads(line.split(" ", 1)[1])
+        assert payload["page"] == "play_game"
+        assert set(payload["stages"]) == {"predict_winner"}
+        assert current_rerun() is None
+        assert finish_rerun() is None
+
+    def test_outside_rerun_not_collected(self) -> None:
+        """Verify stages without a rerun do not fail or collect."""
+        with stage("background"):
+            pass
+        assert current_rerun() is None
+
+
+class TestDebugPanel:
+    """Tests for the debug panel switch."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("1", True), ("true", True), ("", False), ("0", False)]
+    )
+    def test_env_switch(self, value: str, expected: bool) -> None:
+        """Verify the env var toggles the panel."""
+        with patch.dict("os.environ", {"NBA_DEBUG_TIMINGS": value}):
+            assert debug_panel_enabled() is expected
+
+
+class TestMetricsRegistry:
+    """Tests for the metrics registry and Prometheus rendering."""
+
+    def test_counter_is_thread_safe(self) -> None:
+        """Verify concurrent increments are not lost."""
+        counter = MetricsRegistry().counter("t_total", "test")
+
+        def work() -> None:
+            for _ in range(10_000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value == 80_000
+
+    def test_counter_rejects_negative(self) -> None:
+        """Verify counters cannot decrease."""
+        with pytest.raises(ValueError, match="only increase"):
+            MetricsRegistry().counter("t_total", "test").inc(-1)
+
+    def test_histogram_renders_cumulative_buckets(self) -> None:
+        """Verify bucket counts are cumulative with +Inf, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("t_seconds", "test", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        text = registry.render_prometheus()
+        assert "# TYPE t_seconds histogram" in text
+        assert 't_seconds_bucket{le="0.1"} 1' in text
+        assert 't_seconds_bucket{le="1"} 3' in text
+        assert 't_seconds_bucket{le="+Inf"} 4' in text
+        assert "t_seconds_count 4" in text
+        assert "t_seconds_sum 6.25" in text
+
+    def test_gauge_reads_on_render(self) -> None:
+        """Verify callback gauges are evaluated at collection time."""
+        registry = MetricsRegistry()
+        values = [0.25]
+        registry.gauge("t_ratio", "test", lambda: values[0])
+        values[0] = 0.5
+        assert "t_ratio 0.5" in registry.render_prometheus()
+
+    def test_reregistering_returns_existing(self) -> None:
+        """Verify registration is idempotent and type-checked."""
+        registry = MetricsRegistry()
+        counter = registry.counter("t_total", "test")
+        assert registry.counter("t_total", "test") is counter
+        with pytest.raises(ValueError, match="already registered"):
+            registry.histogram("t_total", "test")
+
+
+class TestInstrumentation:
+    """Tests that app code paths update the shared registry."""
+
+    def test_away_team_attempts_and_failures(self) -> None:
+        """Verify infeasible requests are counted as failures without drawing."""
+        attempts, failures = AWAY_TEAM_ATTEMPTS.value, AWAY_TEAM_FAILURES.value
+        empty = pd.DataFrame(columns=PLAYER_COLUMNS)
+        with pytest.raises(QueryExecutionError):
+            get_away_team_by_stats(empty, 0, 0, 0, 0)
+
+        assert AWAY_TEAM_ATTEMPTS.value == attempts
+        assert AWAY_TEAM_FAILURES.value - failures == 1
+
+    def test_prediction_batch_sizes(self) -> None:
+        """Verify predictions count rows and record the batch size."""
+        bundle = MagicMock()
+        bundle.predict_proba.return_value = np.full(7, 0.5, dtype=np.float32)
+        rows, batches = PREDICTIONS.value, PREDICTION_BATCH_SIZE.count
+        with patch("src.ml.model.get_variant_bundle", return_value=bundle):
+            predict_win_probabilities(np.zeros((7, 100), dtype=np.float32))
+
+        assert PREDICTIONS.value - rows == 7
+        assert PREDICTION_BATCH_SIZE.count - batches == 1
+
+    def test_shared_registry_exposes_app_metrics(self) -> None:
+        """Verify the exposition includes the documented metric families."""
+        text = REGISTRY.render_prometheus()
+        for name in (
+            "nba_searches_total",
+            "nba_search_cache_hit_ratio",
+            "nba_roster_lookups_total",
+            "nba_away_team_attempts_total",
+            "nba_away_team_failures_total",
+            "nba_model_loads_total",
+            "nba_predictions_total",
+            "nba_prediction_batch_size",
+        ):
+            assert f"# TYPE {name} " in text
+
+
+class TestExporters:
+    """Tests for the HTTP and file exporters."""
+
+    def test_http_endpoint_serves_metrics(self) -> None:
+        """Verify GET /metrics returns the text format and other paths 404."""
+        registry = MetricsRegistry()
+        registry.counter("t_total", "test").inc(3)
+        server = start_http_exporter(0, registry=registry)
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            conn.request("GET", "/metrics")
+            response = conn.getresponse()
+            body = response.read().decode()
+            content_type = response.getheader("Content-Type", "")
+            conn.request("GET", "/other")
+            missing = conn.getresponse()
+            missing.read()
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status == 200
+        assert "t_total 3" in body
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert missing.status == 404
+
+    def test_file_exporter_writes_atomically(self, tmp_path: Path) -> None:
+        """Verify the metrics file is written without leaving a temp file."""
+        registry = MetricsRegistry()
+        registry.counter("t_total", "test").inc()
+        target = tmp_path / "nba.prom"
+        write_metrics_file(target, registry)
+
+        assert "t_total 1" in target.read_text()
+        assert list(tmp_path.iterdir()) == [target]
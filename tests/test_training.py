@@ -0,0 +1,220 @@
+"""Tests for the training script's data handling (scripts/compile_model.py)."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.compile_model import (
+    FEATURE_COLS,
+    SEASON_ROSTER_NAME,
+    SEASON_SCHEDULE_NAME,
+    SHARD_MANIFEST,
+    VALIDATION_EVERY,
+    build_season_features,
+    create_stats,
+    discover_seasons,
+    early_stopping_mask,
+    holdout_mask,
+    holdout_split,
+    iter_season_features,
+    make_shard_dataset,
+    read_watermark,
+    schedule_fingerprint,
+    write_shards,
+    write_watermark,
+)
+from src.config import TEAM_SIZE
+
+N_FEATURES = 2 * TEAM_SIZE * (len(FEATURE_COLS) - 1)
+
+
+def make_roster(teams: list[str], offset: float = 0.0) -> pd.DataFrame:
+    """Roster of five players per team with distinct stats in every cell."""
+    rows = []
+    for t, team in enumerate(teams):
+        for p in range(TEAM_SIZE):
+            stats = [
+                offset + 100 * t + 10 * p + c for c in range(len(FEATURE_COLS) - 1)
+            ]
+            rows.append(
+                {
+                    "Name": f"{team} {p}",
+                    **dict(zip(FEATURE_COLS[1:], stats, strict=True)),
+                    "TEAM": team,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def write_season(
+    root: Path, name: str, roster: pd.DataFrame, games: list[tuple[str, int, str, int]]
+) -> None:
+    """Write one season directory; games are (visitor, pts, home, pts)."""
+    season = root / name
+    season.mkdir(parents=True)
+    roster.to_csv(season / SEASON_ROSTER_NAME, index=False)
+    lines = ["Visitor/Neutral,PTS,Home/Neutral,PTS"]
+    lines += [f"{v},{vp},{h},{hp}" for v, vp, h, hp in games]
+    (season / SEASON_SCHEDULE_NAME).write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def seasons_dir(tmp_path: Path) -> Path:
+    """Two seasons of three teams; the second has a team one player short."""
+    root = tmp_path / "seasons"
+    write_season(
+        root,
+        "2018",
+        make_roster(["A", "B", "C"]),
+        [("A", 90, "B", 100), ("B", 110, "C", 100), ("C", 95, "A", 95)],
+    )
+    short = make_roster(["A", "B", "D"], offset=1000.0)
+    short = short[short["Name"] != "D 4"]
+    write_season(
+        root,
+        "2019",
+        short,
+        [("A", 80, "B", 70), ("D", 100, "A", 90), ("B", 99, "A", 101)],
+    )
+    return root
+
+
+def write_id_shards(path: Path, sizes: list[int], shard_rows: int) -> np.ndarray:
+    """Shard seasons whose first feature is the game's global id."""
+    seasons = []
+    start = 0
+    for i, size in enumerate(sizes):
+        features = np.zeros((size, N_FEATURES), dtype=np.float32)
+        features[:, 0] = np.arange(start, start + size)
+        seasons.append((str(i), features, np.ones(size, dtype=np.float32)))
+        start += size
+    write_shards(iter(seasons), path, shard_rows)
+    return np.arange(start)
+
+
+class TestStreamingPipeline:
+    """Tests for season features, shards and the shard dataset."""
+
+    def test_labels_and_feature_order(self, seasons_dir: Path) -> None:
+        """Features are home then away in FEATURE_COLS order, like create_stats."""
+        roster = pd.read_csv(seasons_dir / "2018" / SEASON_ROSTER_NAME)
+        schedule = pd.read_csv(seasons_dir / "2018" / SEASON_SCHEDULE_NAME)
+
+        features, labels = build_season_features(roster, schedule)
+
+        assert features.shape == (3, N_FEATURES)
+        assert features.dtype == np.float32
+        # PTS is the visitor's score and PTS.1 the home team's; ties go home
+        assert labels.tolist() == [1.0, 0.0, 1.0]
+        home_b = roster.loc[roster["TEAM"] == "B", FEATURE_COLS[1:]].to_numpy()
+        np.testing.assert_array_equal(features[0, : N_FEATURES // 2], home_b.ravel())
+        np.testing.assert_array_equal(
+            features, np.array(create_stats(roster, schedule), dtype=np.float32)
+        )
+
+    def test_incomplete_teams_are_dropped(self, seasons_dir: Path) -> None:
+        """Games with a team short of a full roster are left out."""
+        (_, _, first), (name, _, second) = (
+            (n, f, y) for n, f, y in iter_season_features(discover_seasons(seasons_dir))
+        )
+
+        assert name == "2019"
+        assert len(first) == 3
+        assert second.tolist() == [0.0, 1.0]
+
+    def test_shards_round_trip(self, seasons_dir: Path, tmp_path: Path) -> None:
+        """Shards hold every season's rows in order, split at shard_rows."""
+        seasons = discover_seasons(seasons_dir)
+        expected = list(iter_season_features(seasons))
+        shards_dir = tmp_path / "shards"
+
+        shards = write_shards(iter_season_features(seasons), shards_dir, shard_rows=2)
+
+        manifest = json.loads((shards_dir / SHARD_MANIFEST).read_text())
+        assert manifest == {"shard_rows": 2, "shards": shards}
+        assert [s["rows"] for s in shards] == [2, 2, 1]
+        features = np.concatenate(
+            [np.load(shards_dir / str(s["features"]), mmap_mode="r") for s in shards]
+        )
+        labels = np.concatenate(
+            [np.load(shards_dir / str(s["labels"]), mmap_mode="r") for s in shards]
+        )
+        assert features.dtype == labels.dtype == np.float32
+        np.testing.assert_array_equal(
+            features, np.concatenate([f for _, f, _ in expected])
+        )
+        np.testing.assert_array_equal(
+            labels, np.concatenate([y for _, _, y in expected])
+        )
+
+    def test_dataset_holds_out_every_fifth_row_per_shard(self, tmp_path: Path) -> None:
+        """Validation gets rows at in-shard positions 0, 5, ...; training the rest."""
+        ids = write_id_shards(tmp_path, [9, 8], shard_rows=7)
+
+        def game_ids(validation: bool) -> list[int]:
+            dataset = make_shard_dataset(tmp_path, batch_size=4, validation=validation)
+            return sorted(int(i) for x, _ in dataset for i in x.numpy()[:, 0])
+
+        validation = game_ids(True)
+        training = game_ids(False)
+
+        # Shards are 7, 7 and 3 rows, starting at games 0, 7 and 14
+        assert validation == [0, 5, 7, 12, 14]
+        assert sorted(validation + training) == ids.tolist()
+
+
+class TestIncrementalTraining:
+    """Tests for the incremental mode's validation slices and watermark."""
+
+    def test_early_stopping_never_sees_the_holdout(self) -> None:
+        """Epochs are picked on games the promotion gate does not score."""
+        holdout = holdout_mask(23)
+        stopping = early_stopping_mask(23)
+
+        assert not (holdout & stopping).any()
+        assert np.flatnonzero(stopping).tolist() == list(range(1, 23, VALIDATION_EVERY))
+
+    def test_holdout_matches_full_training_split(self, seasons_dir: Path) -> None:
+        """--incremental gates on exactly the games the full retrain tests on."""
+        roster = pd.read_csv(seasons_dir / "2018" / SEASON_ROSTER_NAME)
+        schedule = pd.read_csv(seasons_dir / "2018" / SEASON_SCHEDULE_NAME)
+        schedule = pd.concat([schedule] * 4, ignore_index=True)
+        X = np.array(create_stats(roster, schedule))
+        y = np.arange(len(schedule))
+
+        X_train, X_test, y_train, y_test = holdout_split(X, y)
+        x_val, _ = build_season_features(roster, schedule[holdout_mask(len(schedule))])
+
+        assert y_test.tolist() == list(range(0, len(schedule), VALIDATION_EVERY))
+        assert sorted([*y_train, *y_test]) == y.tolist()
+        assert len(X_train) == len(y_train)
+        np.testing.assert_array_equal(X_test.astype(np.float32), x_val)
+
+    def test_watermark_round_trips(self, seasons_dir: Path, tmp_path: Path) -> None:
+        """A written watermark reads back with the schedule's size and hash."""
+        schedule = pd.read_csv(seasons_dir / "2018" / SEASON_SCHEDULE_NAME)
+        path = tmp_path / "watermark.json"
+
+        assert read_watermark(path) is None
+        write_watermark(schedule, val_accuracy=0.75, path=path)
+
+        assert read_watermark(path) == {
+            "games_seen": len(schedule),
+            "fingerprint": schedule_fingerprint(schedule),
+            "val_accuracy": 0.75,
+        }
+
+    def test_fingerprint_catches_edited_past_games(self, seasons_dir: Path) -> None:
+        """Appending games keeps the seen prefix's hash; editing a score does not."""
+        schedule = pd.read_csv(seasons_dir / "2018" / SEASON_SCHEDULE_NAME)
+        seen = schedule_fingerprint(schedule)
+        appended = pd.concat([schedule, schedule.iloc[[0]]], ignore_index=True)
+        edited = schedule.copy()
+        edited.loc[1, "PTS.1"] += 1
+
+        assert schedule_fingerprint(appended.iloc[: len(schedule)]) == seen
+        assert schedule_fingerprint(appended) != seen
+        assert schedule_fingerprint(edited) != seen
@@ -1,8 +1,27 @@
-"""Tests for HTML utility functions."""
+"""Tests for HTML utility functions, background preloading and hot reload."""
 
+import logging
+import os
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
+from src.telemetry.metrics import PREDICTIONS
+from src.utils.hot_reload import (
+    FileWatcher,
+    HotReloader,
+    start_hot_reload,
+    stop_hot_reload,
+)
 from src.utils.html import escape_html
+from src.utils.preload import (
+    DEFAULT_STEPS,
+    reset_preload,
+    run_preload,
+    start_preload,
+)
 
 
 class TestEscapeHtml:
@@ -104,3 +123,131 @@ class TestSafeParagraph:
 
             mock_st.markdown.assert_called_once()
             assert mock_st.markdown.call_args[1]["unsafe_allow_html"] is True
+
+
+@pytest.fixture
+def fresh_preload() -> Iterator[None]:
+    """Let each test start its own preload thread."""
+    reset_preload()
+    yield
+    reset_preload()
+
+
+class TestPreload:
+    """Tests for background preloading."""
+
+    def test_runs_steps_once_per_process(self, fresh_preload: None) -> None:
+        """Repeated calls share one thread, so steps run once."""
+        calls: list[str] = []
+        steps = [("a", lambda: calls.append("a")), ("b", lambda: calls.append("b"))]
+
+        thread = start_preload(steps)
+        assert thread is not None
+        assert start_preload(steps) is thread
+        thread.join(timeout=5)
+
+        assert calls == ["a", "b"]
+        assert thread.daemon
+
+    def test_failed_step_does_not_stop_later_steps(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """A failing step is logged and the rest still run."""
+        calls: list[str] = []
+
+        def fail() -> None:
+            raise OSError("disk gone")
+
+        with caplog.at_level(logging.WARNING, logger="streamlit_nba"):
+            run_preload([("broken", fail), ("ok", lambda: calls.append("ok"))])
+
+        assert calls == ["ok"]
+        assert "Preloading broken failed: disk gone" in caplog.text
+
+    def test_model_warm_up_is_not_counted(self) -> None:
+        """The warm-up prediction runs without showing up in the metrics."""
+        steps = dict(DEFAULT_STEPS)
+        predictions = PREDICTIONS.value
+
+        bundle = steps["model bundle"]()
+
+        assert bundle is not None
+        assert PREDICTIONS.value == predictions
+
+    def test_disabled_by_environment(
+        self, fresh_preload: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """NBA_PRELOAD=0 switches preloading off."""
+        monkeypatch.setenv("NBA_PRELOAD", "0")
+        assert start_preload([("a", lambda: None)]) is None
+
+
+def _write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestHotReload:
+    """Tests for watching files and swapping in rebuilt data."""
+
+    def test_only_content_changes_count(self, tmp_path: Path) -> None:
+        """A touch is ignored; new content, creation and deletion are changes."""
+        data = tmp_path / "data.csv"
+        _write(data, "a,b\n1,2\n", 1_000_000_000)
+        watcher = FileWatcher([data, tmp_path / "later.csv"])
+        assert not watcher.changed()
+
+        _write(data, "a,b\n1,2\n", 2_000_000_000)
+        assert not watcher.changed()
+
+        _write(data, "a,b\n3,4\n", 3_000_000_000)
+        assert watcher.changed()
+        assert not watcher.changed()
+
+        (tmp_path / "later.csv").write_text("x")
+        assert watcher.changed()
+        data.unlink()
+        assert watcher.changed()
+
+    def test_rebuilds_changed_targets_and_survives_failures(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Only changed targets rebuild, and a failing rebuild is only logged."""
+        good, bad, idle = (tmp_path / name for name in ("good", "bad", "idle"))
+        for path in (good, bad, idle):
+            _write(path, "v1", 1_000_000_000)
+        calls: list[str] = []
+
+        def fail() -> None:
+            raise ValueError("half-written file")
+
+        reloader = HotReloader(
+            [
+                ("good", (good,), lambda: calls.append("good")),
+                ("bad", (bad,), fail),
+                ("idle", (idle,), lambda: calls.append("idle")),
+            ]
+        )
+        _write(good, "v2", 2_000_000_000)
+        _write(bad, "v2", 2_000_000_000)
+
+        with caplog.at_level(logging.WARNING, logger="streamlit_nba"):
+            assert reloader.check() == ["good"]
+        assert calls == ["good"]
+        assert "Reloading bad failed, keeping current: half-written file" in caplog.text
+        assert reloader.check() == []
+
+    def test_started_once_and_disabled_by_environment(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """One watcher runs per process, and NBA_HOT_RELOAD=0 turns it off."""
+        stop_hot_reload()
+        try:
+            reloader = start_hot_reload([("none", (tmp_path / "f",), lambda: None)])
+            assert reloader is not None
+            assert start_hot_reload() is reloader
+        finally:
+            stop_hot_reload()
+
+        monkeypatch.setenv("NBA_HOT_RELOAD", "0")
+        assert start_hot_reload() is None
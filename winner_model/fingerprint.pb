@@ -1 +0,0 @@
-ΏϨ э(ۓ岩W2
\ No newline at end of file